@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+All-magazine analytics: one query per magazine/author through the model
+methods, against the grouped SQL pass and the NumPy backend of
+lib/db/analytics.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.db import analytics, columnar, seed as seed_data
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+
+def looped():
+    magazines = Magazine.all()
+    return (
+        {m.id: len(m.article_titles()) for m in magazines},
+        {m.id: [row['id'] for row in m.contributors()] for m in magazines},
+        {m.id: [row['id'] for row in m.contributing_authors()] for m in magazines},
+        {a.id: a.topic_areas() for a in Author.iter_all()},
+    )
+
+
+def batched(snapshot=None):
+    return (
+        analytics.magazine_article_counts(snapshot),
+        analytics.magazine_contributors(snapshot),
+        analytics.magazine_contributing_authors(snapshot=snapshot),
+        analytics.author_topic_areas(snapshot),
+    )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--skip-loop', action='store_true', help="skip the per-entity loop (slow at large sizes)")
+    args = parser.parse_args()
+
+    n_authors = max(10, args.articles // 10)
+    n_magazines = max(10, args.articles // 1000)
+    with scratch_database():
+        seed_data.generate(n_authors, n_magazines, args.articles)
+        print(f"{n_magazines:,} magazines, {n_authors:,} authors, {args.articles:,} articles")
+        if not args.skip_loop:
+            print(f"{'per-entity model calls':<28}{timed(looped) * 1000:>12.1f} ms")
+        print(f"{'grouped SQL':<28}{timed(batched) * 1000:>12.1f} ms")
+        if columnar.np is not None:
+            start = time.perf_counter()
+            snapshot = columnar.export_snapshot()
+            print(f"{'columnar export':<28}{(time.perf_counter() - start) * 1000:>12.1f} ms")
+            print(f"{'NumPy on the snapshot':<28}{timed(batched, snapshot) * 1000:>12.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
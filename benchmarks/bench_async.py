@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Throughput of the async model API at 1, 8 and 64 concurrent tasks"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.db.aio import shutdown_executor
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+
+
+def populate(authors, articles):
+    rng = random.Random(1)
+    author_ids = [a.id for a in Author.bulk_create(Author(f"Author {i}") for i in range(authors))]
+    magazine_ids = [m.id for m in Magazine.bulk_create(Magazine(f"Magazine {i}", "Technology") for i in range(50))]
+    Article.bulk_create(
+        Article(f"Article {i}", rng.choice(author_ids), rng.choice(magazine_ids)) for i in range(articles)
+    )
+    return author_ids
+
+
+async def worker(author_ids, operations, rng):
+    for _ in range(operations):
+        await Article.afind_by_author(rng.choice(author_ids))
+
+
+async def run(concurrency, total, author_ids):
+    per_task = total // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(author_ids, per_task, random.Random(task)) for task in range(concurrency)
+    ))
+    return per_task * concurrency / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--operations', type=int, default=6400)
+    parser.add_argument('--authors', type=int, default=1000)
+    parser.add_argument('--articles', type=int, default=100000)
+    args = parser.parse_args()
+
+    with scratch_database():
+        author_ids = populate(args.authors, args.articles)
+        print(f"{'tasks':>6}{'ops/s':>12}")
+        for concurrency in args.concurrency:
+            rate = asyncio.run(run(concurrency, args.operations, author_ids))
+            print(f"{concurrency:>6}{rate:>12,.0f}")
+        shutdown_executor()
+
+
+if __name__ == '__main__':
+    main()
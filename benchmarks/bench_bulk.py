@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Rows/sec for Article.bulk_create against the Article(...).save() loop"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+
+
+def make_articles(count, author_id, magazine_id):
+    return [Article(f"Article {i}", author_id, magazine_id) for i in range(count)]
+
+
+def rows_per_sec(count, insert, batch_size):
+    with scratch_database():
+        author = Author("Benchmark Author").save()
+        magazine = Magazine("Benchmark Weekly", "Technology").save()
+        articles = make_articles(count, author.id, magazine.id)
+        start = time.perf_counter()
+        insert(articles, batch_size)
+        return count / (time.perf_counter() - start)
+
+
+def save_loop(articles, batch_size):
+    for article in articles:
+        article.save()
+
+
+def bulk(articles, batch_size):
+    Article.bulk_create(articles, batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--loop-max', type=int, default=10000,
+                        help="largest size to run the per-row save() loop for (it commits every row)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'save() loop rows/s':>22}{'bulk_create rows/s':>22}")
+    for size in args.sizes:
+        loop = rows_per_sec(size, save_loop, args.batch_size) if size <= args.loop_max else None
+        fast = rows_per_sec(size, bulk, args.batch_size)
+        loop_text = f"{loop:,.0f}" if loop is not None else "skipped"
+        print(f"{size:>10}{loop_text:>22}{fast:>22,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Per-call latency of Author.find_by_id with and without the connection pool"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database, summarize, time_calls
+from lib.db import connection
+from lib.models import author as author_module
+from lib.models.author import Author
+
+
+def unpooled_connection():
+    # What get_connection() did before pooling: a fresh connection per call
+    conn = sqlite3.connect(connection.get_database_path())
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    with scratch_database():
+        author = Author("Benchmark Author").save()
+        lookup = lambda: Author.find_by_id(author.id)
+
+        author_module.get_connection = unpooled_connection
+        try:
+            before = summarize(time_calls(lookup, args.iterations))
+        finally:
+            author_module.get_connection = connection.get_connection
+        after = summarize(time_calls(lookup, args.iterations))
+
+    print(f"{'mode':<10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'ops/s':>12}")
+    for label, stats in (('unpooled', before), ('pooled', after)):
+        print(f"{label:<10}{stats['p50_us']:>10.1f}{stats['p95_us']:>10.1f}"
+              f"{stats['p99_us']:>10.1f}{stats['ops_per_sec']:>12.0f}")
+    print(f"speedup (p50): {before['p50_us'] / after['p50_us']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Objects/sec and bytes per instance when hydrating article rows"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.db.connection import get_connection
+from lib.models.article import Article
+
+
+class LegacyArticle:
+    """The pre-__slots__ Article: validating __init__ and a per-instance __dict__"""
+
+    def __init__(self, title, author_id, magazine_id, id=None):
+        self.id = id
+        self.title = title
+        self.author_id = author_id
+        self.magazine_id = magazine_id
+
+    @property
+    def title(self):
+        return self._title
+
+    @title.setter
+    def title(self, value):
+        if not isinstance(value, str) or len(value) == 0:
+            raise ValueError("Title must be a non-empty string")
+        self._title = value
+
+
+def legacy(row):
+    return LegacyArticle(row['title'], row['author_id'], row['magazine_id'], row['id'])
+
+
+def validated(row):
+    return Article(row['title'], row['author_id'], row['magazine_id'], row['id'])
+
+
+def load_rows(count):
+    conn = get_connection()
+    conn.execute("INSERT INTO authors (id, name) VALUES (1, 'Benchmark Author')")
+    conn.execute("INSERT INTO magazines (id, name, category) VALUES (1, 'Benchmark Weekly', 'Technology')")
+    conn.executemany(
+        "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, 1, 1)",
+        ((f"Article {i}",) for i in range(count))
+    )
+    conn.commit()
+    rows = conn.execute("SELECT * FROM articles").fetchall()
+    conn.close()
+    return rows
+
+
+def measure(rows, hydrate):
+    gc.collect()
+    start = time.perf_counter()
+    objects = [hydrate(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del objects
+    gc.collect()
+
+    # Memory is the growth of live allocations minus the list holding them
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [hydrate(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_instance = (after - before - sys.getsizeof(objects)) / len(rows)
+    return len(rows) / elapsed, per_instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with scratch_database():
+        rows = load_rows(args.articles)
+
+    print(f"{'path':<32}{'objects/s':>14}{'bytes/instance':>16}")
+    for label, hydrate in (('legacy __dict__ + __init__', legacy),
+                           ('__slots__ + __init__', validated),
+                           ('__slots__ + _from_row', Article._from_row)):
+        rate, size = measure(rows, hydrate)
+        print(f"{label:<32}{rate:>14,.0f}{size:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
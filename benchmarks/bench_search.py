@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Article.search (FTS5) against LIKE '%term%' scans over a synthetic title corpus"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database, summarize, time_calls
+from lib.db.connection import get_connection
+from lib.models.article import Article
+
+WORDS = (
+    "machine learning quantum computing climate change health nutrition exercise python data "
+    "science trends future basics advanced explained solutions living tips mental analysis "
+    "systems design energy markets policy security privacy cloud mobile history culture travel "
+    "food music sports economy education research biology physics chemistry space robotics"
+).split()
+
+
+def populate(count, seed=7):
+    rng = random.Random(seed)
+    conn = get_connection()
+    conn.execute("INSERT INTO authors (id, name) VALUES (1, 'Benchmark Author')")
+    conn.execute("INSERT INTO magazines (id, name, category) VALUES (1, 'Benchmark Weekly', 'Technology')")
+    conn.executemany(
+        "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, 1, 1)",
+        ((" ".join(rng.sample(WORDS, 4)).title() + f" {i}",) for i in range(count))
+    )
+    conn.commit()
+    conn.close()
+
+
+def like_scan(query, limit):
+    # The LIKE equivalent of a multi-term search: every term must appear
+    terms = query.split()
+    where = " AND ".join("title LIKE ?" for _ in terms)
+    conn = get_connection()
+    rows = conn.execute(
+        f"SELECT * FROM articles WHERE {where} LIMIT ?", [f"%{term}%" for term in terms] + [limit]
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    # A unique token and a rare combination force LIKE to read every row;
+    # a common word shows the cost of ranking many FTS matches
+    queries = [str(args.articles // 2 + 1), "quantum robotics privacy", "climat"]
+    with scratch_database():
+        populate(args.articles)
+        print(f"{'query':<28}{'LIKE p50 ms':>14}{'FTS5 p50 ms':>14}")
+        for query in queries:
+            like = summarize(time_calls(lambda: like_scan(query, args.limit), args.iterations))
+            fts = summarize(time_calls(lambda: Article.search(query, args.limit), args.iterations))
+            print(f"{query:<28}{like['p50_us'] / 1000:>14.2f}{fts['p50_us'] / 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
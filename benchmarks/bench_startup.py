@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Startup time and peak Python memory of the lib/debug.py console: the old
+startup, which loaded every table to print its length, against
+prepare_console(), which reads counts and single rows
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib import debug
+from lib.db import instrumentation, seed as seed_data
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+
+def full_table_startup():
+    # What the console did before: len() of every table, then the samples
+    Author.all()
+    authors = Author.all()
+    print(len(authors), len(Magazine.all()), len(Article.all()))
+    for author in authors[:3]:
+        author.articles()
+    magazines = Magazine.all()
+    for magazine in magazines[:3]:
+        magazine.articles()
+    return {'sample_author': authors[0], 'sample_magazine': magazines[0]}
+
+
+def measure(fn):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with scratch_database():
+        seed_data.generate(max(10, args.articles // 10), max(10, args.articles // 1000), args.articles)
+        print(f"{args.articles:,} articles")
+        print(f"{'startup':<24}{'seconds':>10}{'peak MB':>10}")
+        for label, fn in (("load every table", full_table_startup), ("prepare_console", debug.prepare_console)):
+            elapsed, peak = measure(fn)
+            print(f"{label:<24}{elapsed:>10.3f}{peak / 2 ** 20:>10.1f}")
+            # prepare_console switches instrumentation on for the session
+            instrumentation.disable_instrumentation()
+
+
+if __name__ == '__main__':
+    main()
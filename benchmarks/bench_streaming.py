@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Peak RSS of Article.all() versus Article.iter_all() as the table grows"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.db.connection import get_connection
+
+
+def populate(count):
+    conn = get_connection()
+    conn.execute("INSERT INTO authors (id, name) VALUES (1, 'Benchmark Author')")
+    conn.execute("INSERT INTO magazines (id, name, category) VALUES (1, 'Benchmark Weekly', 'Technology')")
+    conn.executemany(
+        "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, 1, 1)",
+        ((f"Article {i}",) for i in range(count))
+    )
+    conn.commit()
+    conn.close()
+
+
+def child(mode, chunk_size):
+    # Runs in a fresh process against ARTICLES_DB; prints KB of RSS growth
+    from lib.models.article import Article
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == 'all':
+        total = sum(len(article.title) for article in Article.all())
+    else:
+        total = sum(len(article.title) for article in Article.iter_all(chunk_size=chunk_size))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak - baseline, total)
+
+
+def measure(path, mode, chunk_size):
+    env = dict(os.environ, ARTICLES_DB=path)
+    output = subprocess.check_output(
+        [sys.executable, __file__, '--child', mode, '--chunk-size', str(chunk_size)], env=env, text=True
+    )
+    return int(output.split()[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 300000, 1000000])
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--child', choices=['all', 'iter'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.chunk_size)
+        return
+
+    print(f"{'articles':>10}{'all() peak RSS MB':>20}{'iter_all() peak RSS MB':>25}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix='articles-bench-') as tmpdir:
+            path = os.path.join(tmpdir, 'bench.db')
+            with scratch_database(path):
+                populate(size)
+            eager = measure(path, 'all', args.chunk_size)
+            lazy = measure(path, 'iter', args.chunk_size)
+        print(f"{size:>10}{eager / 1024:>20.1f}{lazy / 1024:>25.1f}")
+
+
+if __name__ == '__main__':
+    main()
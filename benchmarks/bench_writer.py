@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Concurrent Article.save throughput with direct writes vs the write-behind thread"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database
+from lib.db import writer
+from lib.db.connection import configure_pool, get_connection
+from lib.models.article import Article
+
+
+def produce(saves, errors):
+    for i in range(saves):
+        try:
+            Article(f"Article {i}", 1, 1).save()
+        except sqlite3.OperationalError:
+            errors.append(1)
+
+
+def run(threads, saves):
+    errors = []
+    workers = [threading.Thread(target=produce, args=(saves, errors)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * saves / (time.perf_counter() - start), len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--saves', type=int, default=200, help='saves per thread')
+    args = parser.parse_args()
+
+    configure_pool(max_size=max(args.threads))
+    print(f"{'threads':>8}{'mode':>14}{'saves/s':>12}{'errors':>8}")
+    for threads in args.threads:
+        for mode in ('direct', 'write-behind'):
+            with scratch_database():
+                conn = get_connection()
+                conn.execute("INSERT INTO authors (id, name) VALUES (1, 'Benchmark Author')")
+                conn.execute("INSERT INTO magazines (id, name, category) VALUES (1, 'Benchmark Weekly', 'Technology')")
+                conn.commit()
+                conn.close()
+                if mode == 'write-behind':
+                    writer.enable_write_behind()
+                try:
+                    rate, errors = run(threads, args.saves)
+                finally:
+                    writer.disable_write_behind()
+            print(f"{threads:>8}{mode:>14}{rate:>12,.0f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.db.connection import close_all_pools, get_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+
+def create_schema():
+    conn = get_connection()
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+    conn.commit()
+    conn.close()
+
+
+@contextmanager
+def scratch_database(path=None):
+    """Point the models at a throwaway database file with the schema applied"""
+    tmpdir = None
+    if path is None:
+        tmpdir = tempfile.mkdtemp(prefix='articles-bench-')
+        path = os.path.join(tmpdir, 'bench.db')
+    previous = os.environ.get('ARTICLES_DB')
+    os.environ['ARTICLES_DB'] = path
+    close_all_pools()
+    try:
+        create_schema()
+        yield path
+    finally:
+        close_all_pools()
+        if previous is None:
+            del os.environ['ARTICLES_DB']
+        else:
+            os.environ['ARTICLES_DB'] = previous
+        if tmpdir is not None:
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def time_calls(fn, iterations, setup=None):
+    """
+    Call fn repeatedly and return per-call latencies in seconds, sorted.
+    If setup is given it runs untimed before each call and its result is
+    passed to fn.
+    """
+    samples = []
+    for _ in range(iterations):
+        if setup is None:
+            start = time.perf_counter()
+            fn()
+        else:
+            arg = setup()
+            start = time.perf_counter()
+            fn(arg)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def summarize(samples):
+    total = sum(samples)
+    return {
+        'calls': len(samples),
+        'p50_us': percentile(samples, 50) * 1e6,
+        'p95_us': percentile(samples, 95) * 1e6,
+        'p99_us': percentile(samples, 99) * 1e6,
+        'ops_per_sec': len(samples) / total if total else 0.0,
+    }
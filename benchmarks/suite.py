@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Latency/throughput benchmark of every public model method, every function in
+lib/db/transactions.py and every report in lib/db/reports.py, at several
+database sizes.
+
+    python benchmarks/suite.py run --sizes 10000 100000 1000000 --output results.json
+    python benchmarks/suite.py compare baseline.json results.json --threshold 0.10
+"""
+
+import argparse
+import collections
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.common import scratch_database, summarize, time_calls
+from lib.db import reports, seed as seed_data, transactions
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+DEFAULT_ITERATIONS = 200
+DEFAULT_THRESHOLD = 0.10
+
+MODELS = (Author, Magazine, Article)
+
+# One benchmark: fn(arg) is timed, setup() prepares arg untimed. Heavy cases
+# (full-table reads) run fewer iterations; writes run after all the reads.
+Case = collections.namedtuple('Case', 'name fn setup heavy writes')
+
+
+def case(name, fn, setup=lambda: None, heavy=False, writes=False):
+    return Case(name, fn, setup, heavy, writes)
+
+
+def populate(articles, seed=42):
+    """Zipf-skewed dataset from lib/db/seed.py: articles/10 authors, articles/1000 magazines"""
+    n_authors = max(10, articles // 10)
+    n_magazines = max(10, articles // 1000)
+    seed_data.generate(n_authors, n_magazines, articles, seed=seed)
+    return n_authors, n_magazines
+
+
+def drain(iterable):
+    collections.deque(iterable, maxlen=0)
+
+
+def quiet(fn):
+    """The transactions functions print their outcome; keep it out of the report"""
+    def call(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+    return call
+
+
+def build_cases(articles, n_authors, n_magazines, rng):
+    author_id = lambda: rng.randint(1, n_authors)
+    magazine_id = lambda: rng.randint(1, n_magazines)
+    article_id = lambda: rng.randint(1, articles)
+    category = lambda: rng.choice(seed_data.CATEGORIES)
+    counter = iter(range(10 ** 9))
+
+    def article_ids_in_magazine():
+        source = magazine_id()
+        ids = Article.query().filter(magazine_id=source).limit(10).values_list("id", flat=True)
+        return source, source % n_magazines + 1, ids
+
+    def author_with_articles():
+        author = Author(f"Doomed Author {next(counter)}").save()
+        Article.bulk_create(Article(f"Doomed {i}", author.id, magazine_id()) for i in range(5))
+        return author.id
+
+    def authors_with_articles():
+        authors = Author.bulk_create(Author(f"Spam Author {next(counter)}") for _ in range(100))
+        Article.bulk_create(Article(f"Spam {i}", author.id, magazine_id()) for author in authors for i in range(5))
+        return [author.id for author in authors]
+
+    return [
+        # Author
+        case("Author.find_by_id", Author.find_by_id, author_id),
+        case("Author.find_by_name", Author.find_by_name, lambda: f"Author {author_id()}"),
+        case("Author.all", lambda _: Author.all(), heavy=True),
+        case("Author.iter_all", lambda _: drain(Author.iter_all()), heavy=True),
+        case("Author.paginate", lambda _: Author.paginate(order_by="name")),
+        case("Author.count", lambda _: Author.count(), heavy=True),
+        case("Author.exists", lambda _: Author.exists()),
+        case("Author.query", lambda prefix: Author.query().filter(name__startswith=prefix).limit(50).all(),
+             lambda: f"Author {author_id()}"),
+        case("Author.articles", lambda author: author.articles(), lambda: Author.find_by_id(author_id())),
+        case("Author.magazines", lambda author: author.magazines(), lambda: Author.find_by_id(author_id())),
+        case("Author.topic_areas", lambda author: author.topic_areas(), lambda: Author.find_by_id(author_id())),
+        case("Author.articles_for", Author.articles_for, lambda: [author_id() for _ in range(100)]),
+        case("Author.magazines_for", Author.magazines_for, lambda: [author_id() for _ in range(100)]),
+        case("Author.topic_areas_for", Author.topic_areas_for, lambda: [author_id() for _ in range(100)]),
+        # Magazine
+        case("Magazine.find_by_id", Magazine.find_by_id, magazine_id),
+        case("Magazine.find_by_name", Magazine.find_by_name, lambda: f"Magazine {magazine_id()}"),
+        case("Magazine.find_by_category", Magazine.find_by_category, category),
+        case("Magazine.all", lambda _: Magazine.all(), heavy=True),
+        case("Magazine.iter_all", lambda _: drain(Magazine.iter_all()), heavy=True),
+        case("Magazine.iter_by_category", lambda c: drain(Magazine.iter_by_category(c)), category),
+        case("Magazine.paginate", lambda c: Magazine.paginate(category=c), category),
+        case("Magazine.count", lambda _: Magazine.count(), heavy=True),
+        case("Magazine.exists", lambda _: Magazine.exists()),
+        case("Magazine.query", lambda c: Magazine.query().filter(category=c).order_by("-id").limit(50).all(),
+             category),
+        case("Magazine.articles", lambda m: m.articles(), lambda: Magazine.find_by_id(magazine_id())),
+        case("Magazine.contributors", lambda m: m.contributors(), lambda: Magazine.find_by_id(magazine_id())),
+        case("Magazine.article_titles", lambda m: m.article_titles(), lambda: Magazine.find_by_id(magazine_id())),
+        case("Magazine.articles_for", Magazine.articles_for, lambda: [magazine_id() for _ in range(10)], heavy=True),
+        case("Magazine.article_titles_for", Magazine.article_titles_for, lambda: [magazine_id() for _ in range(10)],
+             heavy=True),
+        case("Magazine.contributing_authors", lambda m: m.contributing_authors(),
+             lambda: Magazine.find_by_id(magazine_id())),
+        case("Magazine.top_publisher", lambda _: Magazine.top_publisher()),
+        # Article
+        case("Article.find_by_id", Article.find_by_id, article_id),
+        case("Article.find_by_title", Article.find_by_title, lambda: Article.find_by_id(article_id()).title),
+        case("Article.find_by_author", Article.find_by_author, author_id),
+        case("Article.find_by_magazine", Article.find_by_magazine, magazine_id),
+        case("Article.all", lambda _: Article.all(), heavy=True),
+        case("Article.iter_all", lambda _: drain(Article.iter_all()), heavy=True),
+        case("Article.iter_by_title", lambda t: drain(Article.iter_by_title(t)),
+             lambda: Article.find_by_id(article_id()).title),
+        case("Article.iter_by_author", lambda a: drain(Article.iter_by_author(a)), author_id),
+        case("Article.iter_by_magazine", lambda m: drain(Article.iter_by_magazine(m)), magazine_id),
+        case("Article.paginate", lambda m: Article.paginate(magazine_id=m), magazine_id),
+        case("Article.count", lambda _: Article.count(), heavy=True),
+        case("Article.exists", lambda _: Article.exists()),
+        case("Article.query", lambda a: Article.query().filter(author_id=a).order_by("-id").limit(20).all(),
+             author_id),
+        case("Article.search", Article.search, lambda: " ".join(rng.sample(seed_data.TITLE_WORDS, 2))),
+        case("Article.author", lambda article: article.author(), lambda: Article.find_by_id(article_id())),
+        case("Article.magazine", lambda article: article.magazine(), lambda: Article.find_by_id(article_id())),
+        # lib/db/reports.py reports
+        *(case(f"report.{name}", lambda _, report=report: report(), heavy=True)
+          for name, report in reports.REPORTS.items()),
+        # Writes
+        case("Author.save", lambda author: author.save(), lambda: Author(f"New Author {next(counter)}"),
+             writes=True),
+        case("Author.submit", lambda obj: obj.submit().result(), lambda: Author(f"Queued Author {next(counter)}"),
+             writes=True),
+        case("Author.bulk_create", Author.bulk_create,
+             lambda: [Author(f"Bulk Author {next(counter)}") for _ in range(100)], writes=True),
+        case("Author.bulk_update", Author.bulk_update, lambda: renamed(Author, "name", author_id), writes=True),
+        case("Author.add_article", lambda pair: pair[0].add_article(pair[1], "Added Article"),
+             lambda: (Author.find_by_id(author_id()), Magazine.find_by_id(magazine_id())), writes=True),
+        case("Magazine.save", lambda m: m.save(), lambda: Magazine(f"New Magazine {next(counter)}", category()),
+             writes=True),
+        case("Magazine.submit", lambda obj: obj.submit().result(),
+             lambda: Magazine(f"Queued Magazine {next(counter)}", category()), writes=True),
+        case("Magazine.bulk_create", Magazine.bulk_create,
+             lambda: [Magazine(f"Bulk Magazine {next(counter)}", category()) for _ in range(100)], writes=True),
+        case("Magazine.bulk_update", Magazine.bulk_update, lambda: renamed(Magazine, "name", magazine_id),
+             writes=True),
+        case("Article.save", lambda article: article.save(),
+             lambda: Article(f"New Article {next(counter)}", author_id(), magazine_id()), writes=True),
+        case("Article.submit", lambda obj: obj.submit().result(),
+             lambda: Article(f"Queued Article {next(counter)}", author_id(), magazine_id()), writes=True),
+        case("Article.bulk_create", Article.bulk_create,
+             lambda: [Article(f"Bulk Article {next(counter)}", author_id(), magazine_id()) for _ in range(100)],
+             writes=True),
+        case("Article.bulk_update", Article.bulk_update, lambda: renamed(Article, "title", article_id),
+             writes=True),
+        case("transactions.add_author_with_articles",
+             lambda data: quiet(transactions.add_author_with_articles)(*data),
+             lambda: (f"Txn Author {next(counter)}",
+                      [{"title": f"Txn Article {i}", "magazine_id": magazine_id()} for i in range(10)]),
+             writes=True),
+        case("transactions.transfer_articles_between_magazines",
+             lambda args: quiet(transactions.transfer_articles_between_magazines)(*args),
+             article_ids_in_magazine, writes=True),
+        case("transactions.delete_author_and_articles", quiet(transactions.delete_author_and_articles),
+             author_with_articles, writes=True),
+        case("transactions.delete_authors", transactions.delete_authors, authors_with_articles, writes=True),
+    ]
+
+
+def renamed(model, field, random_id):
+    objects = model.query().filter(id__in={random_id() for _ in range(100)}).all()
+    for obj in objects:
+        setattr(obj, field, getattr(obj, field) + " (edited)")
+    return objects
+
+
+def public_methods():
+    """Model.method names that the suite is expected to cover"""
+    names = set()
+    for model in MODELS:
+        members = {name for name, _ in inspect.getmembers(model) if not name.startswith('_')}
+        for name in members:
+            attr = inspect.getattr_static(model, name)
+            if isinstance(attr, property) or not callable(getattr(model, name)):
+                continue
+            # a-prefixed asyncio wrappers run the same code on an executor
+            if name.startswith('a') and name[1:] in members:
+                continue
+            names.add(f"{model.__name__}.{name}")
+    for name, fn in inspect.getmembers(transactions, inspect.isfunction):
+        if fn.__module__ == transactions.__name__ and not name.startswith('_'):
+            names.add(f"transactions.{name}")
+    return names
+
+
+def uncovered(cases):
+    return sorted(public_methods() - {c.name for c in cases})
+
+
+def run_size(articles, iterations, only=None, seed=42, log=print):
+    results = {}
+    with scratch_database():
+        start = time.perf_counter()
+        n_authors, n_magazines = populate(articles, seed)
+        log(f"  generated {articles:,} articles, {n_authors:,} authors, {n_magazines:,} magazines "
+            f"in {time.perf_counter() - start:.1f}s")
+        cases = build_cases(articles, n_authors, n_magazines, random.Random(seed))
+        cases.sort(key=lambda c: c.writes)
+        for c in cases:
+            if only and not any(pattern in c.name for pattern in only):
+                continue
+            count = max(3, iterations // 20) if c.heavy else iterations
+            summary = summarize(time_calls(c.fn, count, c.setup))
+            results[c.name] = summary
+            log(f"  {c.name:<52}{summary['p50_us']:>12,.0f}{summary['p95_us']:>12,.0f}"
+                f"{summary['p99_us']:>12,.0f}{summary['ops_per_sec']:>12,.1f}")
+    return results
+
+
+def run(args):
+    missing = uncovered(build_cases(1, 1, 1, random.Random()))
+    if missing:
+        print(f"warning: no benchmark for {', '.join(missing)}")
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'seed': args.seed,
+        },
+        'results': {},
+    }
+    for size in args.sizes:
+        print(f"{size:,} articles{'':<36}{'p50 µs':>12}{'p95 µs':>12}{'p99 µs':>12}{'ops/s':>12}")
+        report['results'][str(size)] = run_size(size, args.iterations, args.only, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+def compare_results(baseline, current, metric='p50_us'):
+    """
+    Returns [(size, name, before, after, change)] for every benchmark present
+    in both runs, where change is the relative latency change of metric.
+    """
+    rows = []
+    for size, cases in current['results'].items():
+        for name, summary in cases.items():
+            before = baseline['results'].get(size, {}).get(name)
+            if before is None or not before[metric]:
+                continue
+            rows.append((size, name, before[metric], summary[metric], summary[metric] / before[metric] - 1))
+    return rows
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.metric)
+    regressions = [row for row in rows if row[4] > args.threshold]
+    print(f"{'size':>9}  {'benchmark':<52}{'before':>12}{'after':>12}{'change':>9}")
+    for size, name, before, after, change in rows:
+        flag = "  REGRESSION" if change > args.threshold else ("  faster" if change < -args.threshold else "")
+        print(f"{int(size):>9,}  {name:<52}{before:>12,.0f}{after:>12,.0f}{change:>+9.1%}{flag}")
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%} in {args.metric}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='generate databases and time every benchmark')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    run_parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    run_parser.add_argument('--only', nargs='+', help='run benchmarks whose name contains any of these')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', help='write results as JSON to this file')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions between two saved runs')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='relative slowdown that counts as a regression (default 0.10)')
+    compare_parser.add_argument('--metric', default='p50_us', choices=('p50_us', 'p95_us', 'p99_us'))
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
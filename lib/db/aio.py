@@ -0,0 +1,56 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.db.connection import pin_thread_connection
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The dedicated executor for database work; each worker pins its own connection"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get('ARTICLES_DB_WORKERS', DEFAULT_WORKERS)),
+                    thread_name_prefix='articles-db',
+                    initializer=pin_thread_connection,
+                )
+    return _executor
+
+
+def shutdown_executor(wait=True):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_in_db_thread(fn, *args, **kwargs):
+    """Run a blocking model call on the database executor without blocking the loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def aiter_pages(paginate, chunk_size, **filters):
+    """
+    Async iterator over a keyset-paginated listing. Each chunk is fetched on
+    the executor as its own page, so no connection or cursor is held while
+    the consumer awaits between items.
+    """
+    cursor = None
+    while True:
+        page = await run_in_db_thread(paginate, limit=chunk_size, cursor=cursor, **filters)
+        for item in page.items:
+            yield item
+        if not page.has_next:
+            return
+        cursor = page.next_cursor
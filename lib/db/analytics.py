@@ -0,0 +1,123 @@
+"""
+Whole-database analytics: the per-entity questions of Magazine.contributors,
+Magazine.contributing_authors and Author.topic_areas answered for every
+magazine or author at once. Each function makes one grouped pass over the
+trigger-maintained counter tables, or, given a lib.db.columnar Snapshot,
+computes the same result with NumPy group-bys without touching SQLite.
+
+Results are dicts keyed by id holding ids or category names in ascending
+order. Magazines and authors without articles are left out, except in
+magazine_article_counts, which has an entry (possibly 0) for every magazine.
+"""
+
+from lib.db.columnar import MISSING, np
+from lib.db.connection import get_connection
+
+
+def _fetch(sql, params=()):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    try:
+        return cursor.execute(sql, params).fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _group(pairs):
+    """[(key, value), ...] sorted by key -> {key: [value, ...]}"""
+    grouped = {}
+    for key, value in pairs:
+        values = grouped.get(key)
+        if values is None:
+            values = grouped[key] = []
+        values.append(value)
+    return grouped
+
+
+def _pair_counts(snapshot):
+    # Distinct (magazine_id, author_id) pairs with their article counts,
+    # sorted by magazine then author: the NumPy magazine_author_counts
+    articles = snapshot.articles
+    keep = (articles['magazine_id'] != MISSING) & (articles['author_id'] != MISSING)
+    magazine_ids = articles['magazine_id'][keep]
+    author_ids = articles['author_id'][keep]
+    if not len(author_ids):
+        return magazine_ids, author_ids, np.zeros(0, dtype=np.int64)
+    width = int(author_ids.max()) + 1
+    keys, counts = np.unique(magazine_ids * width + author_ids, return_counts=True)
+    return keys // width, keys % width, counts
+
+
+def _group_arrays(keys, values):
+    """Sorted key and value arrays -> {key: [value, ...]} with one split per key"""
+    if not len(keys):
+        return {}
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return {int(keys[start]): chunk.tolist() for start, chunk in zip(starts, np.split(values, starts[1:]))}
+
+
+def magazine_article_counts(snapshot=None):
+    """{magazine_id: number of articles} for every magazine"""
+    if snapshot is None:
+        return dict(_fetch("""
+            SELECT m.id, IFNULL(c.article_count, 0)
+            FROM magazines m LEFT JOIN magazine_article_counts c ON c.magazine_id = m.id
+            ORDER BY m.id
+        """))
+    magazine_ids = snapshot.magazines['id']
+    linked = snapshot.articles['magazine_id']
+    linked = linked[linked != MISSING]
+    size = int(max(magazine_ids.max(initial=0), linked.max(initial=0))) + 1
+    counts = np.bincount(linked, minlength=size)[magazine_ids]
+    return dict(zip(magazine_ids.tolist(), counts.tolist()))
+
+
+def magazine_contributors(snapshot=None):
+    """{magazine_id: [author_id, ...]}: everyone with an article in the magazine"""
+    return magazine_contributing_authors(0, snapshot)
+
+
+def magazine_contributing_authors(more_than=2, snapshot=None):
+    """
+    {magazine_id: [author_id, ...]} of authors with more than more_than
+    articles in each magazine; the default matches
+    Magazine.contributing_authors
+    """
+    if snapshot is None:
+        return _group(_fetch("""
+            SELECT magazine_id, author_id FROM magazine_author_counts
+            WHERE article_count > ?
+            ORDER BY magazine_id, author_id
+        """, (more_than,)))
+    magazine_ids, author_ids, counts = _pair_counts(snapshot)
+    keep = counts > more_than
+    return _group_arrays(magazine_ids[keep], author_ids[keep])
+
+
+def author_topic_areas(snapshot=None):
+    """{author_id: [category, ...]}: the categories of the magazines each author wrote for"""
+    if snapshot is None:
+        return _group(_fetch("""
+            SELECT c.author_id, m.category
+            FROM magazine_author_counts c JOIN magazines m ON m.id = c.magazine_id
+            GROUP BY c.author_id, m.category
+            ORDER BY c.author_id, m.category
+        """))
+    magazine_ids, author_ids, _ = _pair_counts(snapshot)
+    if not len(author_ids):
+        return {}
+    # Map each magazine id to its category's rank in sorted name order, so
+    # that sorting codes sorts names
+    names = np.asarray(snapshot.categories, dtype=object)
+    order = np.argsort(names)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[order] = np.arange(len(names))
+    category_of = np.full(int(max(snapshot.magazines['id'].max(), magazine_ids.max())) + 1, -1, dtype=np.int64)
+    category_of[snapshot.magazines['id']] = rank[snapshot.magazines['category']]
+    ranks = category_of[magazine_ids]
+    known = ranks >= 0
+    width = len(names)
+    keys = np.unique(author_ids[known] * width + ranks[known])
+    return _group_arrays(keys // width, names[order][keys % width])
@@ -0,0 +1,91 @@
+from itertools import islice
+from operator import attrgetter
+
+from lib.db import identity_map
+from lib.db.connection import get_connection
+from lib.db.session import after_transaction, current_session, run_in_transaction
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Ids per IN clause for batch loaders; well under SQLite's host parameter limit
+DEFAULT_IN_CHUNK_SIZE = 500
+
+
+def chunked(iterable, size):
+    """Yield lists of at most size items from iterable"""
+    if size < 1:
+        raise ValueError("batch_size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def select_in(sql, ids, chunk_size=DEFAULT_IN_CHUNK_SIZE):
+    """
+    Run sql once per chunk_size ids, with {ids} in it replaced by that many
+    placeholders, and return all the rows. One connection serves every chunk.
+    """
+    rows = []
+    conn = get_connection()
+    try:
+        for chunk in chunked(ids, chunk_size):
+            rows.extend(conn.execute(sql.format(ids=", ".join("?" * len(chunk))), chunk).fetchall())
+    finally:
+        conn.close()
+    return rows
+
+
+def bulk_insert(objects, table, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    INSERT unsaved model instances with executemany, batch_size rows per call.
+    Ids are allocated up front from MAX(id) while holding the write lock and
+    assigned back to the objects once the transaction succeeds; inside a
+    Session they lose them again if the session rolls back.
+    """
+    objects = list(objects)
+    if any(obj.id is not None for obj in objects):
+        raise ValueError("bulk_create only accepts unsaved objects")
+    if not objects:
+        return objects
+    values = attrgetter(*columns) if len(columns) > 1 else (lambda obj: (getattr(obj, columns[0]),))
+    sql = f"INSERT INTO {table} (id, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})"
+
+    def work(cursor):
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        first_id = cursor.fetchone()[0] + 1
+        for offset, batch in enumerate(chunked(objects, batch_size)):
+            start = first_id + offset * batch_size
+            cursor.executemany(sql, [(start + i,) + values(obj) for i, obj in enumerate(batch)])
+        return first_id
+
+    first_id = run_in_transaction(work)
+    for i, obj in enumerate(objects):
+        obj.id = first_id + i
+    session = current_session()
+    if session is not None:
+        session._inserted.extend(objects)
+    return objects
+
+
+def bulk_update(objects, table, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """UPDATE saved model instances with executemany in one transaction"""
+    objects = list(objects)
+    if any(obj.id is None for obj in objects):
+        raise ValueError("bulk_update only accepts saved objects")
+    values = attrgetter(*columns, 'id')
+    sql = f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?"
+
+    def work(cursor):
+        updated = 0
+        for batch in chunked(objects, batch_size):
+            cursor.executemany(sql, [values(obj) for obj in batch])
+            updated += cursor.rowcount
+        return updated
+
+    updated = run_in_transaction(work)
+    ids = [obj.id for obj in objects]
+    after_transaction(lambda: identity_map.invalidate(table, *ids))
+    return updated
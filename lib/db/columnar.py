@@ -0,0 +1,166 @@
+"""
+Columnar export of the articles, authors and magazines tables for analytics.
+Ids and foreign keys become int64 NumPy arrays and magazine categories are
+dictionary encoded (small integer codes plus a list of the distinct
+values). A snapshot can be saved as one .npy file per column and loaded
+back memory-mapped, so repeated analysis does not touch SQLite at all.
+
+Requires NumPy, which is an optional dependency of this project.
+"""
+
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from lib.db.connection import get_connection
+
+# Rows fetched per round trip while exporting; bounds the Python-side memory
+DEFAULT_CHUNK_SIZE = 50000
+
+# Stored in place of a NULL foreign key
+MISSING = -1
+
+FORMAT_VERSION = 1
+
+# table -> (query, [(column, kind)]); 'int' columns are stored as int64,
+# 'category' columns as int32 codes into Snapshot.categories
+_TABLES = {
+    'authors': ("SELECT id FROM authors ORDER BY id", [('id', 'int')]),
+    'magazines': ("SELECT id, category FROM magazines ORDER BY id", [('id', 'int'), ('category', 'category')]),
+    'articles': (
+        f"SELECT id, IFNULL(author_id, {MISSING}), IFNULL(magazine_id, {MISSING}) FROM articles ORDER BY id",
+        [('id', 'int'), ('author_id', 'int'), ('magazine_id', 'int')]
+    ),
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("lib.db.columnar needs NumPy; install it with 'pip install numpy'")
+
+
+class Snapshot:
+    """
+    The three tables as columns: snapshot.articles['author_id'] is an
+    int64 array aligned with snapshot.articles['id'], and
+    snapshot.magazines['category'] holds codes into snapshot.categories.
+    Rows are in id order.
+    """
+
+    def __init__(self, tables, categories):
+        self.tables = tables
+        self.categories = list(categories)
+
+    @property
+    def authors(self):
+        return self.tables['authors']
+
+    @property
+    def magazines(self):
+        return self.tables['magazines']
+
+    @property
+    def articles(self):
+        return self.tables['articles']
+
+    def decode_categories(self, codes):
+        """Category names for an array of codes"""
+        return np.asarray(self.categories, dtype=object)[codes]
+
+    def save(self, directory):
+        """Write every column as <table>.<column>.npy plus a small manifest"""
+        os.makedirs(directory, exist_ok=True)
+        for table, columns in self.tables.items():
+            for column, values in columns.items():
+                np.save(os.path.join(directory, f"{table}.{column}.npy"), values)
+        manifest = {
+            'format': FORMAT_VERSION,
+            'categories': self.categories,
+            'columns': {table: list(columns) for table, columns in self.tables.items()},
+            'rows': {table: len(next(iter(columns.values()))) for table, columns in self.tables.items()},
+        }
+        with open(os.path.join(directory, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved snapshot; with mmap the arrays are read-only views of the files"""
+        _require_numpy()
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r} in {directory}")
+        mmap_mode = 'r' if mmap else None
+        tables = {
+            table: {column: np.load(os.path.join(directory, f"{table}.{column}.npy"), mmap_mode=mmap_mode)
+                    for column in columns}
+            for table, columns in manifest['columns'].items()
+        }
+        return cls(tables, manifest['categories'])
+
+    def __repr__(self):
+        sizes = ", ".join(f"{table}={len(columns['id'])}" for table, columns in self.tables.items())
+        return f"<Snapshot {sizes}>"
+
+
+def _read_table(cursor, table, chunk_size, categories):
+    sql, columns = _TABLES[table]
+    count = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    arrays = {column: np.empty(count, dtype=np.int64 if kind == 'int' else np.int32) for column, kind in columns}
+    cursor.execute(sql)
+    offset = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        end = offset + len(rows)
+        for i, (column, kind) in enumerate(columns):
+            if kind == 'int':
+                arrays[column][offset:end] = [row[i] for row in rows]
+            else:
+                arrays[column][offset:end] = [categories.setdefault(row[i], len(categories)) for row in rows]
+        offset = end
+    return arrays
+
+
+def export_snapshot(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read all three tables into a Snapshot, chunk_size rows at a time. The
+    arrays are sized from COUNT(*) up front and filled in place, so peak
+    memory is the arrays plus one chunk of rows. Everything is read in one
+    transaction and so comes from a single consistent state.
+    """
+    _require_numpy()
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    conn = get_connection()
+    cursor = conn.cursor()
+    # Plain tuples: building sqlite3.Row objects would double the cost
+    cursor.row_factory = None
+    categories = {}
+    # Inside a Session (or the writer's batch) the connection is already in
+    # a transaction: read within it, under a savepoint, and leave it open
+    own = not conn.in_transaction
+    try:
+        cursor.execute("BEGIN" if own else "SAVEPOINT export_snapshot")
+        tables = {table: _read_table(cursor, table, chunk_size, categories) for table in _TABLES}
+        if own:
+            conn.commit()
+        else:
+            cursor.execute("RELEASE export_snapshot")
+    finally:
+        cursor.close()
+        conn.close()
+    return Snapshot(tables, categories)
+
+
+def load_or_export(directory, chunk_size=DEFAULT_CHUNK_SIZE, refresh=False, mmap=True):
+    """Load the snapshot saved in directory, exporting and saving it first if missing or refresh is set"""
+    _require_numpy()
+    if refresh or not os.path.exists(os.path.join(directory, "manifest.json")):
+        export_snapshot(chunk_size).save(directory)
+    return Snapshot.load(directory, mmap)
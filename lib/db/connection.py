@@ -1,9 +1,361 @@
+import gc
 import sqlite3
 import os
+import threading
+import time
+import urllib.parse
+import weakref
+
+from lib.db import instrumentation
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CHECKOUT_TIMEOUT = 30.0
+HEALTH_CHECK_INTERVAL = 30.0
+
+
+class PoolExhaustedError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available before the timeout"""
+
+
+def get_database_path():
+    # An explicit path wins, otherwise use test database if running tests
+    if os.environ.get('ARTICLES_DB'):
+        return os.environ['ARTICLES_DB']
+    return 'test_articles.db' if os.environ.get('TESTING') else 'articles.db'
+
+
+def _file_identity(path):
+    """Return (device, inode) for the database file, or None if it is missing"""
+    if path == ':memory:':
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool"""
+
+    _pool = None
+    _finalizer = None
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def discard(self):
+        """Really close the underlying sqlite3 connection"""
+        self._pool = None
+        super().close()
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class InstrumentedConnection(PooledConnection):
+    """
+    PooledConnection whose statements are recorded by lib.db.instrumentation.
+    sqlite3.Connection.execute does not go through cursor(), so execute and
+    executemany are routed through an InstrumentedCursor explicitly.
+    """
+
+    def cursor(self, factory=instrumentation.InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _connection_class():
+    # Plain connections cost nothing extra while instrumentation is off;
+    # switching it on or off retires idle connections of the other kind
+    return InstrumentedConnection if instrumentation.enabled() else PooledConnection
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable sqlite3 connections for a single database file.
+    Connections are checked out with checkout() and returned with release()
+    (or conn.close()). At most max_size connections are open at once; a
+    checked out connection that is garbage collected without being returned
+    frees its slot.
+    """
+
+    def __init__(self, database, max_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 health_check_interval=HEALTH_CHECK_INTERVAL):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition(threading.RLock())
+        self._closed = False
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'waits': 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, factory=_connection_class(), check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # This enables column access by name
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn._pool = self
+        conn._identity = _file_identity(self.database)
+        conn._last_used = time.monotonic()
+        conn._finalizer = weakref.finalize(conn, self._slot_freed)
+        self.stats['created'] += 1
+        return conn
+
+    def _slot_freed(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        if type(conn) is not _connection_class():
+            return False
+        # The file may have been deleted or replaced underneath us
+        if self.database != ':memory:' and conn._identity != _file_identity(self.database):
+            return False
+        if time.monotonic() - conn._last_used > self.health_check_interval:
+            try:
+                conn.execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                return False
+        return True
+
+    def checkout(self, timeout=None):
+        """Return a healthy connection, creating one if the pool is below max_size"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        collected = False
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if self._is_healthy(conn):
+                        self.stats['reused'] += 1
+                        return conn
+                    self.stats['discarded'] += 1
+                    conn.discard()
+                if self._open < self.max_size:
+                    self._open += 1
+                    break
+                if not collected:
+                    # Leaked connections sit in reference cycles (sqlite3's
+                    # statement cache), so give the collector a chance first
+                    collected = True
+                    gc.collect()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No connection available for {self.database} after {timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self.stats['waits'] += 1
+                self._cond.wait(remaining)
+        try:
+            return self._connect()
+        except Exception:
+            self._slot_freed()
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            # Connection is unusable, drop it
+            self.stats['discarded'] += 1
+            conn.discard()
+            return
+        conn._last_used = time.monotonic()
+        with self._cond:
+            if self._closed:
+                conn.discard()
+                return
+            if conn in self._idle:
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection; checked out ones close when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.discard()
+
+    @property
+    def size(self):
+        return self._open
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+
+class ThreadConnection:
+    """
+    A single connection dedicated to one thread, used by threads that called
+    pin_thread_connection(). Checkouts nest: the connection is handed out
+    again to inner callers, and any open transaction is rolled back only
+    when the outermost caller returns it.
+    """
+
+    def __init__(self, database, read_only=False):
+        self.database = database
+        self._depth = 0
+        target = f"file:{urllib.parse.quote(database)}?mode=ro" if read_only else database
+        self.conn = sqlite3.connect(target, factory=_connection_class(), check_same_thread=False, uri=read_only)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn._pool = self
+        self.conn._identity = _file_identity(database)
+
+    def is_healthy(self):
+        if type(self.conn) is not _connection_class():
+            return False
+        return self.database == ':memory:' or self.conn._identity == _file_identity(self.database)
+
+    def checkout(self):
+        self._depth += 1
+        return self.conn
+
+    def release(self, conn):
+        self._depth = max(0, self._depth - 1)
+        if self._depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+    def close(self):
+        self.conn.discard()
+
+
+class SharedConnection:
+    """
+    Lends a connection that is already checked out (a Session's) to every
+    get_connection() call on its thread, so they read inside its open
+    transaction. close() from those callers does not release it.
+    """
+
+    def __init__(self, conn, database):
+        self.conn = conn
+        self.database = database
+        self._owner = conn._pool
+        conn._pool = self
+
+    def checkout(self):
+        return self.conn
+
+    def release(self, conn):
+        conn.row_factory = sqlite3.Row
+
+    def restore(self):
+        self.conn._pool = self._owner
+
+
+_thread_state = threading.local()
+
+
+def pin_thread_connection(read_only=False):
+    """
+    Give the calling thread its own connections instead of using the pools;
+    with read_only they are opened with mode=ro and reject writes
+    """
+    if getattr(_thread_state, 'pinned', None) is None:
+        _thread_state.pinned = {}
+        _thread_state.read_only = read_only
+
+
+def unpin_thread_connection():
+    pinned = getattr(_thread_state, 'pinned', None)
+    _thread_state.pinned = None
+    for owner in (pinned or {}).values():
+        owner.close()
+
+
+def share_thread_connection(conn):
+    """Hand conn out from get_connection() on this thread until unshare_thread_connection(conn)"""
+    if getattr(_thread_state, 'shared', None) is None:
+        _thread_state.shared = []
+    _thread_state.shared.append(SharedConnection(conn, get_database_path()))
+
+
+def unshare_thread_connection(conn):
+    shared = getattr(_thread_state, 'shared', None) or []
+    for lender in reversed(shared):
+        if lender.conn is conn:
+            shared.remove(lender)
+            lender.restore()
+            return
+
+
+def _pinned_connection(pinned):
+    database = get_database_path()
+    owner = pinned.get(database)
+    if owner is None or not owner.is_healthy():
+        if owner is not None:
+            owner.close()
+        owner = pinned[database] = ThreadConnection(database, _thread_state.read_only)
+    return owner.checkout()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pool_settings = {'max_size': DEFAULT_POOL_SIZE, 'timeout': DEFAULT_CHECKOUT_TIMEOUT}
+
+
+def get_pool(database=None):
+    """Return the pool for a database path (defaults to the active database)"""
+    database = database or get_database_path()
+    pool = _pools.get(database)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(database)
+            if pool is None:
+                pool = ConnectionPool(database, **_pool_settings)
+                _pools[database] = pool
+    return pool
+
+
+def configure_pool(max_size=None, timeout=None):
+    """Change pool limits; existing pools are closed and rebuilt on next use"""
+    if max_size is not None:
+        _pool_settings['max_size'] = max_size
+    if timeout is not None:
+        _pool_settings['timeout'] = timeout
+    close_all_pools()
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
 
 def get_connection():
-    # Use test database if running tests
-    db_name = 'test_articles.db' if os.environ.get('TESTING') else 'articles.db'
-    conn = sqlite3.connect(db_name)
-    conn.row_factory = sqlite3.Row  # This enables column access by name
-    return conn
\ No newline at end of file
+    """Check out a pooled connection; call close() on it to return it"""
+    shared = getattr(_thread_state, 'shared', None)
+    if shared and shared[-1].database == get_database_path():
+        return shared[-1].checkout()
+    pinned = getattr(_thread_state, 'pinned', None)
+    if pinned is not None:
+        return _pinned_connection(pinned)
+    return get_pool().checkout()
+
+
+def release_connection(conn):
+    conn.close()
@@ -0,0 +1,93 @@
+import os
+import sys
+
+# Add the project root to the path so this module can run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from lib.db.connection import get_connection
+
+# (counter table, key columns, query computing the true counts from scratch)
+COUNTERS = [
+    ("magazine_article_counts", ("magazine_id",), """
+        SELECT id, SUM(n) FROM (
+            SELECT id, 0 AS n FROM magazines
+            UNION ALL
+            SELECT magazine_id, 1 FROM articles WHERE magazine_id IS NOT NULL
+        ) GROUP BY id
+    """),
+    ("author_article_counts", ("author_id",), """
+        SELECT id, SUM(n) FROM (
+            SELECT id, 0 AS n FROM authors
+            UNION ALL
+            SELECT author_id, 1 FROM articles WHERE author_id IS NOT NULL
+        ) GROUP BY id
+    """),
+    ("magazine_author_counts", ("magazine_id", "author_id"), """
+        SELECT magazine_id, author_id, COUNT(*)
+        FROM articles
+        WHERE magazine_id IS NOT NULL AND author_id IS NOT NULL
+        GROUP BY magazine_id, author_id
+    """),
+]
+
+
+def check_counters(conn=None):
+    """
+    Compare every counter table with counts recomputed from articles.
+    Returns {table: [(key, stored, actual), ...]} for the rows that differ;
+    an empty dict means the counters are consistent.
+    """
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        problems = {}
+        for table, keys, truth in COUNTERS:
+            expected = {tuple(row[:len(keys)]): row[len(keys)] for row in conn.execute(truth)}
+            stored = {
+                tuple(row[:len(keys)]): row[len(keys)]
+                for row in conn.execute(f"SELECT {', '.join(keys)}, article_count FROM {table}")
+            }
+            diffs = [
+                (key, stored.get(key), expected.get(key))
+                for key in sorted(set(expected) | set(stored))
+                if stored.get(key) != expected.get(key)
+            ]
+            if diffs:
+                problems[table] = diffs
+        return problems
+    finally:
+        if own:
+            conn.close()
+
+
+def rebuild_counters(conn=None):
+    """Recompute every counter table from scratch in one transaction"""
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for table, keys, truth in COUNTERS:
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} ({', '.join(keys)}, article_count) {truth}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own:
+            conn.close()
+
+
+if __name__ == "__main__":
+    problems = check_counters()
+    if not problems:
+        print("Article counters are consistent")
+    else:
+        for table, diffs in problems.items():
+            print(f"{table}: {len(diffs)} rows out of date")
+        if "--rebuild" in sys.argv:
+            rebuild_counters()
+            print("Counters rebuilt")
+        else:
+            print("Run with --rebuild to recompute them")
+            sys.exit(1)
@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+
+from lib.db.connection import get_database_path
+from lib.db.session import sees_uncommitted_writes
+
+DEFAULT_MAXSIZE = 1024
+
+
+class IdentityMap:
+    """
+    Bounded LRU of model instances keyed by (database, table, id). While
+    enabled, find_by_id returns the cached instance instead of querying, so
+    repeated relationship traversal (article.author(), article.magazine())
+    stays in memory. Writes through the models and lib/db/transactions.py
+    invalidate the entries they touch.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(table, id):
+        return (get_database_path(), table, id)
+
+    def get(self, table, id):
+        key = self._key(table, id)
+        with self._lock:
+            obj = self._entries.get(key)
+            if obj is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return obj
+
+    def put(self, table, obj):
+        key = self._key(table, obj.id)
+        with self._lock:
+            self._entries[key] = obj
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table, id):
+        with self._lock:
+            self._entries.pop(self._key(table, id), None)
+
+    def invalidate_where(self, table, predicate=None):
+        """Drop every cached row of table, or only those matching predicate"""
+        database = get_database_path()
+        with self._lock:
+            stale = [
+                key for key, obj in self._entries.items()
+                if key[0] == database and key[1] == table and (predicate is None or predicate(obj))
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_identity_map = None
+
+
+def enable_identity_map(maxsize=DEFAULT_MAXSIZE):
+    """Turn on find_by_id caching with a fresh, empty map"""
+    global _identity_map
+    _identity_map = IdentityMap(maxsize)
+    return _identity_map
+
+
+def disable_identity_map():
+    global _identity_map
+    _identity_map = None
+
+
+def get_identity_map():
+    """The active IdentityMap, or None when caching is off"""
+    return _identity_map
+
+
+# Module-level helpers used by the models; all are no-ops while disabled
+
+def lookup(table, id):
+    identity_map = _identity_map
+    return identity_map.get(table, id) if identity_map is not None and not sees_uncommitted_writes() else None
+
+
+def remember(table, obj):
+    identity_map = _identity_map
+    if identity_map is not None and obj is not None and obj.id is not None and not sees_uncommitted_writes():
+        identity_map.put(table, obj)
+    return obj
+
+
+def invalidate(table, *ids):
+    identity_map = _identity_map
+    if identity_map is not None:
+        for id in ids:
+            identity_map.invalidate(table, id)
+
+
+def invalidate_where(table, predicate=None):
+    identity_map = _identity_map
+    if identity_map is not None:
+        identity_map.invalidate_where(table, predicate)
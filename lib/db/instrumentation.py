@@ -0,0 +1,267 @@
+import collections
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_SLOW_MS = 100.0
+RECENT_SLOW_QUERIES = 100
+
+logger = logging.getLogger('lib.db.slow_queries')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w?])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_settings = {'enabled': False, 'slow_ms': DEFAULT_SLOW_MS, 'explain': False}
+_stats = {}
+_slow = collections.deque(maxlen=RECENT_SLOW_QUERIES)
+_lock = threading.Lock()
+_log_handler = None
+
+
+def normalize_sql(sql):
+    """The shape of a statement: literals and IN lists become ?, whitespace collapsed"""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _caller():
+    """The model method or transactions function that issued the statement"""
+    frame = sys._getframe(2)
+    private = fallback = None
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        code = frame.f_code
+        if module.startswith('lib.models.') or module == 'lib.db.transactions':
+            name = getattr(code, 'co_qualname', code.co_name)
+            if module == 'lib.db.transactions':
+                name = f"transactions.{name}"
+            # Helpers like _write or a transaction's cursor-level body are
+            # reported as the public method that called them, if any
+            if not code.co_name.startswith(('_', '<')):
+                return name
+            private = private or name
+        elif fallback is None and not module.startswith('lib.db.') and module != 'sqlite3':
+            fallback = f"{module}:{code.co_name}"
+        frame = frame.f_back
+    return private or fallback or '<unknown>'
+
+
+class QueryStats:
+    """Aggregate timings for one statement shape"""
+
+    __slots__ = ("sql", "calls", "total_ms", "max_ms", "rows", "slow", "callers")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.callers = collections.Counter()
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def as_dict(self):
+        return {
+            'sql': self.sql, 'calls': self.calls, 'total_ms': self.total_ms, 'mean_ms': self.mean_ms,
+            'max_ms': self.max_ms, 'rows': self.rows, 'slow': self.slow, 'callers': dict(self.callers),
+        }
+
+
+def _record(conn, sql, params, caller, duration_ms, rows):
+    shape = normalize_sql(sql)
+    slow = duration_ms >= _settings['slow_ms']
+    with _lock:
+        stats = _stats.get(shape)
+        if stats is None:
+            stats = _stats[shape] = QueryStats(shape)
+        stats.calls += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        stats.rows += rows
+        stats.callers[caller] += 1
+        if slow:
+            stats.slow += 1
+    if not slow:
+        return
+    plan = None
+    if _settings['explain'] and shape.upper().startswith(('SELECT', 'WITH')):
+        plan = explain(conn, sql, params)
+    entry = {'sql': shape, 'caller': caller, 'duration_ms': duration_ms, 'rows': rows, 'plan': plan,
+             'at': time.time()}
+    _slow.append(entry)
+    logger.warning("slow query %.1fms rows=%d caller=%s sql=%s%s", duration_ms, rows, caller, shape,
+                   "".join(f"\n    {line}" for line in plan or ()))
+
+
+def explain(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN lines for a statement, bypassing the instrumentation"""
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    except sqlite3.Error as e:
+        return [f"(plan unavailable: {e})"]
+    return [row[3] for row in rows]
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement from execute() until its rows are
+    exhausted (or the cursor is reused, closed or dropped) and records it.
+    """
+
+    _pending = None
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        sql, params, caller, elapsed, fetched = pending
+        rows = fetched if self.description is not None else max(self.rowcount, 0)
+        _record(self.connection, sql, params, caller, elapsed * 1000, rows)
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        pending = self._pending
+        if pending is not None:
+            pending[3] += time.perf_counter() - start
+        return result
+
+    def _fetched(self, count, exhausted):
+        if self._pending is not None:
+            self._pending[4] += count
+            if exhausted:
+                self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        caller = _caller()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._pending = [sql, parameters, caller, time.perf_counter() - start, 0]
+        if self.description is None:
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        caller = _caller()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._pending = [sql, (), caller, time.perf_counter() - start, 0]
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        self._fetched(row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        self._fetched(len(rows), len(rows) < (self.arraysize if size is None else size))
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._fetched(len(rows), True)
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._fetched(0, True)
+            raise
+        self._fetched(1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+def enabled():
+    return _settings['enabled']
+
+
+def enable_instrumentation(slow_ms=DEFAULT_SLOW_MS, slow_log=None, explain_slow=False):
+    """
+    Start recording every statement run through pooled connections. Statements
+    taking at least slow_ms are logged to the 'lib.db.slow_queries' logger
+    (and appended to the file slow_log if given); with explain_slow their
+    EXPLAIN QUERY PLAN is captured too.
+    """
+    global _log_handler
+    _settings.update(enabled=True, slow_ms=slow_ms, explain=explain_slow)
+    if _log_handler is not None:
+        logger.removeHandler(_log_handler)
+        _log_handler.close()
+        _log_handler = None
+    if slow_log is not None:
+        _log_handler = logging.FileHandler(slow_log)
+        _log_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(_log_handler)
+
+
+def disable_instrumentation():
+    _settings['enabled'] = False
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+        _slow.clear()
+
+
+def get_stats():
+    """Aggregate stats per statement shape, slowest total time first"""
+    with _lock:
+        return sorted((stats.as_dict() for stats in _stats.values()), key=lambda s: s['total_ms'], reverse=True)
+
+
+def slow_queries():
+    """The most recent slow statements, oldest first"""
+    with _lock:
+        return list(_slow)
+
+
+def format_stats(top=20):
+    lines = [f"{'calls':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}{'rows':>9}  statement / callers"]
+    for stats in get_stats()[:top]:
+        lines.append(f"{stats['calls']:>7}{stats['total_ms']:>11.1f}{stats['mean_ms']:>10.2f}"
+                     f"{stats['max_ms']:>10.2f}{stats['rows']:>9}  {stats['sql'][:100]}")
+        callers = ", ".join(f"{name} x{count}" for name, count in
+                            sorted(stats['callers'].items(), key=lambda item: -item[1])[:3])
+        lines.append(f"{'':>47}  <- {callers}")
+    return "\n".join(lines)
+
+
+def configure_from_env():
+    """ARTICLES_DB_INSTRUMENT=1 turns instrumentation on at import; see README"""
+    if os.environ.get('ARTICLES_DB_INSTRUMENT'):
+        enable_instrumentation(
+            slow_ms=float(os.environ.get('ARTICLES_DB_SLOW_MS', DEFAULT_SLOW_MS)),
+            slow_log=os.environ.get('ARTICLES_DB_SLOW_LOG'),
+            explain_slow=bool(os.environ.get('ARTICLES_DB_EXPLAIN_SLOW')),
+        )
+
+
+configure_from_env()
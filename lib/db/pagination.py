@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+
+from lib.db.connection import get_connection
+
+DEFAULT_PAGE_SIZE = 50
+
+
+class Page:
+    """One page of results plus the cursor for the page after it"""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"<Page {len(self.items)} items, has_next={self.has_next}>"
+
+
+def encode_cursor(state):
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, key_length=None):
+    """Cursor state from a token; with key_length, 'after' must hold that many plain values"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(state, dict) or not isinstance(state.get('after'), list):
+        raise ValueError("Invalid pagination cursor")
+    after = state['after']
+    if key_length is not None and len(after) != key_length:
+        raise ValueError("Invalid pagination cursor")
+    if any(isinstance(value, (list, dict)) for value in after):
+        raise ValueError("Invalid pagination cursor")
+    return state
+
+
+def fetch_page(table, hydrate, order_by, allowed_orders, filters, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Keyset ("seek") pagination over table. Rows are ordered by (order_by, id)
+    and each page starts strictly after the last key of the previous one, so
+    the database seeks straight to it through an index instead of counting
+    past skipped rows the way OFFSET does; deep pages cost the same as the
+    first. filters maps column -> value for equality filters (None values
+    are ignored). Cursors are opaque tokens bound to the ordering and
+    filters they were created with.
+    """
+    if order_by not in allowed_orders:
+        raise ValueError(f"Cannot paginate {table} by {order_by!r}; choose from {allowed_orders}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    filters = {column: value for column, value in filters.items() if value is not None}
+
+    where = [f"{column} = ?" for column in filters]
+    params = list(filters.values())
+    if cursor is not None:
+        state = decode_cursor(cursor, 1 if order_by == 'id' else 2)
+        if state.get('order_by') != order_by or state.get('filters') != filters:
+            raise ValueError("Cursor was created for a different ordering or filter")
+        if order_by == 'id':
+            where.append("id > ?")
+        else:
+            where.append(f"({order_by}, id) > (?, ?)")
+        params.extend(state['after'])
+    order = "id" if order_by == 'id' else f"{order_by}, id"
+    sql = f"SELECT * FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit + 1)
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        after = [last['id']] if order_by == 'id' else [last[order_by], last['id']]
+        next_cursor = encode_cursor({'order_by': order_by, 'filters': filters, 'after': after})
+    return Page([hydrate(row) for row in rows], next_cursor)
@@ -0,0 +1,232 @@
+import json
+import sqlite3
+
+from lib.db.bulk import DEFAULT_IN_CHUNK_SIZE
+from lib.db.connection import get_connection
+from lib.db.streaming import DEFAULT_CHUNK_SIZE, iter_rows
+
+# lookup suffix -> SQL operator (value is bound as a single parameter)
+OPERATORS = {
+    'exact': '=',
+    'ne': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+}
+
+
+def estimated_row_count(table):
+    """
+    Row count of table recorded by the last ANALYZE (sqlite_stat1), or None
+    if it has not been analyzed. Costs one tiny lookup however big the
+    table is, but goes stale as rows are added or removed.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        # no such table: ANALYZE has never run on this database
+        return None
+    finally:
+        conn.close()
+    return int(row[0].split()[0]) if row else None
+
+
+def _prefix_upper_bound(prefix):
+    """
+    The string every text starting with prefix sorts below, and every other
+    text at or above prefix does not: prefix with its last character
+    incremented. None when there is none (empty, or only U+10FFFF).
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code == 0xD800:
+            # Surrogates cannot be stored as UTF-8; skip over them
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+class QuerySet:
+    """
+    Lazy, chainable query over one model table. Every method returns a new
+    QuerySet; nothing touches the database until the QuerySet is iterated
+    or one of count(), exists(), first(), values_list() is called, and each
+    of those runs exactly one parameterized statement.
+
+        Article.query().filter(magazine_id=3, author_id__in=[1, 2]).order_by("-id").limit(50)
+
+    Supported lookups: field, field__ne, field__gt/gte/lt/lte, field__in,
+    field__isnull, field__startswith. Field names are checked against the
+    model's columns, so they are never interpolated from user input.
+    """
+
+    def __init__(self, model, table, columns):
+        self.model = model
+        self.table = table
+        self.columns = columns
+        self._where = []
+        self._params = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+
+    def _clone(self):
+        clone = QuerySet(self.model, self.table, self.columns)
+        clone._where = list(self._where)
+        clone._params = list(self._params)
+        clone._order = list(self._order)
+        clone._limit = self._limit
+        clone._offset = self._offset
+        return clone
+
+    def _column(self, name):
+        if name not in self.columns:
+            raise ValueError(f"{self.model.__name__} has no field {name!r}; choose from {self.columns}")
+        return name
+
+    def filter(self, **conditions):
+        clone = self._clone()
+        for key, value in conditions.items():
+            field, _, lookup = key.partition('__')
+            column = self._column(field)
+            lookup = lookup or 'exact'
+            if lookup in OPERATORS:
+                if value is None and lookup in ('exact', 'ne'):
+                    clone._where.append(f"{column} IS {'NOT ' if lookup == 'ne' else ''}NULL")
+                else:
+                    clone._where.append(f"{column} {OPERATORS[lookup]} ?")
+                    clone._params.append(value)
+            elif lookup == 'in':
+                values = list(value)
+                if not values:
+                    clone._where.append("0")
+                elif len(values) > DEFAULT_IN_CHUNK_SIZE:
+                    # One placeholder per value would run into SQLite's host
+                    # parameter limit; bind the whole list as one JSON array
+                    clone._where.append(f"{column} IN (SELECT value FROM json_each(?))")
+                    clone._params.append(json.dumps(values))
+                else:
+                    clone._where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                    clone._params.extend(values)
+            elif lookup == 'isnull':
+                clone._where.append(f"{column} IS {'' if value else 'NOT '}NULL")
+            elif lookup == 'startswith':
+                # substr() decides; the range lets an index on the column
+                # narrow the rows it has to look at
+                clone._where.append(f"{column} >= ?")
+                clone._params.append(value)
+                upper = _prefix_upper_bound(value)
+                if upper is not None:
+                    clone._where.append(f"{column} < ?")
+                    clone._params.append(upper)
+                clone._where.append(f"substr({column}, 1, ?) = ?")
+                clone._params.extend([len(value), value])
+            else:
+                raise ValueError(f"Unsupported lookup {lookup!r} in {key!r}")
+        return clone
+
+    def order_by(self, *fields):
+        """Replace the ordering; prefix a field with '-' for descending"""
+        clone = self._clone()
+        clone._order = [
+            f"{self._column(field[1:])} DESC" if field.startswith('-') else self._column(field)
+            for field in fields
+        ]
+        return clone
+
+    def limit(self, count):
+        clone = self._clone()
+        clone._limit = count
+        return clone
+
+    def offset(self, count):
+        clone = self._clone()
+        clone._offset = count
+        return clone
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step is not None:
+            raise TypeError("QuerySet only supports [start:stop] slicing")
+        start = index.start or 0
+        clone = self.offset(start) if start else self._clone()
+        if index.stop is not None:
+            clone._limit = max(0, index.stop - start)
+        return clone
+
+    def _compile(self, select="*"):
+        sql = f"SELECT {select} FROM {self.table}"
+        params = list(self._params)
+        if self._where:
+            sql += " WHERE " + " AND ".join(self._where)
+        if self._order:
+            sql += " ORDER BY " + ", ".join(self._order)
+        if self._limit is not None or self._offset is not None:
+            sql += " LIMIT ?"
+            params.append(-1 if self._limit is None else self._limit)
+            if self._offset is not None:
+                sql += " OFFSET ?"
+                params.append(self._offset)
+        return sql, params
+
+    @property
+    def sql(self):
+        return self._compile()[0]
+
+    def iterator(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream model instances without building a list"""
+        sql, params = self._compile()
+        return iter_rows(sql, params, chunk_size, self.model._from_row)
+
+    def __iter__(self):
+        return self.iterator()
+
+    def all(self):
+        return list(self)
+
+    def first(self):
+        results = self.limit(1).all()
+        return results[0] if results else None
+
+    def _scalar(self, sql, params):
+        conn = get_connection()
+        try:
+            row = conn.execute(sql, params).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def count(self):
+        """SELECT COUNT(*) of the matching rows, computed by SQLite"""
+        if self._limit is None and self._offset is None:
+            sql, params = self._compile("COUNT(*)")
+            return self._scalar(sql, params)
+        sql, params = self._compile("1")
+        return self._scalar(f"SELECT COUNT(*) FROM ({sql})", params)
+
+    def exists(self):
+        sql, params = self.limit(1)._compile("1")
+        return self._scalar(f"SELECT EXISTS ({sql})", params) == 1
+
+    def values_list(self, *fields, flat=False):
+        """Plain tuples of the requested columns (no model instances)"""
+        if not fields:
+            fields = self.columns
+        if flat and len(fields) != 1:
+            raise ValueError("flat=True requires exactly one field")
+        columns = ", ".join(self._column(field) for field in fields)
+        sql, params = self._compile(columns)
+        conn = get_connection()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        if flat:
+            return [row[0] for row in rows]
+        return [tuple(row) for row in rows]
+
+    def __repr__(self):
+        return f"<QuerySet {self.model.__name__}: {self.sql}>"
@@ -0,0 +1,285 @@
+"""
+Report engine. Each report is a named function that returns a list of
+plain dicts, so results can be printed as a table, dumped as JSON or sent
+back from a worker process. run_reports() runs them concurrently, each
+worker on its own read-only connection; the database is switched to WAL
+so the readers never block each other or a writer.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from lib.db import result_cache
+from lib.db.connection import get_connection, pin_thread_connection
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# name -> Report, in the order the reports are printed
+REPORTS = {}
+
+
+class Report:
+    def __init__(self, name, title, fn):
+        self.name = name
+        self.title = title
+        self.fn = fn
+
+    def __call__(self):
+        return self.fn()
+
+    def __repr__(self):
+        return f"<Report {self.name}>"
+
+
+def report(name, title):
+    """Register fn() as a report; it must return a list of dicts"""
+    def register(fn):
+        REPORTS[name] = Report(name, title, fn)
+        return fn
+    return register
+
+
+class ReportResult:
+    """Rows and wall time of one report; error is set instead of rows if it raised"""
+
+    def __init__(self, name, title, rows=None, seconds=0.0, error=None):
+        self.name = name
+        self.title = title
+        self.rows = rows or []
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def to_dict(self):
+        return {'name': self.name, 'title': self.title, 'seconds': self.seconds,
+                'rows': self.rows, 'error': self.error}
+
+    def __repr__(self):
+        if self.ok:
+            return f"<ReportResult {self.name} rows={len(self.rows)} {self.seconds * 1000:.1f}ms>"
+        return f"<ReportResult {self.name} failed error={self.error!r}>"
+
+
+def _fetch(sql, params=()):
+    conn = get_connection()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def _sample_author():
+    return Author.query().order_by("id").first()
+
+
+def _sample_magazine():
+    return Magazine.query().order_by("id").first()
+
+
+@report('all_authors', "All Authors")
+def all_authors():
+    return [{'id': author.id, 'name': author.name} for author in Author.iter_all()]
+
+
+@report('all_magazines', "All Magazines")
+def all_magazines():
+    return [{'id': magazine.id, 'name': magazine.name, 'category': magazine.category}
+            for magazine in Magazine.iter_all()]
+
+
+@report('all_articles', "All Articles")
+def all_articles():
+    return [{'id': article.id, 'title': article.title, 'author_id': article.author_id,
+             'magazine_id': article.magazine_id} for article in Article.iter_all()]
+
+
+@report('author_articles', "Articles by the first author")
+def author_articles():
+    author = _sample_author()
+    if author is None:
+        return []
+    return [{'author': author.name, 'title': row['title']} for row in author.articles()]
+
+
+@report('author_magazines', "Magazines the first author has written for")
+def author_magazines():
+    author = _sample_author()
+    if author is None:
+        return []
+    return [{'author': author.name, 'name': row['name'], 'category': row['category']}
+            for row in author.magazines()]
+
+
+@report('author_topic_areas', "Topic areas the first author has written about")
+def author_topic_areas():
+    author = _sample_author()
+    if author is None:
+        return []
+    return [{'author': author.name, 'category': topic} for topic in author.topic_areas()]
+
+
+@report('magazine_articles', "Articles in the first magazine")
+def magazine_articles():
+    magazine = _sample_magazine()
+    if magazine is None:
+        return []
+    return [{'magazine': magazine.name, 'title': row['title']} for row in magazine.articles()]
+
+
+@report('magazine_contributors', "Contributors to the first magazine")
+def magazine_contributors():
+    magazine = _sample_magazine()
+    if magazine is None:
+        return []
+    return [{'magazine': magazine.name, 'name': row['name']} for row in magazine.contributors()]
+
+
+@report('magazine_contributing_authors', "Authors with more than 2 articles in the first magazine")
+def magazine_contributing_authors():
+    magazine = _sample_magazine()
+    if magazine is None:
+        return []
+    return [{'magazine': magazine.name, 'name': row['name']} for row in magazine.contributing_authors()]
+
+
+@report('top_publisher', "Top Publisher (magazine with most articles)")
+def top_publisher():
+    magazine = Magazine.top_publisher()
+    if magazine is None:
+        return []
+    return [{'id': magazine.id, 'name': magazine.name, 'category': magazine.category}]
+
+
+@report('magazines_with_multiple_authors', "Magazines with articles by at least 2 different authors")
+@result_cache.cached("report.magazines_with_multiple_authors")
+def magazines_with_multiple_authors():
+    return _fetch("""
+        SELECT m.name, m.category, COUNT(*) as author_count
+        FROM magazine_author_counts c
+        JOIN magazines m ON m.id = c.magazine_id
+        GROUP BY c.magazine_id
+        HAVING author_count >= 2
+    """)
+
+
+@report('article_counts_by_magazine', "Count of articles in each magazine")
+@result_cache.cached("report.article_counts_by_magazine")
+def article_counts_by_magazine():
+    return _fetch("""
+        SELECT m.name, c.article_count
+        FROM magazine_article_counts c
+        JOIN magazines m ON m.id = c.magazine_id
+        ORDER BY c.article_count DESC
+    """)
+
+
+@report('most_prolific_author', "Author who has written the most articles")
+@result_cache.cached("report.most_prolific_author")
+def most_prolific_author():
+    return _fetch("""
+        SELECT a.name, c.article_count
+        FROM author_article_counts c
+        JOIN authors a ON a.id = c.author_id
+        ORDER BY c.article_count DESC, c.author_id
+        LIMIT 1
+    """)
+
+
+def run_report(name):
+    """Run one registered report on the calling thread and time it"""
+    report = REPORTS[name]
+    start = time.perf_counter()
+    try:
+        rows = report()
+    except Exception as e:
+        return ReportResult(name, report.title, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+    return ReportResult(name, report.title, rows, time.perf_counter() - start)
+
+
+def ensure_wal():
+    """Switch the database to WAL journaling (persistent) so readers run alongside writers"""
+    conn = get_connection()
+    try:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if mode != 'wal':
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    finally:
+        conn.close()
+    return mode
+
+
+def _start_worker():
+    pin_thread_connection(read_only=True)
+
+
+def run_reports(names=None, workers=None, processes=False):
+    """
+    Run the named reports (all of them by default) and return their
+    ReportResults in the same order. Reports are spread over a pool of
+    workers threads, or worker processes with processes=True (useful when
+    the Python side of a report dominates); workers=1 runs them one after
+    another. Every worker reads through its own read-only connection. A
+    report that raises is returned with its error set and does not stop
+    the others.
+    """
+    names = list(REPORTS) if names is None else list(names)
+    unknown = [name for name in names if name not in REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown reports: {', '.join(unknown)}")
+    workers = min(workers or DEFAULT_WORKERS, len(names)) or 1
+    ensure_wal()
+
+    if processes:
+        # spawn: a forked child would inherit the parent's open connections
+        executor = ProcessPoolExecutor(workers, multiprocessing.get_context('spawn'), _start_worker)
+    else:
+        executor = ThreadPoolExecutor(workers, 'articles-report', _start_worker)
+    with executor:
+        return list(executor.map(run_report, names))
+
+
+def to_json(results, wall_seconds=None, indent=2):
+    """Results as a JSON document; wall_seconds is the elapsed time of the whole run"""
+    document = {'reports': [result.to_dict() for result in results]}
+    if wall_seconds is not None:
+        document['wall_seconds'] = wall_seconds
+    return json.dumps(document, indent=indent, default=str)
+
+
+def format_table(results, wall_seconds=None):
+    """Human-readable rendering: each report as a column-aligned table with its timing"""
+    lines = []
+    for result in results:
+        lines.append(f"{result.title} [{result.name}, {result.seconds * 1000:.1f}ms]")
+        if not result.ok:
+            lines.append(f"   error: {result.error}")
+        elif not result.rows:
+            lines.append("   (no rows)")
+        else:
+            columns = list(result.rows[0])
+            cells = [[str(row.get(column, "")) for column in columns] for row in result.rows]
+            widths = [max(len(column), *(len(row[i]) for row in cells)) for i, column in enumerate(columns)]
+            lines.append("   " + "  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+            lines.append("   " + "  ".join("-" * width for width in widths))
+            for row in cells:
+                lines.append("   " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+        lines.append("")
+
+    lines.append("Timings:")
+    for result in results:
+        status = "" if result.ok else "  FAILED"
+        lines.append(f"   {result.name:<32} {result.seconds * 1000:>9.1f}ms{status}")
+    if wall_seconds is not None:
+        total = sum(result.seconds for result in results)
+        lines.append(f"   {'wall time':<32} {wall_seconds * 1000:>9.1f}ms (sum of reports {total * 1000:.1f}ms)")
+    return "\n".join(lines)
@@ -0,0 +1,197 @@
+"""
+Cache for expensive aggregate queries, keyed on the state of the database.
+
+Every cached value is stored with the database version it was computed
+against: the database path, the identity of its file and PRAGMA
+data_version read on a dedicated probe connection. data_version changes
+whenever any other connection commits, from this process or another one,
+so a single PRAGMA tells whether anything has been written since. Entries
+also expire after a TTL and the least recently used ones are evicted once
+max_entries is reached.
+
+The cache is off by default; enable_result_cache() turns it on for the
+functions decorated with @cached.
+"""
+
+import collections
+import functools
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from lib.db.connection import _file_identity, get_database_path
+from lib.db.session import sees_uncommitted_writes
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 300.0
+
+
+class _Probe:
+    """Read-only connection used only to read PRAGMA data_version"""
+
+    def __init__(self, database, identity):
+        self.identity = identity
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(f"file:{urllib.parse.quote(database)}?mode=ro", uri=True,
+                                    check_same_thread=False)
+
+    def data_version(self):
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class ResultCache:
+    """
+    LRU map of key -> (version, expiry, value). get_or_compute(key, fn)
+    returns the stored value if it was computed against the current
+    database version and has not expired, and otherwise calls fn() and
+    stores its result.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._probes = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0}
+
+    def version(self):
+        """(path, file identity, data_version) of the active database, or None if it cannot be probed"""
+        database = get_database_path()
+        identity = _file_identity(database)
+        if identity is None:
+            return None
+        with self._lock:
+            probe = self._probes.get(database)
+            if probe is None or probe.identity != identity:
+                if probe is not None:
+                    probe.close()
+                try:
+                    probe = self._probes[database] = _Probe(database, identity)
+                except sqlite3.Error:
+                    return None
+        try:
+            return (database, identity, probe.data_version())
+        except sqlite3.Error:
+            # Closed by another thread that just replaced it
+            return None
+
+    def get_or_compute(self, key, compute):
+        version = self.version()
+        if version is None:
+            return compute()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires, value = entry
+                if entry_version == version and now < expires:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self.stats['stale' if entry_version != version else 'expired'] += 1
+            self.stats['misses'] += 1
+
+        # The version was read before computing, so a write that commits
+        # meanwhile makes this entry stale rather than wrongly current
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return value
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    @property
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            probes, self._probes = self._probes, {}
+        for probe in probes.values():
+            probe.close()
+
+
+_cache = None
+
+
+def enable_result_cache(max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+    """Start caching the results of @cached functions"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = ResultCache(max_entries, ttl)
+    return _cache
+
+
+def disable_result_cache():
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
+
+
+def current_cache():
+    """The active ResultCache, or None when results are always recomputed"""
+    return _cache
+
+
+def cache_stats():
+    """Counters plus hit_rate and size of the active cache (empty when disabled)"""
+    cache = _cache
+    if cache is None:
+        return {}
+    return dict(cache.stats, hit_rate=cache.hit_rate, size=cache.size)
+
+
+def cached(name, key=lambda *args: args):
+    """
+    Cache fn's result under (name, key(*args)) while the cache is enabled.
+    Cached lists are returned as copies; the items in them are shared, so
+    treat them as read-only.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            cache = _cache
+            if cache is None or sees_uncommitted_writes():
+                return fn(*args)
+            value = cache.get_or_compute((name, key(*args)), lambda: fn(*args))
+            return list(value) if isinstance(value, list) else value
+        return wrapper
+    return decorate
+
+
+def configure_from_env():
+    """ARTICLES_DB_RESULT_CACHE=1 turns the cache on at import; ARTICLES_DB_RESULT_CACHE_TTL sets the TTL"""
+    if os.environ.get('ARTICLES_DB_RESULT_CACHE'):
+        enable_result_cache(ttl=float(os.environ.get('ARTICLES_DB_RESULT_CACHE_TTL', DEFAULT_TTL)))
+
+
+configure_from_env()
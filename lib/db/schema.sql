@@ -16,6 +16,164 @@ CREATE TABLE IF NOT EXISTS articles (
     title VARCHAR(255) NOT NULL,
     author_id INTEGER,
     magazine_id INTEGER,
-    FOREIGN KEY (author_id) REFERENCES authors(id),
+    FOREIGN KEY (author_id) REFERENCES authors(id) ON DELETE CASCADE,
     FOREIGN KEY (magazine_id) REFERENCES magazines(id)
-);
\ No newline at end of file
+);
+
+-- Secondary indexes for the model lookups. The two composite article
+-- indexes cover the author <-> magazine joins in both directions, so those
+-- queries never have to touch the articles table itself.
+
+CREATE INDEX IF NOT EXISTS idx_authors_name ON authors (name);
+
+CREATE INDEX IF NOT EXISTS idx_magazines_name ON magazines (name);
+
+CREATE INDEX IF NOT EXISTS idx_magazines_category ON magazines (category);
+
+CREATE INDEX IF NOT EXISTS idx_articles_title ON articles (title);
+
+CREATE INDEX IF NOT EXISTS idx_articles_author_magazine ON articles (author_id, magazine_id);
+
+CREATE INDEX IF NOT EXISTS idx_articles_magazine_author ON articles (magazine_id, author_id);
+
+-- Single-column foreign key indexes keep rows in id order within each
+-- author / magazine, which keyset pagination relies on to avoid sorting.
+
+CREATE INDEX IF NOT EXISTS idx_articles_author ON articles (author_id);
+
+CREATE INDEX IF NOT EXISTS idx_articles_magazine ON articles (magazine_id);
+
+-- The same for pages ordered by title or name within one author, magazine
+-- or category.
+
+CREATE INDEX IF NOT EXISTS idx_articles_author_title ON articles (author_id, title);
+
+CREATE INDEX IF NOT EXISTS idx_articles_magazine_title ON articles (magazine_id, title);
+
+CREATE INDEX IF NOT EXISTS idx_magazines_category_name ON magazines (category, name);
+
+-- Denormalized article counters, maintained by the triggers below so that
+-- "most articles" style questions read a handful of rows instead of
+-- grouping the whole articles table. lib/db/counters.py can verify them
+-- and rebuild them from scratch.
+
+CREATE TABLE IF NOT EXISTS magazine_article_counts (
+    magazine_id INTEGER PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_magazine_article_counts_count
+    ON magazine_article_counts (article_count DESC, magazine_id);
+
+CREATE TABLE IF NOT EXISTS author_article_counts (
+    author_id INTEGER PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_author_article_counts_count
+    ON author_article_counts (article_count DESC, author_id);
+
+CREATE TABLE IF NOT EXISTS magazine_author_counts (
+    magazine_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    article_count INTEGER NOT NULL,
+    PRIMARY KEY (magazine_id, author_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_magazines_counts_insert AFTER INSERT ON magazines
+BEGIN
+    INSERT OR IGNORE INTO magazine_article_counts (magazine_id, article_count) VALUES (NEW.id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_magazines_counts_delete AFTER DELETE ON magazines
+BEGIN
+    DELETE FROM magazine_article_counts WHERE magazine_id = OLD.id;
+    DELETE FROM magazine_author_counts WHERE magazine_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_authors_counts_insert AFTER INSERT ON authors
+BEGIN
+    INSERT OR IGNORE INTO author_article_counts (author_id, article_count) VALUES (NEW.id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_authors_counts_delete AFTER DELETE ON authors
+BEGIN
+    DELETE FROM author_article_counts WHERE author_id = OLD.id;
+    DELETE FROM magazine_author_counts WHERE author_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_counts_insert AFTER INSERT ON articles
+BEGIN
+    INSERT INTO magazine_article_counts (magazine_id, article_count)
+        SELECT NEW.magazine_id, 1 WHERE NEW.magazine_id IS NOT NULL
+        ON CONFLICT (magazine_id) DO UPDATE SET article_count = article_count + 1;
+    INSERT INTO author_article_counts (author_id, article_count)
+        SELECT NEW.author_id, 1 WHERE NEW.author_id IS NOT NULL
+        ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+    INSERT INTO magazine_author_counts (magazine_id, author_id, article_count)
+        SELECT NEW.magazine_id, NEW.author_id, 1
+        WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+        ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_counts_delete AFTER DELETE ON articles
+BEGIN
+    UPDATE magazine_article_counts SET article_count = article_count - 1
+        WHERE magazine_id = OLD.magazine_id;
+    UPDATE author_article_counts SET article_count = article_count - 1
+        WHERE author_id = OLD.author_id;
+    UPDATE magazine_author_counts SET article_count = article_count - 1
+        WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+    DELETE FROM magazine_author_counts
+        WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_counts_update AFTER UPDATE OF author_id, magazine_id ON articles
+WHEN OLD.author_id IS NOT NEW.author_id OR OLD.magazine_id IS NOT NEW.magazine_id
+BEGIN
+    UPDATE magazine_article_counts SET article_count = article_count - 1
+        WHERE magazine_id = OLD.magazine_id;
+    UPDATE author_article_counts SET article_count = article_count - 1
+        WHERE author_id = OLD.author_id;
+    UPDATE magazine_author_counts SET article_count = article_count - 1
+        WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+    DELETE FROM magazine_author_counts
+        WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+    INSERT INTO magazine_article_counts (magazine_id, article_count)
+        SELECT NEW.magazine_id, 1 WHERE NEW.magazine_id IS NOT NULL
+        ON CONFLICT (magazine_id) DO UPDATE SET article_count = article_count + 1;
+    INSERT INTO author_article_counts (author_id, article_count)
+        SELECT NEW.author_id, 1 WHERE NEW.author_id IS NOT NULL
+        ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+    INSERT INTO magazine_author_counts (magazine_id, author_id, article_count)
+        SELECT NEW.magazine_id, NEW.author_id, 1
+        WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+        ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+-- Full-text index over article titles. It is an external-content FTS5 table
+-- (the text lives only in articles) kept in sync by triggers; prefix
+-- indexes make "term*" lookups cheap. lib/db/search.py can rebuild it.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title,
+    content='articles',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert AFTER INSERT ON articles
+BEGIN
+    INSERT INTO articles_fts (rowid, title) VALUES (NEW.id, NEW.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete AFTER DELETE ON articles
+BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update AFTER UPDATE OF title ON articles
+BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+    INSERT INTO articles_fts (rowid, title) VALUES (NEW.id, NEW.title);
+END;
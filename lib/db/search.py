@@ -0,0 +1,92 @@
+import os
+import re
+import sqlite3
+import sys
+
+# Add the project root to the path so this module can run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from lib.db.connection import get_connection
+
+DEFAULT_SEARCH_LIMIT = 20
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text, prefix=True):
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word becomes a
+    quoted term (so FTS operators in user input are inert), all of which
+    must match. With prefix=True each term also matches longer words.
+    Returns None when the text contains no searchable words.
+    """
+    terms = _TERM.findall(text or "")
+    if not terms:
+        return None
+    suffix = "*" if prefix else ""
+    return " AND ".join(f'"{term}"{suffix}' for term in terms)
+
+
+def search_articles(text, limit=DEFAULT_SEARCH_LIMIT, author_id=None, magazine_id=None, prefix=True):
+    """Rows of articles matching text, best bm25 rank first"""
+    match = build_match_query(text, prefix)
+    if match is None:
+        return []
+    sql = """
+        SELECT a.* FROM articles_fts f
+        JOIN articles a ON a.id = f.rowid
+        WHERE articles_fts MATCH ?
+    """
+    params = [match]
+    if author_id is not None:
+        sql += " AND a.author_id = ?"
+        params.append(author_id)
+    if magazine_id is not None:
+        sql += " AND a.magazine_id = ?"
+        params.append(magazine_id)
+    sql += " ORDER BY f.rank, a.id LIMIT ?"
+    params.append(limit)
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return rows
+
+
+def check_search_index(conn=None):
+    """True if articles_fts matches the articles table"""
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        conn.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('integrity-check', 1)")
+        return True
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        if own:
+            conn.close()
+
+
+def rebuild_search_index(conn=None):
+    """Re-index every article title from scratch"""
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        conn.commit()
+    finally:
+        if own:
+            conn.close()
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        rebuild_search_index()
+        print("Article search index rebuilt")
+    elif check_search_index():
+        print("Article search index is consistent")
+    else:
+        print("Article search index is out of date; run with --rebuild")
+        sys.exit(1)
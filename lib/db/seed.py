@@ -1,13 +1,33 @@
+import argparse
+import itertools
 import os
+import random
 import sys
+import time
 
 # Add the lib directory to the path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from lib.db.connection import get_connection
+from lib.db.counters import rebuild_counters
+from lib.db.search import rebuild_search_index
 from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.models.article import Article
 
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema.sql')
+
+CATEGORIES = ("Technology", "Science", "Health", "Business", "Culture", "Sports", "Travel", "Food",
+              "Politics", "Education", "Finance", "Entertainment")
+TITLE_WORDS = (
+    "machine learning quantum computing climate change health nutrition exercise python data "
+    "science trends future basics advanced explained solutions living tips mental analysis "
+    "systems design energy markets policy security privacy cloud mobile history culture travel "
+    "food music sports economy education research biology physics chemistry space robotics"
+).split()
+DEFAULT_SKEW = 1.1
+GENERATE_BATCH_SIZE = 10000
+
 def seed_database():
     """Populate the database with test data"""
     
@@ -40,10 +60,9 @@ def seed_database():
         ("Nutrition Fundamentals", author3.id, magazine3.id),
     ]
     
-    created_articles = []
-    for title, author_id, magazine_id in articles_data:
-        article = Article(title, author_id, magazine_id).save()
-        created_articles.append(article)
+    created_articles = Article.bulk_create(
+        Article(title, author_id, magazine_id) for title, author_id, magazine_id in articles_data
+    )
     
     print(f"Created {len(created_articles)} articles")
     
@@ -62,5 +81,133 @@ def seed_database():
     
     print("\nDatabase seeding completed!")
 
+def category_names(count):
+    """count distinct category names, the common ones first"""
+    names = list(CATEGORIES[:count])
+    names.extend(f"Category {i}" for i in range(len(names) + 1, count + 1))
+    return names
+
+
+def zipf_sampler(ids, skew, rng):
+    """
+    Draw ids with probability proportional to 1 / rank**skew. Ranks are
+    shuffled over ids so the most popular id is not always the first one.
+    """
+    ranked = list(ids)
+    rng.shuffle(ranked)
+    cum_weights = list(itertools.accumulate(1.0 / rank ** skew for rank in range(1, len(ranked) + 1)))
+
+    def sample(count):
+        return rng.choices(ranked, cum_weights=cum_weights, k=count)
+    return sample
+
+
+def _article_rows(first_id, count, author_ids, magazine_ids, rng, skew):
+    pick_author = zipf_sampler(author_ids, skew, rng)
+    pick_magazine = zipf_sampler(magazine_ids, skew, rng)
+    article_id = first_id
+    remaining = count
+    while remaining:
+        size = min(remaining, GENERATE_BATCH_SIZE)
+        for author_id, magazine_id in zip(pick_author(size), pick_magazine(size)):
+            title = " ".join(rng.choices(TITLE_WORDS, k=3)).title()
+            yield (article_id, f"{title} {article_id}", author_id, magazine_id)
+            article_id += 1
+        remaining -= size
+
+
+def _derived_objects(conn):
+    # Triggers and secondary indexes on the base tables; FTS shadow tables
+    # and automatic (UNIQUE/PRIMARY KEY) indexes are left alone
+    return conn.execute("""
+        SELECT type, name FROM sqlite_master
+        WHERE type IN ('trigger', 'index') AND sql IS NOT NULL
+          AND tbl_name IN ('authors', 'magazines', 'articles')
+    """).fetchall()
+
+
+def generate(authors, magazines, articles, categories=len(CATEGORIES), seed=42, skew=DEFAULT_SKEW,
+             defer_derived=True):
+    """
+    Append a synthetic dataset: articles are spread over authors and
+    magazines with Zipf(skew) popularity, and magazines over categories.
+    Everything is inserted with executemany in a single transaction.
+
+    With defer_derived the triggers and secondary indexes on the base tables
+    are dropped for the load; the schema is then re-applied, and the counter
+    tables and search index are rebuilt in one pass each instead of being
+    maintained row by row. If the process dies in between, re-running
+    scripts/setup_db.py restores the same state.
+    Returns (authors, magazines, articles) inserted.
+    """
+    if authors < 1 or magazines < 1 or categories < 1:
+        raise ValueError("authors, magazines and categories must be at least 1")
+    rng = random.Random(seed)
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if defer_derived:
+            for kind, name in _derived_objects(conn):
+                conn.execute(f"DROP {kind.upper()} {name}")
+
+        def next_id(table):
+            return conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+        first_author, first_magazine, first_article = next_id("authors"), next_id("magazines"), next_id("articles")
+        author_ids = range(first_author, first_author + authors)
+        magazine_ids = range(first_magazine, first_magazine + magazines)
+        names = category_names(categories)
+        conn.executemany("INSERT INTO authors (id, name) VALUES (?, ?)",
+                         ((i, f"Author {i}") for i in author_ids))
+        conn.executemany("INSERT INTO magazines (id, name, category) VALUES (?, ?, ?)",
+                         ((i, f"Magazine {i}", rng.choice(names)) for i in magazine_ids))
+        conn.executemany("INSERT INTO articles (id, title, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                         _article_rows(first_article, articles, author_ids, magazine_ids, rng, skew))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
+
+    try:
+        if defer_derived:
+            with open(SCHEMA_PATH) as f:
+                conn.executescript(f.read())
+            rebuild_counters(conn)
+            rebuild_search_index(conn)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return authors, magazines, articles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Seed the database. Without --articles, inserts the small demo dataset; "
+                    "with it, bulk-loads a synthetic Zipf-distributed dataset."
+    )
+    parser.add_argument('--articles', type=int, help='number of articles to generate')
+    parser.add_argument('--authors', type=int, help='default: articles / 10')
+    parser.add_argument('--magazines', type=int, help='default: articles / 1000')
+    parser.add_argument('--categories', type=int, default=len(CATEGORIES))
+    parser.add_argument('--skew', type=float, default=DEFAULT_SKEW, help='Zipf exponent (0 = uniform)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep-triggers', action='store_true',
+                        help='maintain counters and the search index row by row during the load')
+    args = parser.parse_args(argv)
+
+    if args.articles is None:
+        seed_database()
+        return
+    authors = args.authors or max(1, args.articles // 10)
+    magazines = args.magazines or max(1, args.articles // 1000)
+    start = time.perf_counter()
+    generate(authors, magazines, args.articles, args.categories, args.seed, args.skew,
+             defer_derived=not args.keep_triggers)
+    print(f"Generated {authors:,} authors, {magazines:,} magazines and {args.articles:,} articles "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,252 @@
+import threading
+
+from lib.db import writer
+from lib.db.connection import get_connection, share_thread_connection, unshare_thread_connection
+
+_local = threading.local()
+
+
+def current_session():
+    """Return the innermost active Session for this thread, or None"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def sees_uncommitted_writes():
+    """
+    True inside a Session or on the write-behind thread, where reads can
+    see writes that are not committed yet and may still be rolled back.
+    Caches must neither serve nor store results there.
+    """
+    if current_session() is not None:
+        return True
+    background = writer.current_writer()
+    return background is not None and background.is_writer_thread()
+
+
+def after_transaction(callback):
+    """
+    Call callback() once the transaction the caller is writing in has
+    ended: when the current Session commits or rolls back, after the batch
+    on the write-behind thread, or straight away when the write has
+    already committed. Used to drop identity map entries only once other
+    connections can see the new rows.
+    """
+    session = current_session()
+    if session is not None:
+        session._after_end.append(callback)
+        return
+    _after_writer_batch(callback)
+
+
+def _after_writer_batch(callback):
+    background = writer.current_writer()
+    if background is not None and background.is_writer_thread():
+        background.after_batch(callback)
+        return
+    callback()
+
+
+def run_in_transaction(work):
+    """
+    Run work(cursor) as one atomic unit and return its result. Inside a
+    Session it joins the session's transaction under a SAVEPOINT; with
+    write-behind enabled it is queued on the writer thread and waited for
+    (or, on the writer thread itself, joins the batch under a SAVEPOINT);
+    otherwise it gets a transaction of its own that takes the write lock
+    up front.
+    """
+    session = current_session()
+    if session is not None:
+        cursor = session.connection().cursor()
+        cursor.execute("SAVEPOINT unit_of_work")
+        try:
+            result = work(cursor)
+        except BaseException:
+            cursor.execute("ROLLBACK TO unit_of_work")
+            cursor.execute("RELEASE unit_of_work")
+            raise
+        cursor.execute("RELEASE unit_of_work")
+        return result
+    background = writer.current_writer()
+    if background is not None:
+        if background.is_writer_thread():
+            return background.run_nested(work)
+        return background.submit(work).result()
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        result = work(conn.cursor())
+        conn.commit()
+        return result
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+class Session:
+    """
+    Unit of work: collects new and changed model instances and writes them
+    in one transaction on a single connection.
+
+        with Session() as session:
+            author = Author("Jane").save()          # joins the transaction
+            session.add(Article("Intro", author.id, magazine.id))
+        # committed here; rolled back instead if the block raised
+
+    add() only registers an object; it is written on the next flush() or
+    commit(). Objects already written in this session are re-written at
+    flush time if any of their columns changed since. Inserted objects get
+    their id as soon as they are flushed.
+
+    While the with block runs, every read on its thread goes through the
+    session's connection and sees the session's own writes. A Session
+    opened inside another one (or inside work on the write-behind thread)
+    joins the transaction already open there under a SAVEPOINT.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._savepoint = None
+        self._outer = None
+        self._shared = False
+        # Both keyed by id(obj); the values keep the objects alive
+        self._pending = {}
+        self._tracked = {}
+        self._inserted = []
+        self._after_end = []
+
+    def add(self, obj):
+        """Register a new or persisted model instance with the session"""
+        self._pending.setdefault(id(obj), obj)
+        return obj
+
+    def add_all(self, objects):
+        for obj in objects:
+            self.add(obj)
+
+    @property
+    def new(self):
+        return [obj for obj in self._pending.values() if obj.id is None]
+
+    @property
+    def dirty(self):
+        """Persisted objects with unflushed changes"""
+        dirty = {key: obj for key, obj in self._pending.items() if obj.id is not None}
+        for key, (obj, state) in self._tracked.items():
+            if key not in dirty and obj._state() != state:
+                dirty[key] = obj
+        return list(dirty.values())
+
+    def connection(self):
+        """The session's connection, opening its transaction (and taking the write lock) on first use"""
+        if self._conn is None:
+            conn = get_connection()
+            if conn.in_transaction:
+                # An outer Session or the writer's batch already holds it
+                self._savepoint = f"session_{id(self)}"
+                conn.execute(f"SAVEPOINT {self._savepoint}")
+                stack = getattr(_local, 'stack', [])
+                self._outer = next((s for s in reversed(stack) if s is not self and s._conn is conn), None)
+            else:
+                conn.execute("BEGIN IMMEDIATE")
+            self._conn = conn
+            if any(s is self for s in getattr(_local, 'stack', [])):
+                share_thread_connection(conn)
+                self._shared = True
+        return self._conn
+
+    def save(self, obj):
+        """
+        Write obj now, along with anything else add()ed since the last
+        flush. Changes to objects written earlier are not looked for until
+        flush() or commit(), so a long run of saves stays linear.
+        """
+        self.add(obj)
+        self._write_all(list(self._pending.values()))
+        return obj
+
+    def flush(self):
+        """Write pending and modified objects without committing"""
+        self._write_all(self.new + self.dirty)
+
+    def _write_all(self, to_write):
+        self._pending = {}
+        if not to_write:
+            return
+        cursor = self.connection().cursor()
+        for obj in to_write:
+            if obj.id is None:
+                self._inserted.append(obj)
+            obj._write(cursor)
+            self._after_end.append(obj._forget)
+            self._tracked[id(obj)] = (obj, obj._state())
+
+    def commit(self):
+        """Flush and commit everything in a single transaction"""
+        try:
+            self.flush()
+            if self._savepoint is not None:
+                self._conn.execute(f"RELEASE {self._savepoint}")
+            elif self._conn is not None:
+                self._conn.commit()
+        except Exception:
+            self.rollback()
+            raise
+        if self._outer is not None:
+            # Now part of the outer transaction, and undone if it rolls back
+            self._outer._inserted.extend(self._inserted)
+        self._run_after_end()
+        self._reset()
+
+    def rollback(self):
+        """Discard the transaction; objects inserted by it lose their ids"""
+        if self._savepoint is not None:
+            self._conn.execute(f"ROLLBACK TO {self._savepoint}")
+            self._conn.execute(f"RELEASE {self._savepoint}")
+        elif self._conn is not None:
+            self._conn.rollback()
+        # Reads on the session's connection may have cached rows that are gone now
+        self._run_after_end()
+        for obj in self._inserted:
+            obj.id = None
+        self._reset()
+
+    def _run_after_end(self):
+        callbacks, self._after_end = self._after_end, []
+        if self._outer is not None:
+            # Nothing is visible to other connections until the outer commit
+            self._outer._after_end.extend(callbacks)
+            return
+        for callback in callbacks:
+            _after_writer_batch(callback)
+
+    def _reset(self):
+        if self._shared:
+            unshare_thread_connection(self._conn)
+            self._shared = False
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._savepoint = None
+        self._outer = None
+        self._pending = {}
+        self._tracked = {}
+        self._inserted = []
+        self._after_end = []
+
+    def __enter__(self):
+        if not hasattr(_local, 'stack'):
+            _local.stack = []
+        _local.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.stack.remove(self)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
@@ -0,0 +1,31 @@
+from lib.db.connection import get_connection
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def iter_rows(sql, params=(), chunk_size=DEFAULT_CHUNK_SIZE, hydrate=None):
+    """
+    Yield the rows of a query, chunk_size at a time via fetchmany, passing
+    each through hydrate if given. No connection is held until iteration
+    starts, and it goes back to the pool as soon as the rows run out, the
+    generator is closed, or it is garbage collected after the consumer
+    stops early.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            if hydrate is None:
+                yield from rows
+            else:
+                for row in rows:
+                    yield hydrate(row)
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,95 +1,195 @@
-from lib.db.connection import get_connection
+import sqlite3
+from collections import Counter
+
+from lib.db import identity_map
+from lib.db.bulk import chunked
+from lib.db.session import after_transaction, run_in_transaction
+
+# Ids per IN clause; well under SQLite's host parameter limit
+DELETE_CHUNK_SIZE = 500
+
+def _add_author_with_articles(cursor, author_name, articles_data):
+    # Insert author
+    cursor.execute(
+        "INSERT INTO authors (name) VALUES (?)",
+        (author_name,)
+    )
+    author_id = cursor.lastrowid
+    
+    # Insert articles
+    cursor.executemany(
+        "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)",
+        [(article['title'], author_id, article['magazine_id']) for article in articles_data]
+    )
+    return author_id
 
 def add_author_with_articles(author_name, articles_data):
     """
     Add an author and their articles in a single transaction
     articles_data: list of dicts with 'title' and 'magazine_id' keys
     """
-    conn = get_connection()
     try:
-        conn.execute("BEGIN TRANSACTION")
-        cursor = conn.cursor()
-        
-        # Insert author
-        cursor.execute(
-            "INSERT INTO authors (name) VALUES (?)",
-            (author_name,)
-        )
-        author_id = cursor.lastrowid
-        
-        # Insert articles
-        for article in articles_data:
-            cursor.execute(
-                "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)",
-                (article['title'], author_id, article['magazine_id'])
-            )
-        
-        conn.execute("COMMIT")
+        run_in_transaction(lambda cursor: _add_author_with_articles(cursor, author_name, articles_data))
         print(f"Successfully added author '{author_name}' with {len(articles_data)} articles")
         return True
     except Exception as e:
-        conn.execute("ROLLBACK")
         print(f"Transaction failed: {e}")
         return False
-    finally:
-        conn.close()
+
+class TransferResult:
+    """Outcome of transfer_articles_between_magazines; truthy when it committed"""
+
+    def __init__(self, transferred=0, missing=(), error=None):
+        self.transferred = transferred
+        self.missing = list(missing)
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and not self.missing
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        if self.ok:
+            return f"<TransferResult transferred={self.transferred}>"
+        return f"<TransferResult failed missing={self.missing} error={self.error!r}>"
+
+class _MissingArticles(Exception):
+    # Raised inside the transaction so that it rolls back
+    def __init__(self, missing):
+        super().__init__(f"{len(missing)} articles not found in the source magazine")
+        self.missing = missing
+
+def _transfer_articles(cursor, from_magazine_id, to_magazine_id, ids):
+    cursor.execute("CREATE TEMP TABLE transfer_ids (id INTEGER PRIMARY KEY)")
+    cursor.executemany("INSERT INTO temp.transfer_ids (id) VALUES (?)", ((article_id,) for article_id in ids))
+    
+    # Validate the whole set at once
+    cursor.execute("""
+        SELECT t.id FROM temp.transfer_ids t
+        LEFT JOIN articles a ON a.id = t.id AND a.magazine_id = ?
+        WHERE a.id IS NULL
+    """, (from_magazine_id,))
+    missing = {row[0] for row in cursor.fetchall()}
+    if missing:
+        raise _MissingArticles(missing)
+    
+    cursor.execute(
+        "UPDATE articles SET magazine_id = ? WHERE magazine_id = ? AND id IN (SELECT id FROM temp.transfer_ids)",
+        (to_magazine_id, from_magazine_id)
+    )
+    transferred = cursor.rowcount
+    cursor.execute("DROP TABLE temp.transfer_ids")
+    return transferred
 
 def transfer_articles_between_magazines(from_magazine_id, to_magazine_id, article_ids):
     """
-    Transfer multiple articles from one magazine to another in a single transaction
+    Transfer multiple articles from one magazine to another in a single transaction.
+    The ids are staged in a temp table, so any number of them costs one
+    validating query and one UPDATE. If any id does not exist or is not in
+    the source magazine nothing is changed and result.missing lists them in
+    the order given. Duplicate ids are transferred once.
     """
-    conn = get_connection()
+    ids = list(dict.fromkeys(article_ids))
     try:
-        conn.execute("BEGIN TRANSACTION")
-        cursor = conn.cursor()
-        
-        # Update all specified articles
-        for article_id in article_ids:
+        transferred = run_in_transaction(lambda cursor: _transfer_articles(cursor, from_magazine_id, to_magazine_id, ids))
+    except _MissingArticles as e:
+        return TransferResult(missing=[article_id for article_id in ids if article_id in e.missing])
+    except sqlite3.Error as e:
+        return TransferResult(error=str(e))
+    after_transaction(lambda: identity_map.invalidate("articles", *ids))
+    return TransferResult(transferred=transferred)
+
+class DeleteResult:
+    """Outcome of delete_authors; truthy when it committed"""
+
+    def __init__(self, deleted=None, missing=(), error=None):
+        self.deleted = deleted or {}
+        self.missing = list(missing)
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def articles_deleted(self):
+        return sum(self.deleted.values())
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        if self.ok:
+            return f"<DeleteResult authors={len(self.deleted)} articles={self.articles_deleted} missing={self.missing}>"
+        return f"<DeleteResult failed error={self.error!r}>"
+
+def _can_cascade(cursor):
+    # Needs foreign keys on, the migrated articles table and the counter
+    # table the article counts are read back from
+    if not cursor.execute("PRAGMA foreign_keys").fetchone()[0]:
+        return False
+    actions = {row[3]: row[6] for row in cursor.execute("PRAGMA foreign_key_list(articles)")}
+    if actions.get('author_id') != 'CASCADE':
+        return False
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'author_article_counts'")
+    return cursor.fetchone() is not None
+
+def _delete_authors(cursor, ids, cascade, chunk_size):
+    cascade = cascade and _can_cascade(cursor)
+    deleted = {}
+    for chunk in chunked(ids, chunk_size):
+        in_list = f"({', '.join('?' * len(chunk))})"
+        if cascade:
+            # The counter rows would be removed by the authors trigger
+            # anyway; deleting them here hands back the counts for free
             cursor.execute(
-                "UPDATE articles SET magazine_id = ? WHERE id = ? AND magazine_id = ?",
-                (to_magazine_id, article_id, from_magazine_id)
+                f"DELETE FROM author_article_counts WHERE author_id IN {in_list} RETURNING author_id, article_count",
+                chunk
             )
-            
-            # Check if the article was actually updated
-            if cursor.rowcount == 0:
-                raise Exception(f"Article {article_id} not found in source magazine or doesn't exist")
-        
-        conn.execute("COMMIT")
-        print(f"Successfully transferred {len(article_ids)} articles between magazines")
-        return True
-    except Exception as e:
-        conn.execute("ROLLBACK")
-        print(f"Transaction failed: {e}")
-        return False
-    finally:
-        conn.close()
+            counts = dict(cursor.fetchall())
+        else:
+            cursor.execute(f"DELETE FROM articles WHERE author_id IN {in_list} RETURNING author_id", chunk)
+            counts = Counter(row[0] for row in cursor.fetchall())
+        cursor.execute(f"DELETE FROM authors WHERE id IN {in_list} RETURNING id", chunk)
+        for row in cursor.fetchall():
+            deleted[row[0]] = counts.get(row[0], 0)
+    return deleted
+
+def delete_authors(author_ids, cascade=True, chunk_size=DELETE_CHUNK_SIZE):
+    """
+    Delete many authors and all their articles in a single transaction,
+    chunk_size ids per IN clause. With cascade the articles go through the
+    ON DELETE CASCADE foreign key; without it, or when the database was
+    created before the cascade was added, they are deleted explicitly first.
+    result.deleted maps each deleted author id to its article count, read
+    from the statements that do the deleting; ids that did not exist are
+    in result.missing.
+    """
+    ids = list(dict.fromkeys(author_ids))
+    try:
+        deleted = run_in_transaction(lambda cursor: _delete_authors(cursor, ids, cascade, chunk_size))
+    except sqlite3.Error as e:
+        return DeleteResult(error=str(e))
+    
+    def forget():
+        identity_map.invalidate("authors", *deleted)
+        identity_map.invalidate_where("articles", lambda article: article.author_id in deleted)
+    after_transaction(forget)
+    return DeleteResult(deleted, [author_id for author_id in ids if author_id not in deleted])
 
 def delete_author_and_articles(author_id):
     """
     Delete an author and all their articles in a single transaction
     """
-    conn = get_connection()
-    try:
-        conn.execute("BEGIN TRANSACTION")
-        cursor = conn.cursor()
-        
-        # First delete all articles by this author
-        cursor.execute("DELETE FROM articles WHERE author_id = ?", (author_id,))
-        articles_deleted = cursor.rowcount
-        
-        # Then delete the author
-        cursor.execute("DELETE FROM authors WHERE id = ?", (author_id,))
-        author_deleted = cursor.rowcount
-        
-        if author_deleted == 0:
-            raise Exception(f"Author with ID {author_id} not found")
-        
-        conn.execute("COMMIT")
-        print(f"Successfully deleted author and {articles_deleted} articles")
-        return True
-    except Exception as e:
-        conn.execute("ROLLBACK")
-        print(f"Transaction failed: {e}")
+    result = delete_authors([author_id])
+    if not result:
+        print(f"Transaction failed: {result.error}")
+        return False
+    if result.missing:
+        print(f"Transaction failed: Author with ID {author_id} not found")
         return False
-    finally:
-        conn.close()
\ No newline at end of file
+    print(f"Successfully deleted author and {result.articles_deleted} articles")
+    return True
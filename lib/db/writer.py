@@ -0,0 +1,272 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from lib.db.connection import get_connection, pin_thread_connection, unpin_thread_connection
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY = 0.0
+
+_STOP = object()
+
+
+class WriteQueueFull(sqlite3.OperationalError):
+    """Raised when the write-behind queue stays full for longer than the submit timeout"""
+
+
+class BackgroundWriter:
+    """
+    A single thread that owns all writes. Producers submit work(cursor)
+    callables and get a Future back; the thread drains the queue in batches
+    of up to max_batch operations and commits each batch in one transaction.
+    With the default max_delay of 0 a batch is whatever queued up while the
+    previous one was committing; a positive max_delay waits that long for a
+    batch to fill, trading latency for fewer commits. Every
+    operation runs inside its own SAVEPOINT, so a failing one is rolled back
+    and reported through its future without affecting the rest of the batch.
+    Futures resolve only after the batch has committed.
+
+    The queue holds at most max_queue operations; submit() blocks when it is
+    full, which slows producers down to the speed of the disk.
+    """
+
+    def __init__(self, max_queue=DEFAULT_QUEUE_SIZE, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._after_batch = []
+        self.stats = {'operations': 0, 'failed': 0, 'batches': 0, 'largest_batch': 0}
+        self._thread = threading.Thread(target=self._run, name='articles-db-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, work, undo=None, timeout=None):
+        """
+        Queue work(cursor) and return a Future of its return value. undo() is
+        called if the work ran but its batch did not commit.
+        """
+        future = Future()
+        # Checked and queued under the lock close() takes, so nothing can be
+        # queued behind _STOP
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            try:
+                self._queue.put((work, undo, future), timeout=timeout)
+            except queue.Full:
+                raise WriteQueueFull(f"Write queue still full after {timeout}s")
+        return future
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been committed"""
+        self.submit(lambda cursor: None).result(timeout)
+
+    def close(self, timeout=None):
+        """Stop accepting writes, commit everything already queued and stop the thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def is_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def after_batch(self, callback):
+        """From the writer thread: call callback() once the current batch has committed or rolled back"""
+        self._after_batch.append(callback)
+
+    def run_nested(self, work):
+        """
+        Run work(cursor) from the writer thread itself, e.g. a save() made by
+        submitted work. It joins the batch being committed under a SAVEPOINT
+        of its own on the writer's connection; it never begins, commits or
+        rolls back the batch transaction.
+        """
+        if not self.is_writer_thread():
+            raise RuntimeError("run_nested can only be called on the writer thread")
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SAVEPOINT nested_write")
+            try:
+                result = work(cursor)
+            except BaseException:
+                cursor.execute("ROLLBACK TO nested_write")
+                cursor.execute("RELEASE nested_write")
+                raise
+            cursor.execute("RELEASE nested_write")
+            return result
+        finally:
+            conn.close()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_after_batch(self):
+        callbacks, self._after_batch = self._after_batch, []
+        for callback in callbacks:
+            callback()
+
+    def _run(self):
+        pin_thread_connection()
+        try:
+            while True:
+                batch = self._next_batch()
+                stop = batch[-1] is _STOP
+                if stop:
+                    batch.pop()
+                if batch:
+                    self._commit(batch)
+                if stop:
+                    return
+        finally:
+            unpin_thread_connection()
+            self._fail_leftovers()
+
+    def _fail_leftovers(self):
+        # Anything still queued once the thread stops will never run
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                item[2].set_exception(RuntimeError("BackgroundWriter is closed"))
+
+    def _commit(self, batch):
+        done = []
+        conn = None
+        try:
+            conn = get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            for work, undo, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute("SAVEPOINT write_behind")
+                try:
+                    result = work(cursor)
+                except BaseException as e:
+                    cursor.execute("ROLLBACK TO write_behind")
+                    cursor.execute("RELEASE write_behind")
+                    if undo is not None:
+                        undo()
+                    self.stats['failed'] += 1
+                    future.set_exception(e)
+                    continue
+                cursor.execute("RELEASE write_behind")
+                done.append((undo, future, result))
+            conn.commit()
+        except BaseException as e:
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            self._run_after_batch()
+            for undo, future, _ in done:
+                if undo is not None:
+                    undo()
+                future.set_exception(e)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            self.stats['failed'] += len(batch)
+            return
+        finally:
+            if conn is not None:
+                conn.close()
+        # Before resolving the futures, so a caller never sees stale cache
+        self._run_after_batch()
+        self.stats['batches'] += 1
+        self.stats['operations'] += len(batch)
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        for _, future, result in done:
+            future.set_result(result)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def enable_write_behind(max_queue=DEFAULT_QUEUE_SIZE, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+    """
+    Route model saves, bulk writes and lib/db/transactions.py operations
+    through a background writer thread. Pending writes are flushed at exit.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter(max_queue, max_batch, max_delay)
+        return _writer
+
+
+def disable_write_behind(timeout=None):
+    """Flush outstanding writes and go back to writing from the calling thread"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+
+def current_writer():
+    """The active BackgroundWriter, or None when writes happen inline"""
+    return _writer
+
+
+def submit_model(obj):
+    """
+    Queue obj's INSERT/UPDATE and return a Future of its id. Without an
+    active writer the row is saved immediately and the future is already
+    resolved. obj.id must not be relied on until the future is done.
+    """
+    writer = _writer
+    was_new = obj.id is None
+
+    def work(cursor):
+        obj._write(cursor)
+        writer.after_batch(obj._forget)
+        return obj.id
+
+    if writer is None or writer.is_writer_thread():
+        future = Future()
+        try:
+            if writer is None:
+                obj.save()
+                future.set_result(obj.id)
+            else:
+                # Called from submitted work: join the batch being committed
+                future.set_result(writer.run_nested(work))
+        except Exception as e:
+            if was_new:
+                obj.id = None
+            future.set_exception(e)
+        return future
+
+    def undo():
+        if was_new:
+            obj.id = None
+
+    return writer.submit(work, undo)
+
+
+atexit.register(disable_write_behind)
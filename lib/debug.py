@@ -10,35 +10,83 @@ from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.models.article import Article
 from lib.db.transactions import add_author_with_articles
+from lib.db import instrumentation
 
-def main():
-    """Interactive debugging session for the articles system"""
+def sql_stats(top=20):
+    """Print per-statement timings recorded since the console started"""
+    print(instrumentation.format_stats(top))
+
+def slow_queries():
+    """Print the most recent slow statements with their query plans"""
+    for entry in instrumentation.slow_queries():
+        print(f"{entry['duration_ms']:.1f}ms rows={entry['rows']} {entry['caller']}: {entry['sql']}")
+        for line in entry['plan'] or ():
+            print(f"    {line}")
+
+def print_counts(approximate=True):
+    """Row counts per table; approximate ones come from the last ANALYZE when available"""
+    print(f"Authors: {Author.count(approximate)}")
+    print(f"Magazines: {Magazine.count(approximate)}")
+    print(f"Articles: {Article.count(approximate)}")
+
+def samples(limit=3):
+    """Print the first few authors and magazines with their article counts"""
+    authors = Author.query().order_by("id").limit(limit).all()
+    if authors:
+        print(f"\nSample authors:")
+        for author in authors:
+            print(f"  - {author.name} (ID: {author.id})")
+            articles = Article.query().filter(author_id=author.id)
+            count = articles.count()
+            if count:
+                print(f"    Articles: {count}")
+                for title in articles.order_by("id").limit(2).values_list("title", flat=True):
+                    print(f"      * {title}")
+    
+    magazines = Magazine.query().order_by("id").limit(limit).all()
+    if magazines:
+        print(f"\nSample magazines:")
+        for magazine in magazines:
+            print(f"  - {magazine.name} ({magazine.category}) (ID: {magazine.id})")
+            count = Article.query().filter(magazine_id=magazine.id).count()
+            if count:
+                print(f"    Articles: {count}")
+
+def prepare_console():
+    """
+    Print the banner and build the namespace for the interactive session,
+    or return None if the database is not usable. Only counts and single
+    rows are read, so startup time does not grow with the database; the
+    sample listing is printed on demand by samples().
+    """
     
     print("=" * 50)
     print("Articles Management System - Debug Console")
     print("=" * 50)
     
+    # Record every statement so sql_stats() can show where the time went
+    if not instrumentation.enabled():
+        instrumentation.enable_instrumentation(explain_slow=True)
+    
     # Set up database if needed
     try:
-        # Try to create a simple test to see if database exists
-        Author.all()
+        # A one-row probe is enough to see whether the tables exist
+        Author.exists()
         print("✓ Database connection successful")
     except Exception as e:
         print(f"⚠ Database error: {e}")
         print("Run 'python scripts/setup_db.py' first to set up the database")
-        return
+        return None
     
     # Show current data
     print(f"\nCurrent data:")
-    print(f"Authors: {len(Author.all())}")
-    print(f"Magazines: {len(Magazine.all())}")
-    print(f"Articles: {len(Article.all())}")
+    print_counts()
     
     print("\n" + "=" * 50)
     print("Available objects for testing:")
     print("=" * 50)
     print("Classes: Author, Magazine, Article")
-    print("Functions: add_author_with_articles")
+    print("Functions: add_author_with_articles, sql_stats, slow_queries, samples, print_counts")
     print("\nExample usage:")
     print("  author = Author('John Doe').save()")
     print("  magazine = Magazine('Tech Weekly', 'Technology').save()")
@@ -50,31 +98,39 @@ def main():
     print("      {'title': 'Article 1', 'magazine_id': 1},")
     print("      {'title': 'Article 2', 'magazine_id': 2}")
     print("  ])")
+    print("\nSample data:")
+    print("  samples()        # first authors and magazines with their article counts")
+    print("  print_counts(False)  # exact COUNT(*) per table instead of estimates")
+    print("\nSQL timings:")
+    print("  sql_stats()      # calls, total/mean/max ms and rows per statement shape")
+    print("  slow_queries()   # recent statements slower than the threshold, with plans")
     
-    print("\n" + "=" * 50)
-    print("Sample data queries:")
-    print("=" * 50)
-    
-    # Show some sample data if it exists
-    authors = Author.all()
-    if authors:
-        print(f"\nSample authors:")
-        for author in authors[:3]:
-            print(f"  - {author.name} (ID: {author.id})")
-            articles = author.articles()
-            if articles:
-                print(f"    Articles: {len(articles)}")
-                for article in articles[:2]:
-                    print(f"      * {article['title']}")
+    local_vars = {
+        'Author': Author,
+        'Magazine': Magazine, 
+        'Article': Article,
+        'add_author_with_articles': add_author_with_articles,
+        'sql_stats': sql_stats,
+        'slow_queries': slow_queries,
+        'reset_sql_stats': instrumentation.reset_stats,
+        'samples': samples,
+        'print_counts': print_counts,
+    }
     
-    magazines = Magazine.all()
-    if magazines:
-        print(f"\nSample magazines:")
-        for magazine in magazines[:3]:
-            print(f"  - {magazine.name} ({magazine.category}) (ID: {magazine.id})")
-            articles = magazine.articles()
-            if articles:
-                print(f"    Articles: {len(articles)}")
+    # Add some sample instances if data exists (one indexed row each)
+    sample_author = Author.query().order_by("id").first()
+    if sample_author is not None:
+        local_vars['sample_author'] = sample_author
+    sample_magazine = Magazine.query().order_by("id").first()
+    if sample_magazine is not None:
+        local_vars['sample_magazine'] = sample_magazine
+    return local_vars
+
+def main():
+    """Interactive debugging session for the articles system"""
+    local_vars = prepare_console()
+    if local_vars is None:
+        return
     
     print("\n" + "=" * 50)
     print("Starting interactive Python session...")
@@ -84,19 +140,6 @@ def main():
     
     # Make everything available in the local scope for the interactive session
     import code
-    local_vars = {
-        'Author': Author,
-        'Magazine': Magazine, 
-        'Article': Article,
-        'add_author_with_articles': add_author_with_articles,
-    }
-    
-    # Add some sample instances if data exists
-    if authors:
-        local_vars['sample_author'] = authors[0]
-    if magazines:
-        local_vars['sample_magazine'] = magazines[0]
-    
     console = code.InteractiveConsole(locals=local_vars)
     console.interact()
 
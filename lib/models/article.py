@@ -1,11 +1,35 @@
 from lib.db.connection import get_connection
+from lib.db import bulk, identity_map, writer
+from lib.db.aio import aiter_pages, run_in_db_thread
+from lib.db.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from lib.db.query import QuerySet, estimated_row_count
+from lib.db.search import DEFAULT_SEARCH_LIMIT, search_articles
+from lib.db.streaming import DEFAULT_CHUNK_SIZE, iter_rows
+from lib.db.session import current_session
+
+PREFETCHABLE = ("author", "magazine")
 
 class Article:
+    __slots__ = ("id", "_title", "author_id", "magazine_id", "_related")
+    
     def __init__(self, title, author_id, magazine_id, id=None):
         self.id = id
         self.title = title
         self.author_id = author_id
         self.magazine_id = magazine_id
+        # Relationships loaded by prefetch: {name: (foreign key, object)}
+        self._related = None
+    
+    @classmethod
+    def _from_row(cls, row):
+        """Build an article from a trusted database row without re-running validation"""
+        article = cls.__new__(cls)
+        article.id = row['id']
+        article._title = row['title']
+        article.author_id = row['author_id']
+        article.magazine_id = row['magazine_id']
+        article._related = None
+        return article
     
     @property
     def title(self):
@@ -18,8 +42,33 @@ class Article:
         self._title = value
     
     def save(self):
+        session = current_session()
+        if session is not None:
+            # Inside a Session the write joins its transaction
+            session.save(self)
+            return self
+        if writer.current_writer() is not None:
+            # Write-behind: the writer thread group-commits it with other saves
+            writer.submit_model(self).result()
+            return self
         conn = get_connection()
-        cursor = conn.cursor()
+        try:
+            self._write(conn.cursor())
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self._forget()
+        return self
+    
+    def submit(self):
+        """Queue this save on the write-behind thread; returns a Future of the id"""
+        return writer.submit_model(self)
+    
+    def _write(self, cursor):
+        """INSERT or UPDATE this row using an existing cursor (no commit)"""
         if self.id is None:
             cursor.execute("INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)", 
                          (self.title, self.author_id, self.magazine_id))
@@ -27,64 +76,275 @@ class Article:
         else:
             cursor.execute("UPDATE articles SET title = ?, author_id = ?, magazine_id = ? WHERE id = ?", 
                          (self.title, self.author_id, self.magazine_id, self.id))
-        conn.commit()
-        conn.close()
-        return self
+    
+    def _forget(self):
+        """Drop this row from the identity map; called once its write has committed"""
+        identity_map.invalidate("articles", self.id)
+    
+    def _state(self):
+        return (self.title, self.author_id, self.magazine_id)
+    
+    @classmethod
+    def bulk_create(cls, articles, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Insert many unsaved articles in one transaction and return them with ids set"""
+        return bulk.bulk_insert(articles, "articles", ("title", "author_id", "magazine_id"), batch_size)
+    
+    @classmethod
+    def bulk_update(cls, articles, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Write many saved articles back in one transaction; returns rows updated"""
+        return bulk.bulk_update(articles, "articles", ("title", "author_id", "magazine_id"), batch_size)
     
     @classmethod
     def find_by_id(cls, id):
+        cached = identity_map.lookup("articles", id)
+        if cached is not None:
+            return cached
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE id = ?", (id,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['title'], row['author_id'], row['magazine_id'], row['id'])
+            return identity_map.remember("articles", cls._from_row(row))
         return None
     
     @classmethod
     def find_by_title(cls, title):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE title = ?", (title,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['title'], row['author_id'], row['magazine_id'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE title = ?", (title,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def find_by_author(cls, author_id, prefetch=()):
+        if prefetch:
+            return cls._find_with_related("WHERE art.author_id = ?", (author_id,), prefetch)
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE author_id = ?", (author_id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
     
     @classmethod
-    def find_by_author(cls, author_id):
+    def find_by_magazine(cls, magazine_id, prefetch=()):
+        if prefetch:
+            return cls._find_with_related("WHERE art.magazine_id = ?", (magazine_id,), prefetch)
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE author_id = ?", (author_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['title'], row['author_id'], row['magazine_id'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE magazine_id = ?", (magazine_id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
     
     @classmethod
-    def find_by_magazine(cls, magazine_id):
+    def all(cls, prefetch=()):
+        if prefetch:
+            return cls._find_with_related("", (), prefetch)
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE magazine_id = ?", (magazine_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['title'], row['author_id'], row['magazine_id'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def iter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Lazily yield every article, fetching chunk_size rows at a time"""
+        return iter_rows("SELECT * FROM articles", (), chunk_size, cls._from_row)
+    
+    @classmethod
+    def iter_by_title(cls, title, chunk_size=DEFAULT_CHUNK_SIZE):
+        return iter_rows("SELECT * FROM articles WHERE title = ?", (title,), chunk_size, cls._from_row)
+    
+    @classmethod
+    def iter_by_author(cls, author_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        return iter_rows("SELECT * FROM articles WHERE author_id = ?", (author_id,), chunk_size, cls._from_row)
+    
+    @classmethod
+    def iter_by_magazine(cls, magazine_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        return iter_rows("SELECT * FROM articles WHERE magazine_id = ?", (magazine_id,), chunk_size, cls._from_row)
+    
+    @classmethod
+    def paginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id", author_id=None, magazine_id=None):
+        """Keyset-paginated articles, optionally filtered by author and/or magazine"""
+        filters = {"author_id": author_id, "magazine_id": magazine_id}
+        return fetch_page("articles", cls._from_row, order_by, ("id", "title"), filters, cursor, limit)
+    
+    @classmethod
+    def query(cls):
+        """Lazy, chainable QuerySet over articles; runs one statement when evaluated"""
+        return QuerySet(cls, "articles", ("id", "title", "author_id", "magazine_id"))
+    
+    @classmethod
+    def count(cls, approximate=False):
+        """
+        Number of articles. With approximate the estimate from the last
+        ANALYZE is used when there is one, avoiding a COUNT(*) over the
+        whole table.
+        """
+        if approximate:
+            estimate = estimated_row_count("articles")
+            if estimate is not None:
+                return estimate
+        return cls.query().count()
+    
+    @classmethod
+    def exists(cls):
+        """True if there is at least one article; stops at the first row"""
+        return cls.query().exists()
     
     @classmethod
-    def all(cls):
+    def search(cls, query, limit=DEFAULT_SEARCH_LIMIT, author_id=None, magazine_id=None, prefix=True):
+        """Full-text search over titles, best match first, optionally within an author/magazine"""
+        rows = search_articles(query, limit, author_id, magazine_id, prefix)
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def _find_with_related(cls, where, params, prefetch):
+        """Load articles and the prefetched relationships with a single JOIN query"""
+        from lib.models.author import Author
+        from lib.models.magazine import Magazine
+        unknown = set(prefetch) - set(PREFETCHABLE)
+        if unknown:
+            raise ValueError(f"Cannot prefetch {', '.join(sorted(unknown))}; choose from {PREFETCHABLE}")
+        columns = ["art.*"]
+        joins = []
+        if "author" in prefetch:
+            columns.append("au.name AS author__name")
+            joins.append("LEFT JOIN authors au ON au.id = art.author_id")
+        if "magazine" in prefetch:
+            columns.append("m.name AS magazine__name, m.category AS magazine__category")
+            joins.append("LEFT JOIN magazines m ON m.id = art.magazine_id")
+        
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles")
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['title'], row['author_id'], row['magazine_id'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(columns)} FROM articles art {' '.join(joins)} {where}", params)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        # Each related row becomes one shared instance per query
+        authors = {}
+        magazines = {}
+        articles = []
+        for row in rows:
+            article = cls._from_row(row)
+            article._related = {}
+            if "author" in prefetch:
+                author = None
+                if row['author__name'] is not None:
+                    author = authors.get(row['author_id'])
+                    if author is None:
+                        author = identity_map.lookup("authors", row['author_id']) or identity_map.remember(
+                            "authors", Author(row['author__name'], row['author_id']))
+                        authors[row['author_id']] = author
+                article._related["author"] = (row['author_id'], author)
+            if "magazine" in prefetch:
+                magazine = None
+                if row['magazine__name'] is not None:
+                    magazine = magazines.get(row['magazine_id'])
+                    if magazine is None:
+                        magazine = identity_map.lookup("magazines", row['magazine_id']) or identity_map.remember(
+                            "magazines", Magazine(row['magazine__name'], row['magazine__category'], row['magazine_id']))
+                        magazines[row['magazine_id']] = magazine
+                article._related["magazine"] = (row['magazine_id'], magazine)
+            articles.append(article)
+        return articles
+    
+    def _prefetched(self, name, foreign_key):
+        # A prefetched object is only valid while the foreign key is unchanged
+        related = self._related.get(name) if self._related else None
+        if related is not None and related[0] == foreign_key:
+            return related
+        return None
     
     def author(self):
+        prefetched = self._prefetched("author", self.author_id)
+        if prefetched is not None:
+            return prefetched[1]
         from lib.models.author import Author
         return Author.find_by_id(self.author_id)
     
     def magazine(self):
+        prefetched = self._prefetched("magazine", self.magazine_id)
+        if prefetched is not None:
+            return prefetched[1]
         from lib.models.magazine import Magazine
         return Magazine.find_by_id(self.magazine_id)
     
+    # Async counterparts: run on the lib.db.aio executor, one connection per worker thread
+    async def asave(self):
+        return await run_in_db_thread(self.save)
+    
+    async def aauthor(self):
+        return await run_in_db_thread(self.author)
+    
+    async def amagazine(self):
+        return await run_in_db_thread(self.magazine)
+    
+    @classmethod
+    async def abulk_create(cls, articles, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_create, articles, batch_size=batch_size)
+    
+    @classmethod
+    async def abulk_update(cls, articles, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_update, articles, batch_size=batch_size)
+    
+    @classmethod
+    async def afind_by_id(cls, id):
+        return await run_in_db_thread(cls.find_by_id, id)
+    
+    @classmethod
+    async def afind_by_title(cls, title):
+        return await run_in_db_thread(cls.find_by_title, title)
+    
+    @classmethod
+    async def afind_by_author(cls, author_id, prefetch=()):
+        return await run_in_db_thread(cls.find_by_author, author_id, prefetch=prefetch)
+    
+    @classmethod
+    async def afind_by_magazine(cls, magazine_id, prefetch=()):
+        return await run_in_db_thread(cls.find_by_magazine, magazine_id, prefetch=prefetch)
+    
+    @classmethod
+    async def aall(cls, prefetch=()):
+        return await run_in_db_thread(cls.all, prefetch=prefetch)
+    
+    @classmethod
+    async def asearch(cls, query, limit=DEFAULT_SEARCH_LIMIT, author_id=None, magazine_id=None, prefix=True):
+        return await run_in_db_thread(cls.search, query,
+            limit=limit, author_id=author_id, magazine_id=magazine_id, prefix=prefix)
+    
+    @classmethod
+    async def apaginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id", author_id=None, magazine_id=None):
+        return await run_in_db_thread(cls.paginate,
+            limit=limit, cursor=cursor, order_by=order_by, author_id=author_id, magazine_id=magazine_id)
+    
+    @classmethod
+    def aiter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size)
+    
+    @classmethod
+    def aiter_by_author(cls, author_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size, author_id=author_id)
+    
+    @classmethod
+    def aiter_by_magazine(cls, magazine_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size, magazine_id=magazine_id)
+    
     def __repr__(self):
         return f"<Article {self.title}>"
\ No newline at end of file
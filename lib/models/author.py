@@ -1,10 +1,26 @@
 from lib.db.connection import get_connection
+from lib.db import bulk, identity_map, writer
+from lib.db.aio import aiter_pages, run_in_db_thread
+from lib.db.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from lib.db.query import QuerySet, estimated_row_count
+from lib.db.streaming import DEFAULT_CHUNK_SIZE, iter_rows
+from lib.db.session import current_session
 
 class Author:
+    __slots__ = ("id", "_name")
+    
     def __init__(self, name, id=None):
         self.id = id
         self.name = name
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build an author from a trusted database row without re-running validation"""
+        author = cls.__new__(cls)
+        author.id = row['id']
+        author._name = row['name']
+        return author
+    
     @property
     def name(self):
         return self._name
@@ -16,68 +32,189 @@ class Author:
         self._name = value
     
     def save(self):
+        session = current_session()
+        if session is not None:
+            # Inside a Session the write joins its transaction
+            session.save(self)
+            return self
+        if writer.current_writer() is not None:
+            # Write-behind: the writer thread group-commits it with other saves
+            writer.submit_model(self).result()
+            return self
         conn = get_connection()
-        cursor = conn.cursor()
+        try:
+            self._write(conn.cursor())
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self._forget()
+        return self
+    
+    def submit(self):
+        """Queue this save on the write-behind thread; returns a Future of the id"""
+        return writer.submit_model(self)
+    
+    def _write(self, cursor):
+        """INSERT or UPDATE this row using an existing cursor (no commit)"""
         if self.id is None:
             cursor.execute("INSERT INTO authors (name) VALUES (?)", (self.name,))
             self.id = cursor.lastrowid
         else:
             cursor.execute("UPDATE authors SET name = ? WHERE id = ?", (self.name, self.id))
-        conn.commit()
-        conn.close()
-        return self
+    
+    def _forget(self):
+        """Drop this row from the identity map; called once its write has committed"""
+        identity_map.invalidate("authors", self.id)
+    
+    def _state(self):
+        return (self.name,)
+    
+    @classmethod
+    def bulk_create(cls, authors, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Insert many unsaved authors in one transaction and return them with ids set"""
+        return bulk.bulk_insert(authors, "authors", ("name",), batch_size)
+    
+    @classmethod
+    def bulk_update(cls, authors, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Write many saved authors back in one transaction; returns rows updated"""
+        return bulk.bulk_update(authors, "authors", ("name",), batch_size)
     
     @classmethod
     def find_by_id(cls, id):
+        cached = identity_map.lookup("authors", id)
+        if cached is not None:
+            return cached
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM authors WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM authors WHERE id = ?", (id,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['name'], row['id'])
+            return identity_map.remember("authors", cls._from_row(row))
         return None
     
     @classmethod
     def find_by_name(cls, name):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM authors WHERE name = ?", (name,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM authors WHERE name = ?", (name,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['name'], row['id'])
+            return cls._from_row(row)
         return None
     
     @classmethod
     def all(cls):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM authors")
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['name'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM authors")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def iter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Lazily yield every author, fetching chunk_size rows at a time"""
+        return iter_rows("SELECT * FROM authors", (), chunk_size, cls._from_row)
+    
+    @classmethod
+    def paginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id"):
+        """Keyset-paginated authors ordered by id or name"""
+        return fetch_page("authors", cls._from_row, order_by, ("id", "name"), {}, cursor, limit)
+    
+    @classmethod
+    def query(cls):
+        """Lazy, chainable QuerySet over authors; runs one statement when evaluated"""
+        return QuerySet(cls, "authors", ("id", "name"))
+    
+    @classmethod
+    def count(cls, approximate=False):
+        """
+        Number of authors. With approximate the estimate from the last
+        ANALYZE is used when there is one, avoiding a COUNT(*) over the
+        whole table.
+        """
+        if approximate:
+            estimate = estimated_row_count("authors")
+            if estimate is not None:
+                return estimate
+        return cls.query().count()
+    
+    @classmethod
+    def exists(cls):
+        """True if there is at least one author; stops at the first row"""
+        return cls.query().exists()
     
     def articles(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE author_id = ?", (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE author_id = ? ORDER BY id", (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return rows
     
     def magazines(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT m.* FROM magazines m
-            JOIN articles a ON m.id = a.magazine_id
-            WHERE a.author_id = ?
-        """, (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT m.* FROM magazines m
+                JOIN articles a ON m.id = a.magazine_id
+                WHERE a.author_id = ?
+                ORDER BY m.id
+            """, (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return rows
     
+    @classmethod
+    def articles_for(cls, author_ids, chunk_size=bulk.DEFAULT_IN_CHUNK_SIZE):
+        """{author_id: rows} as author.articles() returns them, one query per chunk_size ids"""
+        result = {author_id: [] for author_id in author_ids}
+        for row in bulk.select_in(
+            "SELECT * FROM articles WHERE author_id IN ({ids}) ORDER BY author_id, id", list(result), chunk_size
+        ):
+            result[row['author_id']].append(row)
+        return result
+    
+    @classmethod
+    def magazines_for(cls, author_ids, chunk_size=bulk.DEFAULT_IN_CHUNK_SIZE):
+        """{author_id: rows} as author.magazines() returns them; each magazine row is fetched once"""
+        result = {author_id: [] for author_id in author_ids}
+        pairs = bulk.select_in(
+            "SELECT DISTINCT author_id, magazine_id FROM articles WHERE author_id IN ({ids}) ORDER BY author_id, magazine_id",
+            list(result), chunk_size
+        )
+        magazine_ids = list(dict.fromkeys(magazine_id for _, magazine_id in pairs))
+        magazines = {row['id']: row for row in bulk.select_in(
+            "SELECT * FROM magazines WHERE id IN ({ids})", magazine_ids, chunk_size
+        )}
+        for author_id, magazine_id in pairs:
+            if magazine_id in magazines:
+                result[author_id].append(magazines[magazine_id])
+        return result
+    
+    @classmethod
+    def topic_areas_for(cls, author_ids, chunk_size=bulk.DEFAULT_IN_CHUNK_SIZE):
+        """{author_id: categories} as author.topic_areas() returns them"""
+        return {
+            author_id: list(dict.fromkeys(row['category'] for row in rows))
+            for author_id, rows in cls.magazines_for(author_ids, chunk_size).items()
+        }
+    
     def add_article(self, magazine, title):
         from lib.models.article import Article
         article = Article(title, self.id, magazine.id)
@@ -85,15 +222,64 @@ class Author:
     
     def topic_areas(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT m.category FROM magazines m
-            JOIN articles a ON m.id = a.magazine_id
-            WHERE a.author_id = ?
-        """, (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            # In order of each category's first magazine, like topic_areas_for
+            cursor.execute("""
+                SELECT m.category FROM magazines m
+                JOIN articles a ON m.id = a.magazine_id
+                WHERE a.author_id = ?
+                GROUP BY m.category
+                ORDER BY MIN(m.id)
+            """, (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return [row['category'] for row in rows]
     
+    # Async counterparts: run on the lib.db.aio executor, one connection per worker thread
+    async def asave(self):
+        return await run_in_db_thread(self.save)
+    
+    async def aarticles(self):
+        return await run_in_db_thread(self.articles)
+    
+    async def amagazines(self):
+        return await run_in_db_thread(self.magazines)
+    
+    async def aadd_article(self, magazine, title):
+        return await run_in_db_thread(self.add_article, magazine, title)
+    
+    async def atopic_areas(self):
+        return await run_in_db_thread(self.topic_areas)
+    
+    @classmethod
+    async def abulk_create(cls, authors, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_create, authors, batch_size=batch_size)
+    
+    @classmethod
+    async def abulk_update(cls, authors, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_update, authors, batch_size=batch_size)
+    
+    @classmethod
+    async def afind_by_id(cls, id):
+        return await run_in_db_thread(cls.find_by_id, id)
+    
+    @classmethod
+    async def afind_by_name(cls, name):
+        return await run_in_db_thread(cls.find_by_name, name)
+    
+    @classmethod
+    async def aall(cls):
+        return await run_in_db_thread(cls.all)
+    
+    @classmethod
+    async def apaginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id"):
+        return await run_in_db_thread(cls.paginate, limit=limit, cursor=cursor, order_by=order_by)
+    
+    @classmethod
+    def aiter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size)
+    
     def __repr__(self):
         return f"<Author {self.name}>"
\ No newline at end of file
@@ -1,11 +1,28 @@
 from lib.db.connection import get_connection
+from lib.db import bulk, identity_map, result_cache, writer
+from lib.db.aio import aiter_pages, run_in_db_thread
+from lib.db.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from lib.db.query import QuerySet, estimated_row_count
+from lib.db.streaming import DEFAULT_CHUNK_SIZE, iter_rows
+from lib.db.session import current_session
 
 class Magazine:
+    __slots__ = ("id", "_name", "_category")
+    
     def __init__(self, name, category, id=None):
         self.id = id
         self.name = name
         self.category = category
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build a magazine from a trusted database row without re-running validation"""
+        magazine = cls.__new__(cls)
+        magazine.id = row['id']
+        magazine._name = row['name']
+        magazine._category = row['category']
+        return magazine
+    
     @property
     def name(self):
         return self._name
@@ -27,116 +44,292 @@ class Magazine:
         self._category = value
     
     def save(self):
+        session = current_session()
+        if session is not None:
+            # Inside a Session the write joins its transaction
+            session.save(self)
+            return self
+        if writer.current_writer() is not None:
+            # Write-behind: the writer thread group-commits it with other saves
+            writer.submit_model(self).result()
+            return self
         conn = get_connection()
-        cursor = conn.cursor()
+        try:
+            self._write(conn.cursor())
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self._forget()
+        return self
+    
+    def submit(self):
+        """Queue this save on the write-behind thread; returns a Future of the id"""
+        return writer.submit_model(self)
+    
+    def _write(self, cursor):
+        """INSERT or UPDATE this row using an existing cursor (no commit)"""
         if self.id is None:
             cursor.execute("INSERT INTO magazines (name, category) VALUES (?, ?)", (self.name, self.category))
             self.id = cursor.lastrowid
         else:
             cursor.execute("UPDATE magazines SET name = ?, category = ? WHERE id = ?", (self.name, self.category, self.id))
-        conn.commit()
-        conn.close()
-        return self
+    
+    def _forget(self):
+        """Drop this row from the identity map; called once its write has committed"""
+        identity_map.invalidate("magazines", self.id)
+    
+    def _state(self):
+        return (self.name, self.category)
+    
+    @classmethod
+    def bulk_create(cls, magazines, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Insert many unsaved magazines in one transaction and return them with ids set"""
+        return bulk.bulk_insert(magazines, "magazines", ("name", "category"), batch_size)
+    
+    @classmethod
+    def bulk_update(cls, magazines, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """Write many saved magazines back in one transaction; returns rows updated"""
+        return bulk.bulk_update(magazines, "magazines", ("name", "category"), batch_size)
     
     @classmethod
     def find_by_id(cls, id):
+        cached = identity_map.lookup("magazines", id)
+        if cached is not None:
+            return cached
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM magazines WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM magazines WHERE id = ?", (id,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['name'], row['category'], row['id'])
+            return identity_map.remember("magazines", cls._from_row(row))
         return None
     
     @classmethod
     def find_by_name(cls, name):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM magazines WHERE name = ?", (name,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM magazines WHERE name = ?", (name,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['name'], row['category'], row['id'])
+            return cls._from_row(row)
         return None
     
     @classmethod
     def find_by_category(cls, category):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM magazines WHERE category = ?", (category,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['name'], row['category'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM magazines WHERE category = ? ORDER BY id", (category,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
     
     @classmethod
     def all(cls):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM magazines")
-        rows = cursor.fetchall()
-        conn.close()
-        return [cls(row['name'], row['category'], row['id']) for row in rows]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM magazines")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def iter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Lazily yield every magazine, fetching chunk_size rows at a time"""
+        return iter_rows("SELECT * FROM magazines", (), chunk_size, cls._from_row)
+    
+    @classmethod
+    def iter_by_category(cls, category, chunk_size=DEFAULT_CHUNK_SIZE):
+        return iter_rows("SELECT * FROM magazines WHERE category = ? ORDER BY id", (category,), chunk_size, cls._from_row)
+    
+    @classmethod
+    def paginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id", category=None):
+        """Keyset-paginated magazines ordered by id or name, optionally within a category"""
+        return fetch_page("magazines", cls._from_row, order_by, ("id", "name"), {"category": category}, cursor, limit)
+    
+    @classmethod
+    def query(cls):
+        """Lazy, chainable QuerySet over magazines; runs one statement when evaluated"""
+        return QuerySet(cls, "magazines", ("id", "name", "category"))
+    
+    @classmethod
+    def count(cls, approximate=False):
+        """
+        Number of magazines. With approximate the estimate from the last
+        ANALYZE is used when there is one, avoiding a COUNT(*) over the
+        whole table.
+        """
+        if approximate:
+            estimate = estimated_row_count("magazines")
+            if estimate is not None:
+                return estimate
+        return cls.query().count()
+    
+    @classmethod
+    def exists(cls):
+        """True if there is at least one magazine; stops at the first row"""
+        return cls.query().exists()
     
     def articles(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE magazine_id = ?", (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM articles WHERE magazine_id = ? ORDER BY id", (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return rows
     
     def contributors(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT a.* FROM authors a
-            JOIN articles art ON a.id = art.author_id
-            WHERE art.magazine_id = ?
-        """, (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT a.* FROM authors a
+                JOIN articles art ON a.id = art.author_id
+                WHERE art.magazine_id = ?
+            """, (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return rows
     
     def article_titles(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT title FROM articles WHERE magazine_id = ?", (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT title FROM articles WHERE magazine_id = ? ORDER BY id", (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return [row['title'] for row in rows]
     
+    @classmethod
+    def articles_for(cls, magazine_ids, chunk_size=bulk.DEFAULT_IN_CHUNK_SIZE):
+        """{magazine_id: rows} as magazine.articles() returns them, one query per chunk_size ids"""
+        result = {magazine_id: [] for magazine_id in magazine_ids}
+        for row in bulk.select_in(
+            "SELECT * FROM articles WHERE magazine_id IN ({ids}) ORDER BY magazine_id, id", list(result), chunk_size
+        ):
+            result[row['magazine_id']].append(row)
+        return result
+    
+    @classmethod
+    def article_titles_for(cls, magazine_ids, chunk_size=bulk.DEFAULT_IN_CHUNK_SIZE):
+        """{magazine_id: titles} as magazine.article_titles() returns them"""
+        result = {magazine_id: [] for magazine_id in magazine_ids}
+        for row in bulk.select_in(
+            "SELECT magazine_id, title FROM articles WHERE magazine_id IN ({ids}) ORDER BY magazine_id, id",
+            list(result), chunk_size
+        ):
+            result[row['magazine_id']].append(row['title'])
+        return result
+    
+    @result_cache.cached("Magazine.contributing_authors", key=lambda self: self.id)
     def contributing_authors(self):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT a.* FROM authors a
-            JOIN articles art ON a.id = art.author_id
-            WHERE art.magazine_id = ?
-            GROUP BY a.id
-            HAVING COUNT(art.id) > 2
-        """, (self.id,))
-        rows = cursor.fetchall()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            # Reads the trigger-maintained per-(magazine, author) counters
+            cursor.execute("""
+                SELECT a.* FROM magazine_author_counts c
+                JOIN authors a ON a.id = c.author_id
+                WHERE c.magazine_id = ? AND c.article_count > 2
+            """, (self.id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
         return rows
     
     @classmethod
+    @result_cache.cached("Magazine.top_publisher", key=lambda cls: ())
     def top_publisher(cls):
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT m.*, COUNT(a.id) as article_count
-            FROM magazines m
-            LEFT JOIN articles a ON m.id = a.magazine_id
-            GROUP BY m.id
-            ORDER BY article_count DESC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            # Walks the article_count index of the per-magazine counters
+            cursor.execute("""
+                SELECT m.*, c.article_count
+                FROM magazine_article_counts c
+                JOIN magazines m ON m.id = c.magazine_id
+                ORDER BY c.article_count DESC, c.magazine_id
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
+        finally:
+            conn.close()
         if row:
-            return cls(row['name'], row['category'], row['id'])
+            return cls._from_row(row)
         return None
     
+    # Async counterparts: run on the lib.db.aio executor, one connection per worker thread
+    async def asave(self):
+        return await run_in_db_thread(self.save)
+    
+    async def aarticles(self):
+        return await run_in_db_thread(self.articles)
+    
+    async def acontributors(self):
+        return await run_in_db_thread(self.contributors)
+    
+    async def aarticle_titles(self):
+        return await run_in_db_thread(self.article_titles)
+    
+    async def acontributing_authors(self):
+        return await run_in_db_thread(self.contributing_authors)
+    
+    @classmethod
+    async def abulk_create(cls, magazines, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_create, magazines, batch_size=batch_size)
+    
+    @classmethod
+    async def abulk_update(cls, magazines, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return await run_in_db_thread(cls.bulk_update, magazines, batch_size=batch_size)
+    
+    @classmethod
+    async def afind_by_id(cls, id):
+        return await run_in_db_thread(cls.find_by_id, id)
+    
+    @classmethod
+    async def afind_by_name(cls, name):
+        return await run_in_db_thread(cls.find_by_name, name)
+    
+    @classmethod
+    async def afind_by_category(cls, category):
+        return await run_in_db_thread(cls.find_by_category, category)
+    
+    @classmethod
+    async def aall(cls):
+        return await run_in_db_thread(cls.all)
+    
+    @classmethod
+    async def apaginate(cls, limit=DEFAULT_PAGE_SIZE, cursor=None, order_by="id", category=None):
+        return await run_in_db_thread(cls.paginate,
+            limit=limit, cursor=cursor, order_by=order_by, category=category)
+    
+    @classmethod
+    async def atop_publisher(cls):
+        return await run_in_db_thread(cls.top_publisher)
+    
+    @classmethod
+    def aiter_all(cls, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size)
+    
+    @classmethod
+    def aiter_by_category(cls, category, chunk_size=DEFAULT_CHUNK_SIZE):
+        return aiter_pages(cls.paginate, chunk_size, category=category)
+    
     def __repr__(self):
         return f"<Magazine {self.name}>"
\ No newline at end of file
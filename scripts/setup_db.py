@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import re
 import sqlite3
 import os
 import sys
@@ -8,6 +9,45 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from lib.db.connection import get_connection
+from lib.db.counters import check_counters, rebuild_counters
+from lib.db.search import check_search_index, rebuild_search_index
+
+# ON DELETE action of each articles foreign key in schema.sql: deleting an
+# author takes their articles along, deleting a magazine that still has
+# articles is refused
+ARTICLE_FOREIGN_KEY_ACTIONS = {'author_id': 'CASCADE', 'magazine_id': 'NO ACTION'}
+
+def migrate_article_foreign_keys(conn, schema_sql):
+    """
+    SQLite cannot alter a foreign key, so an articles table whose foreign
+    keys do not match ARTICLE_FOREIGN_KEY_ACTIONS (created before ON DELETE
+    CASCADE was added, or with it on magazine_id too) is rebuilt from the
+    current definition. Its indexes and triggers go with the old table and
+    are recreated when the schema is applied afterwards. Returns True if
+    the table was rebuilt.
+    """
+    actions = {row['from']: row['on_delete'] for row in conn.execute("PRAGMA foreign_key_list(articles)")}
+    if not actions or actions == ARTICLE_FOREIGN_KEY_ACTIONS:
+        return False
+    create = re.search(r"CREATE TABLE IF NOT EXISTS articles \(.*?\);", schema_sql, re.S).group(0)
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(create.replace("articles (", "articles_new (", 1))
+        conn.execute("INSERT INTO articles_new (id, title, author_id, magazine_id) "
+                     "SELECT id, title, author_id, magazine_id FROM articles")
+        conn.execute("DROP TABLE articles")
+        conn.execute("ALTER TABLE articles_new RENAME TO articles")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+    orphans = conn.execute("PRAGMA foreign_key_check(articles)").fetchall()
+    if orphans:
+        print(f"Warning: {len(orphans)} articles reference authors or magazines that no longer exist")
+    return True
 
 def setup_database():
     """Create the database tables using the schema file"""
@@ -23,13 +63,23 @@ def setup_database():
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Execute the schema (split by semicolon to handle multiple statements)
-        for statement in schema_sql.split(';'):
-            statement = statement.strip()
-            if statement:  # Skip empty statements
-                cursor.execute(statement)
+        if migrate_article_foreign_keys(conn, schema_sql):
+            print("Articles table rebuilt with ON DELETE CASCADE on author_id")
         
+        # Execute the schema as a script (trigger bodies contain semicolons)
+        cursor.executescript(schema_sql)
         conn.commit()
+        
+        # WAL lets the report workers read while something else writes
+        conn.execute("PRAGMA journal_mode = WAL")
+        
+        # Counter tables added to an existing database start out empty
+        if check_counters(conn):
+            rebuild_counters(conn)
+            print("Article counters rebuilt from existing data")
+        if not check_search_index(conn):
+            rebuild_search_index(conn)
+            print("Article search index rebuilt from existing data")
         conn.close()
         
         print("Database setup completed successfully!")
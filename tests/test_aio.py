@@ -0,0 +1,114 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.aio import get_executor, run_in_db_thread, shutdown_executor
+from lib.db.connection import get_connection, pin_thread_connection, unpin_thread_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database and the executor's pinned connections"""
+        shutdown_executor()
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_async_queries(self):
+        """Test async counterparts return the same results as the sync API"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        for i in range(3):
+            Article(f"Article {i}", author.id, magazine.id).save()
+        
+        async def scenario():
+            articles, magazines, top, found = await asyncio.gather(
+                Article.afind_by_author(author.id),
+                author.amagazines(),
+                Magazine.atop_publisher(),
+                Article.asearch("Article", limit=2),
+            )
+            saved = await Article("Async Article", author.id, magazine.id).asave()
+            return articles, magazines, top, found, saved
+        
+        articles, magazines, top, found, saved = asyncio.run(scenario())
+        self.assertEqual(len(articles), 3)
+        self.assertEqual(len(found), 2)
+        self.assertEqual([m['name'] for m in magazines], ["Tech Weekly"])
+        self.assertEqual(top.id, magazine.id)
+        self.assertEqual(Article.find_by_id(saved.id).title, "Async Article")
+    
+    def test_async_iteration(self):
+        """Test async iterators page through every row"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        Article.bulk_create(Article(f"Article {i}", author.id, magazine.id) for i in range(7))
+        
+        async def collect():
+            return [article.title async for article in Article.aiter_by_author(author.id, chunk_size=3)]
+        
+        self.assertEqual(asyncio.run(collect()), [f"Article {i}" for i in range(7)])
+    
+    def test_workers_use_their_own_connection(self):
+        """Test each executor thread keeps one dedicated connection"""
+        def connection_id():
+            conn = get_connection()
+            conn.close()
+            return threading.get_ident(), id(conn)
+        
+        async def sample():
+            return await asyncio.gather(*(run_in_db_thread(connection_id) for _ in range(20)))
+        
+        pairs = asyncio.run(sample())
+        by_thread = {}
+        for thread_id, conn_id in pairs:
+            by_thread.setdefault(thread_id, set()).add(conn_id)
+        self.assertTrue(all(len(conns) == 1 for conns in by_thread.values()))
+        self.assertEqual(len({conn_id for _, conn_id in pairs}), len(by_thread))
+        self.assertIsNotNone(get_executor())
+    
+    def test_pinned_connection_nests(self):
+        """Test nested checkouts on a pinned thread share one connection"""
+        pin_thread_connection()
+        try:
+            outer = get_connection()
+            inner = get_connection()
+            self.assertIs(outer, inner)
+            outer.execute("INSERT INTO authors (name) VALUES ('Pending')")
+            inner.close()
+            self.assertTrue(outer.in_transaction)
+            outer.close()
+            self.assertFalse(outer.in_transaction)
+        finally:
+            unpin_thread_connection()
+
+if __name__ == '__main__':
+    unittest.main()
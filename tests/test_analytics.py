@@ -0,0 +1,95 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import analytics, columnar
+from lib.db.connection import get_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+
+        self.authors = Author.bulk_create([Author(f"Author {i}") for i in range(6)])
+        self.magazines = Magazine.bulk_create([
+            Magazine("Tech Weekly", "Technology"),
+            Magazine("Science Today", "Science"),
+            Magazine("Code Monthly", "Technology"),
+            Magazine("Empty Quarterly", "Arts"),
+        ])
+        # Uneven spread so some authors pass the more-than-2 threshold
+        Article.bulk_create(
+            Article(f"Article {i}", self.authors[(i * i) % 5].id, self.magazines[i % 3].id) for i in range(40)
+        )
+
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+
+    def expected(self):
+        """The same answers built one entity at a time through the models"""
+        magazines = Magazine.all()
+        non_empty = lambda d: {k: v for k, v in d.items() if v}
+        return (
+            {m.id: len(m.articles()) for m in magazines},
+            non_empty({m.id: sorted(row['id'] for row in m.contributors()) for m in magazines}),
+            non_empty({m.id: sorted(row['id'] for row in m.contributing_authors()) for m in magazines}),
+            non_empty({a.id: sorted(a.topic_areas()) for a in Author.all()}),
+        )
+
+    def batched(self, snapshot=None):
+        return (
+            analytics.magazine_article_counts(snapshot),
+            analytics.magazine_contributors(snapshot),
+            analytics.magazine_contributing_authors(snapshot=snapshot),
+            analytics.author_topic_areas(snapshot),
+        )
+
+    def test_grouped_sql_matches_per_entity_methods(self):
+        """Test one pass over the counters gives what the per-entity methods give"""
+        expected = self.expected()
+        self.assertEqual(self.batched(), expected)
+        self.assertEqual(expected[0][self.magazines[3].id], 0)
+        self.assertTrue(expected[2])
+
+    def test_threshold(self):
+        """Test more_than filters on articles per magazine and author"""
+        everyone = analytics.magazine_contributing_authors(0)
+        self.assertEqual(everyone, analytics.magazine_contributors())
+        self.assertEqual(analytics.magazine_contributing_authors(100), {})
+
+    @unittest.skipIf(columnar.np is None, "NumPy is not installed")
+    def test_numpy_backend_matches_sql(self):
+        """Test the snapshot backend returns identical dicts"""
+        snapshot = columnar.export_snapshot()
+        self.assertEqual(self.batched(snapshot), self.batched())
+        self.assertEqual(analytics.magazine_contributing_authors(5, snapshot),
+                         analytics.magazine_contributing_authors(5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,32 +10,19 @@ from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.models.article import Article
 
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
 class TestArticle(unittest.TestCase):
     def setUp(self):
         """Set up test database"""
         # Set testing environment variable
         os.environ['TESTING'] = '1'
         
-        # Create tables
+        # Create tables from the real schema
         from lib.db.connection import get_connection
         conn = get_connection()
-        conn.execute('''CREATE TABLE IF NOT EXISTS authors (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS magazines (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            category VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY,
-            title VARCHAR(255) NOT NULL,
-            author_id INTEGER,
-            magazine_id INTEGER,
-            FOREIGN KEY (author_id) REFERENCES authors(id),
-            FOREIGN KEY (magazine_id) REFERENCES magazines(id)
-        )''')
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
         conn.commit()
         conn.close()
     
@@ -177,6 +164,117 @@ class TestArticle(unittest.TestCase):
         self.assertIsNotNone(article_magazine)
         self.assertEqual(article_magazine.name, "Tech Weekly")
         self.assertEqual(article_magazine.id, magazine.id)
+    
+    def test_article_prefetch_relationships(self):
+        """Test prefetch attaches authors and magazines without further queries"""
+        author = Author("John Doe").save()
+        magazine1 = Magazine("Tech Weekly", "Technology").save()
+        magazine2 = Magazine("Science Today", "Science").save()
+        for i in range(4):
+            Article(f"Article {i}", author.id, [magazine1, magazine2][i % 2].id).save()
+        
+        articles = Article.all(prefetch=("author", "magazine"))
+        
+        # Relationship rows are gone, so anything not prefetched would come back None
+        from lib.db.connection import get_connection
+        conn = get_connection()
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        self.assertEqual(len(articles), 4)
+        self.assertTrue(all(article.author() is articles[0].author() for article in articles))
+        self.assertEqual(articles[0].author().name, "John Doe")
+        self.assertEqual([article.magazine().name for article in articles[:2]], ["Tech Weekly", "Science Today"])
+    
+    def test_article_prefetch_with_filters(self):
+        """Test prefetch on find_by_author and find_by_magazine"""
+        author1 = Author("John Doe").save()
+        author2 = Author("Jane Smith").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        Article("Article 1", author1.id, magazine.id).save()
+        Article("Article 2", author2.id, magazine.id).save()
+        
+        by_author = Article.find_by_author(author2.id, prefetch=("magazine",))
+        self.assertEqual([article.magazine().name for article in by_author], ["Tech Weekly"])
+        
+        by_magazine = Article.find_by_magazine(magazine.id, prefetch=("author",))
+        self.assertEqual(sorted(article.author().name for article in by_magazine), ["Jane Smith", "John Doe"])
+        
+        with self.assertRaises(ValueError):
+            Article.all(prefetch=("publisher",))
+    
+    def test_article_prefetch_ignored_after_reassignment(self):
+        """Test a changed foreign key is not answered from the prefetched object"""
+        author1 = Author("John Doe").save()
+        author2 = Author("Jane Smith").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        Article("Article 1", author1.id, magazine.id).save()
+        
+        article = Article.all(prefetch=("author",))[0]
+        article.author_id = author2.id
+        self.assertEqual(article.author().name, "Jane Smith")
+    
+    def test_article_iter_all(self):
+        """Test streaming articles matches all()"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        for i in range(7):
+            Article(f"Article {i}", author.id, magazine.id).save()
+        
+        streamed = list(Article.iter_all(chunk_size=3))
+        self.assertEqual([a.id for a in streamed], [a.id for a in Article.all()])
+        self.assertEqual(len(list(Article.iter_by_author(author.id, chunk_size=2))), 7)
+        self.assertEqual(len(list(Article.iter_by_magazine(magazine.id))), 7)
+        self.assertEqual(len(list(Article.iter_by_title("Article 3"))), 1)
+    
+    def test_article_iter_returns_connection_on_early_stop(self):
+        """Test closing a stream early hands its connection back to the pool"""
+        from lib.db.connection import get_pool
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        for i in range(5):
+            Article(f"Article {i}", author.id, magazine.id).save()
+        
+        pool = get_pool()
+        idle_before = pool.idle
+        stream = Article.iter_all(chunk_size=2)
+        first = next(stream)
+        self.assertEqual(first.title, "Article 0")
+        self.assertEqual(pool.idle, idle_before - 1)
+        stream.close()
+        self.assertEqual(pool.idle, idle_before)
+    
+    def test_article_slots_and_row_hydration(self):
+        """Test articles have no per-instance __dict__ and hydrate from rows"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        article = Article("Test Article", author.id, magazine.id).save()
+        
+        self.assertFalse(hasattr(article, '__dict__'))
+        with self.assertRaises(AttributeError):
+            article.subtitle = "nope"
+        
+        found = Article.find_by_id(article.id)
+        self.assertEqual((found.id, found.title, found.author_id, found.magazine_id),
+                         (article.id, "Test Article", author.id, magazine.id))
+        self.assertEqual(found.author().name, "John Doe")
+    
+    def test_failed_save_does_not_block_writers(self):
+        """Test a save that raises returns its connection and releases the write lock"""
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        with self.assertRaises(sqlite3.IntegrityError):
+            Article("Bad Article", 9999, magazine.id).save()
+        
+        other = sqlite3.connect('test_articles.db', timeout=0.1)
+        try:
+            other.execute("INSERT INTO authors (name) VALUES ('Elsewhere')")
+            other.commit()
+        finally:
+            other.close()
+        self.assertIsNotNone(Author("B").save().id)
+        self.assertEqual(len(Author.all()), 2)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
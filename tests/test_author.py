@@ -11,31 +11,18 @@ from lib.models.magazine import Magazine
 from lib.models.article import Article
 from lib.db.connection import get_connection
 
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
 class TestAuthor(unittest.TestCase):
     def setUp(self):
         """Set up test database"""
         # Set testing environment variable
         os.environ['TESTING'] = '1'
         
-        # Create tables
+        # Create tables from the real schema
         conn = get_connection()
-        conn.execute('''CREATE TABLE IF NOT EXISTS authors (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS magazines (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            category VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY,
-            title VARCHAR(255) NOT NULL,
-            author_id INTEGER,
-            magazine_id INTEGER,
-            FOREIGN KEY (author_id) REFERENCES authors(id),
-            FOREIGN KEY (magazine_id) REFERENCES magazines(id)
-        )''')
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
         conn.commit()
         conn.close()
     
@@ -157,6 +144,48 @@ class TestAuthor(unittest.TestCase):
         self.assertEqual(len(topic_areas), 2)
         self.assertIn("Technology", topic_areas)
         self.assertIn("Science", topic_areas)
+        
+        # Ordered by each category's first magazine, whatever order the articles came in
+        magazine3 = Magazine("Code Monthly", "Technology").save()
+        other = Author("Jane Smith").save()
+        Article("Article 3", other.id, magazine3.id).save()
+        Article("Article 4", other.id, magazine2.id).save()
+        Article("Article 5", other.id, magazine1.id).save()
+        self.assertEqual(other.topic_areas(), ["Technology", "Science"])
+        self.assertEqual(Author.topic_areas_for([other.id])[other.id], other.topic_areas())
+    
+    def test_author_batch_loaders(self):
+        """Test the batch loaders match the per-author methods across chunks"""
+        authors = [Author(f"Author {i}").save() for i in range(5)]
+        magazines = [Magazine("Tech Weekly", "Technology").save(), Magazine("Science Today", "Science").save(),
+                     Magazine("Code Monthly", "Technology").save()]
+        for i in range(20):
+            Article(f"Article {i}", authors[i % 4].id, magazines[(i * 7) % 3].id).save()
+        ids = [author.id for author in authors] + [authors[0].id, 9999]
+        
+        articles = Author.articles_for(ids, chunk_size=2)
+        magazines_by_author = Author.magazines_for(ids, chunk_size=2)
+        topic_areas = Author.topic_areas_for(ids, chunk_size=2)
+        self.assertEqual(list(articles), ids[:5] + [9999])
+        for author in authors + [Author("Nobody", id=9999)]:
+            self.assertEqual([tuple(row) for row in articles[author.id]], [tuple(row) for row in author.articles()])
+            self.assertEqual([tuple(row) for row in magazines_by_author[author.id]],
+                             [tuple(row) for row in author.magazines()])
+            self.assertEqual(topic_areas[author.id], author.topic_areas())
+        self.assertEqual(articles[authors[4].id], [])
+    
+    def test_author_iter_all(self):
+        """Test streaming authors lazily"""
+        Author("John Doe").save()
+        Author("Jane Smith").save()
+        
+        names = [author.name for author in Author.iter_all(chunk_size=1)]
+        self.assertEqual(names, ["John Doe", "Jane Smith"])
+    
+    def test_author_slots(self):
+        """Test authors have no per-instance __dict__"""
+        author = Author("John Doe").save()
+        self.assertFalse(hasattr(Author.find_by_id(author.id), '__dict__'))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,26 @@
+import unittest
+import os
+import random
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks import suite
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_every_public_method_has_a_benchmark(self):
+        """Test new model methods and transactions get a benchmark case"""
+        cases = suite.build_cases(1, 1, 1, random.Random())
+        self.assertEqual(suite.uncovered(cases), [])
+        self.assertEqual(len({c.name for c in cases}), len(cases))
+    
+    def test_compare_reports_relative_change(self):
+        """Test compare matches benchmarks by size and name"""
+        baseline = {'results': {'10000': {'a': {'p50_us': 100.0}, 'b': {'p50_us': 50.0}}}}
+        current = {'results': {'10000': {'a': {'p50_us': 150.0}, 'c': {'p50_us': 1.0}}}}
+        rows = suite.compare_results(baseline, current)
+        self.assertEqual(rows, [('10000', 'a', 100.0, 150.0, 0.5)])
+
+if __name__ == '__main__':
+    unittest.main()
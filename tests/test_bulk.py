@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.bulk import chunked
+from lib.db.connection import get_connection
+from lib.db.session import Session
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_chunked(self):
+        """Test splitting an iterable into batches"""
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        with self.assertRaises(ValueError):
+            list(chunked([1], 0))
+    
+    def test_bulk_create_assigns_ids(self):
+        """Test bulk_create inserts every row and fills in ids"""
+        Author("Existing").save()
+        authors = Author.bulk_create([Author(f"Author {i}") for i in range(25)], batch_size=10)
+        
+        self.assertEqual(len(authors), 25)
+        for author in authors:
+            self.assertEqual(Author.find_by_id(author.id).name, author.name)
+        self.assertEqual(len(Author.all()), 26)
+    
+    def test_bulk_create_articles(self):
+        """Test bulk_create on articles and magazines"""
+        author = Author("John Doe").save()
+        magazines = Magazine.bulk_create([Magazine("Tech Weekly", "Technology"), Magazine("Health Tips", "Health")])
+        articles = Article.bulk_create(
+            Article(f"Article {i}", author.id, magazines[i % 2].id) for i in range(7)
+        )
+        
+        self.assertEqual(len(Article.find_by_magazine(magazines[0].id)), 4)
+        self.assertEqual(Article.find_by_id(articles[-1].id).title, "Article 6")
+    
+    def test_bulk_create_rejects_saved_objects(self):
+        """Test bulk_create refuses objects that already have an id"""
+        author = Author("John Doe").save()
+        with self.assertRaises(ValueError):
+            Author.bulk_create([author])
+    
+    def test_bulk_update(self):
+        """Test bulk_update writes changes back"""
+        magazines = Magazine.bulk_create([Magazine(f"Magazine {i}", "Technology") for i in range(5)])
+        for magazine in magazines:
+            magazine.category = "Science"
+        
+        self.assertEqual(Magazine.bulk_update(magazines, batch_size=2), 5)
+        self.assertEqual(len(Magazine.find_by_category("Science")), 5)
+    
+    def test_bulk_create_joins_session(self):
+        """Test bulk_create inside a session is rolled back with it"""
+        with self.assertRaises(RuntimeError):
+            with Session():
+                authors = Author.bulk_create([Author("A"), Author("B")])
+                raise RuntimeError("boom")
+        self.assertEqual(Author.all(), [])
+        self.assertEqual([author.id for author in authors], [None, None])
+        
+        # Saving them afterwards inserts rather than updating nothing
+        authors[0].save()
+        self.assertEqual([author.name for author in Author.all()], ["A"])
+
+if __name__ == '__main__':
+    unittest.main()
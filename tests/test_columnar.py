@@ -0,0 +1,117 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import columnar
+from lib.db.connection import get_connection
+from lib.db.session import Session
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+@unittest.skipIf(columnar.np is None, "NumPy is not installed")
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+
+        self.authors = Author.bulk_create([Author(f"Author {i}") for i in range(5)])
+        self.magazines = Magazine.bulk_create([
+            Magazine("Tech Weekly", "Technology"),
+            Magazine("Science Today", "Science"),
+            Magazine("Code Monthly", "Technology"),
+        ])
+        self.articles = Article.bulk_create(
+            Article(f"Article {i}", self.authors[i % 3].id, self.magazines[i % 2].id) for i in range(23)
+        )
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test database"""
+        shutil.rmtree(self.directory)
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+
+    def assert_matches_database(self, snapshot):
+        np = columnar.np
+        articles = sorted(Article.all(), key=lambda article: article.id)
+        self.assertEqual(snapshot.articles['id'].dtype, np.int64)
+        self.assertEqual(snapshot.articles['id'].tolist(), [article.id for article in articles])
+        self.assertEqual(snapshot.articles['author_id'].tolist(), [article.author_id for article in articles])
+        self.assertEqual(snapshot.articles['magazine_id'].tolist(), [article.magazine_id for article in articles])
+        self.assertEqual(snapshot.authors['id'].tolist(), [author.id for author in self.authors])
+        self.assertEqual(list(snapshot.decode_categories(snapshot.magazines['category'])),
+                         ["Technology", "Science", "Technology"])
+        self.assertEqual(sorted(snapshot.categories), ["Science", "Technology"])
+
+    def test_export_in_chunks(self):
+        """Test arrays match the tables whatever the chunk size"""
+        for chunk_size in (1, 7, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                self.assert_matches_database(columnar.export_snapshot(chunk_size))
+
+    def test_export_inside_session(self):
+        """Test exporting in a Session sees its writes and leaves them uncommitted"""
+        with self.assertRaises(RuntimeError):
+            with Session():
+                author = Author("Uncommitted").save()
+                snapshot = columnar.export_snapshot()
+                self.assertEqual(snapshot.authors['id'].tolist()[-1], author.id)
+                raise RuntimeError("boom")
+        self.assertEqual(len(Author.all()), 5)
+
+    def test_save_and_load_memory_mapped(self):
+        """Test a saved snapshot loads back memory-mapped and read-only"""
+        columnar.export_snapshot().save(self.directory)
+        snapshot = columnar.Snapshot.load(self.directory)
+        self.assert_matches_database(snapshot)
+        self.assertIsInstance(snapshot.articles['id'], columnar.np.memmap)
+        with self.assertRaises(ValueError):
+            snapshot.articles['id'][0] = 0
+
+        per_author = columnar.np.bincount(snapshot.articles['author_id'])
+        self.assertEqual(per_author[self.authors[0].id], 8)
+
+    def test_load_or_export_skips_database_once_saved(self):
+        """Test a second load_or_export reads the files even after the data changed"""
+        first = columnar.load_or_export(self.directory)
+        Article("Late Article", self.authors[4].id, self.magazines[2].id).save()
+        self.assertEqual(len(columnar.load_or_export(self.directory).articles['id']), len(first.articles['id']))
+        refreshed = columnar.load_or_export(self.directory, refresh=True)
+        self.assertEqual(len(refreshed.articles['id']), 24)
+
+    def test_null_foreign_keys(self):
+        """Test NULL author and magazine ids are exported as MISSING"""
+        conn = get_connection()
+        conn.execute("INSERT INTO articles (title) VALUES ('Orphan')")
+        conn.commit()
+        conn.close()
+        snapshot = columnar.export_snapshot()
+        self.assertEqual(snapshot.articles['author_id'][-1], columnar.MISSING)
+        self.assertEqual(snapshot.articles['magazine_id'][-1], columnar.MISSING)
+
+if __name__ == '__main__':
+    unittest.main()
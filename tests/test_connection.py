@@ -0,0 +1,98 @@
+import unittest
+import os
+import sys
+import sqlite3
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.db.connection import (
+    ConnectionPool, PoolExhaustedError, get_connection, get_pool, close_all_pools
+)
+
+TEST_DB = 'test_pool.db'
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        """Create a dedicated pool on a scratch database"""
+        self.pool = ConnectionPool(TEST_DB, max_size=2, timeout=0.05)
+    
+    def tearDown(self):
+        """Close the pool and remove the scratch database"""
+        self.pool.close()
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+    
+    def test_connection_is_reused(self):
+        """Test that a returned connection is handed out again"""
+        conn = self.pool.checkout()
+        conn.close()
+        self.assertIs(self.pool.checkout(), conn)
+        self.assertEqual(self.pool.stats['created'], 1)
+        self.assertEqual(self.pool.stats['reused'], 1)
+    
+    def test_rows_are_addressable_by_name(self):
+        """Test pooled connections keep the sqlite3.Row factory"""
+        conn = self.pool.checkout()
+        row = conn.execute("SELECT 1 AS one").fetchone()
+        conn.close()
+        self.assertEqual(row['one'], 1)
+    
+    def test_max_size_is_enforced(self):
+        """Test checkout times out once max_size connections are in use"""
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        with self.assertRaises(PoolExhaustedError):
+            self.pool.checkout()
+        first.close()
+        self.assertIs(self.pool.checkout(), first)
+        second.close()
+    
+    def test_leaked_connection_frees_its_slot(self):
+        """Test a connection dropped without close() does not exhaust the pool"""
+        self.pool.checkout()
+        self.pool.checkout()
+        conn = self.pool.checkout()
+        self.assertIsNotNone(conn)
+    
+    def test_uncommitted_work_is_rolled_back(self):
+        """Test returning a connection discards an open transaction"""
+        conn = self.pool.checkout()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.close()
+        conn = self.pool.checkout()
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        conn.close()
+    
+    def test_replaced_database_file_is_detected(self):
+        """Test the health check drops connections to a deleted database file"""
+        conn = self.pool.checkout()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.close()
+        os.remove(TEST_DB)
+        fresh = self.pool.checkout()
+        self.assertIsNot(fresh, conn)
+        self.assertEqual(self.pool.stats['discarded'], 1)
+        fresh.close()
+    
+    def test_get_connection_uses_pool(self):
+        """Test get_connection checks out from the active database pool"""
+        os.environ['TESTING'] = '1'
+        try:
+            conn = get_connection()
+            conn.close()
+            self.assertIs(get_connection(), conn)
+            self.assertEqual(get_pool().database, 'test_articles.db')
+            conn.close()
+        finally:
+            del os.environ['TESTING']
+            close_all_pools()
+            if os.path.exists('test_articles.db'):
+                os.remove('test_articles.db')
+
+if __name__ == '__main__':
+    unittest.main()
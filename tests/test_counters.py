@@ -0,0 +1,106 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import get_connection
+from lib.db.counters import check_counters, rebuild_counters
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestCounters(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def counts(self, table, key):
+        conn = get_connection()
+        rows = conn.execute(f"SELECT {key}, article_count FROM {table}").fetchall()
+        conn.close()
+        return {row[0]: row[1] for row in rows}
+    
+    def test_triggers_follow_inserts_updates_and_deletes(self):
+        """Test the counters track every kind of article write"""
+        author1 = Author("John Doe").save()
+        author2 = Author("Jane Smith").save()
+        magazine1 = Magazine("Tech Weekly", "Technology").save()
+        magazine2 = Magazine("Science Today", "Science").save()
+        
+        articles = Article.bulk_create(Article(f"Article {i}", author1.id, magazine1.id) for i in range(3))
+        Article("Other", author2.id, magazine2.id).save()
+        self.assertEqual(self.counts("magazine_article_counts", "magazine_id"), {magazine1.id: 3, magazine2.id: 1})
+        self.assertEqual(self.counts("author_article_counts", "author_id"), {author1.id: 3, author2.id: 1})
+        
+        moved = articles[0]
+        moved.magazine_id = magazine2.id
+        moved.author_id = author2.id
+        moved.save()
+        self.assertEqual(self.counts("magazine_article_counts", "magazine_id"), {magazine1.id: 2, magazine2.id: 2})
+        
+        conn = get_connection()
+        conn.execute("DELETE FROM articles WHERE id = ?", (articles[1].id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.counts("author_article_counts", "author_id"), {author1.id: 1, author2.id: 2})
+        self.assertEqual(check_counters(), {})
+    
+    def test_counter_backed_queries(self):
+        """Test top_publisher and contributing_authors read the counters"""
+        author1 = Author("John Doe").save()
+        author2 = Author("Jane Smith").save()
+        empty = Magazine("Empty Monthly", "Health").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        self.assertEqual(Magazine.top_publisher().id, empty.id)
+        
+        Article.bulk_create([Article(f"Article {i}", author1.id, magazine.id) for i in range(3)])
+        Article("Single", author2.id, magazine.id).save()
+        
+        self.assertEqual(Magazine.top_publisher().id, magazine.id)
+        self.assertEqual([row['name'] for row in magazine.contributing_authors()], ["John Doe"])
+    
+    def test_rebuild_repairs_drift(self):
+        """Test the consistency check finds drift and rebuild repairs it"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        Article("Article 1", author.id, magazine.id).save()
+        
+        conn = get_connection()
+        conn.execute("DELETE FROM magazine_author_counts")
+        conn.execute("UPDATE magazine_article_counts SET article_count = 42")
+        conn.commit()
+        conn.close()
+        
+        problems = check_counters()
+        self.assertEqual(set(problems), {"magazine_article_counts", "magazine_author_counts"})
+        rebuild_counters()
+        self.assertEqual(check_counters(), {})
+        self.assertEqual(self.counts("magazine_article_counts", "magazine_id"), {magazine.id: 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import get_connection
+from lib.db import writer
+from lib.db.identity_map import IdentityMap, enable_identity_map, disable_identity_map
+from lib.db.session import Session
+from lib.db.transactions import delete_author_and_articles, transfer_articles_between_magazines
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestIdentityMap(unittest.TestCase):
+    def setUp(self):
+        """Set up test database with the identity map enabled"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        self.identity_map = enable_identity_map(maxsize=16)
+    
+    def tearDown(self):
+        """Clean up test database"""
+        disable_identity_map()
+        writer.disable_write_behind()
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = IdentityMap(maxsize=2)
+        first, second, third = Author("A", 1), Author("B", 2), Author("C", 3)
+        cache.put("authors", first)
+        cache.put("authors", second)
+        cache.get("authors", 1)
+        cache.put("authors", third)
+        
+        self.assertIs(cache.get("authors", 1), first)
+        self.assertIsNone(cache.get("authors", 2))
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_relationship_traversal_hits_cache(self):
+        """Test repeated article.author() calls return the cached instance"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        articles = [Article(f"Article {i}", author.id, magazine.id).save() for i in range(5)]
+        
+        authors = [article.author() for article in articles]
+        self.assertTrue(all(found is authors[0] for found in authors))
+        self.assertEqual(self.identity_map.misses, 1)
+        self.assertEqual(self.identity_map.hits, 4)
+    
+    def test_save_invalidates(self):
+        """Test saving a row drops its cached instance"""
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        cached = Magazine.find_by_id(magazine.id)
+        
+        Magazine("Science Today", "Science", magazine.id).save()
+        found = Magazine.find_by_id(magazine.id)
+        self.assertIsNot(found, cached)
+        self.assertEqual(found.name, "Science Today")
+    
+    def test_invalidated_after_commit(self):
+        """Test a read made before the commit does not leave the old row cached"""
+        author = Author("x").save()
+        with Session():
+            Author("y", author.id).save()
+            Author.find_by_id(author.id)
+        self.assertEqual(Author.find_by_id(author.id).name, "y")
+
+        background = writer.enable_write_behind()
+        def rename(cursor):
+            Author("z", author.id).save()
+            Author.find_by_id(author.id)
+        background.submit(rename).result(timeout=5)
+        self.assertEqual(Author.find_by_id(author.id).name, "z")
+    
+    def test_transactions_invalidate(self):
+        """Test the transaction helpers drop the rows they change"""
+        author = Author("John Doe").save()
+        magazine1 = Magazine("Tech Weekly", "Technology").save()
+        magazine2 = Magazine("Science Today", "Science").save()
+        article = Article("Article 1", author.id, magazine1.id).save()
+        Article.find_by_id(article.id)
+        
+        transfer_articles_between_magazines(magazine1.id, magazine2.id, [article.id])
+        self.assertEqual(Article.find_by_id(article.id).magazine_id, magazine2.id)
+        
+        Author.find_by_id(author.id)
+        delete_author_and_articles(author.id)
+        self.assertIsNone(Author.find_by_id(author.id))
+        self.assertIsNone(Article.find_by_id(article.id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import instrumentation
+from lib.db.connection import get_connection
+from lib.db.transactions import add_author_with_articles
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.author = Author("John Doe").save()
+        self.magazine = Magazine("Tech Weekly", "Technology").save()
+        Article.bulk_create(Article(f"Article {i}", self.author.id, self.magazine.id) for i in range(5))
+        instrumentation.reset_stats()
+        instrumentation.enable_instrumentation(slow_ms=1000)
+    
+    def tearDown(self):
+        """Clean up test database"""
+        instrumentation.disable_instrumentation()
+        instrumentation.reset_stats()
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def stats_for(self, sql):
+        return next(stats for stats in instrumentation.get_stats() if stats['sql'] == sql)
+    
+    def test_normalize_sql(self):
+        """Test literals, IN lists and whitespace collapse into one shape"""
+        self.assertEqual(
+            instrumentation.normalize_sql("SELECT *\n  FROM articles WHERE id IN (?, ?, ?) AND title = 'x''y' LIMIT 10"),
+            "SELECT * FROM articles WHERE id IN (?...) AND title = ? LIMIT ?"
+        )
+    
+    def test_records_caller_and_rows(self):
+        """Test statements are grouped by shape and attributed to the model method"""
+        for _ in range(3):
+            Author.find_by_id(self.author.id)
+        self.author.articles()
+        
+        stats = self.stats_for("SELECT * FROM authors WHERE id = ?")
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['rows'], 3)
+        self.assertEqual(stats['callers'], {'Author.find_by_id': 3})
+        self.assertEqual(self.stats_for("SELECT * FROM articles WHERE author_id = ? ORDER BY id")['rows'], 5)
+    
+    def test_records_transactions(self):
+        """Test writes in lib/db/transactions.py are attributed to the function"""
+        add_author_with_articles("Jane Smith", [{'title': 'A', 'magazine_id': self.magazine.id}] * 2)
+        stats = self.stats_for("INSERT INTO articles (title, author_id, magazine_id) VALUES (?...)")
+        self.assertEqual(stats['rows'], 2)
+        self.assertEqual(stats['callers'], {'transactions.add_author_with_articles': 1})
+    
+    def test_slow_queries_are_logged_with_plan(self):
+        """Test statements over the threshold reach the slow-query log"""
+        instrumentation.enable_instrumentation(slow_ms=0, explain_slow=True)
+        with self.assertLogs('lib.db.slow_queries', level='WARNING') as logs:
+            Article.find_by_magazine(self.magazine.id)
+        self.assertTrue(any("Article.find_by_magazine" in line for line in logs.output))
+        entry = instrumentation.slow_queries()[-1]
+        self.assertEqual(entry['rows'], 5)
+        self.assertTrue(any("articles" in line for line in entry['plan']))
+    
+    def test_disabled_records_nothing(self):
+        """Test nothing is recorded once instrumentation is off"""
+        instrumentation.disable_instrumentation()
+        Author.find_by_id(self.author.id)
+        self.assertEqual(instrumentation.get_stats(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,32 +10,19 @@ from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.models.article import Article
 
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
 class TestMagazine(unittest.TestCase):
     def setUp(self):
         """Set up test database"""
         # Set testing environment variable
         os.environ['TESTING'] = '1'
         
-        # Create tables
+        # Create tables from the real schema
         from lib.db.connection import get_connection
         conn = get_connection()
-        conn.execute('''CREATE TABLE IF NOT EXISTS authors (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS magazines (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            category VARCHAR(255) NOT NULL
-        )''')
-        conn.execute('''CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY,
-            title VARCHAR(255) NOT NULL,
-            author_id INTEGER,
-            magazine_id INTEGER,
-            FOREIGN KEY (author_id) REFERENCES authors(id),
-            FOREIGN KEY (magazine_id) REFERENCES magazines(id)
-        )''')
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
         conn.commit()
         conn.close()
     
@@ -162,6 +149,21 @@ class TestMagazine(unittest.TestCase):
         self.assertIn("First Article", titles)
         self.assertIn("Second Article", titles)
     
+    def test_magazine_batch_loaders(self):
+        """Test the batch loaders match the per-magazine methods across chunks"""
+        authors = [Author("John Doe").save(), Author("Jane Smith").save()]
+        magazines = [Magazine(f"Magazine {i}", "Technology").save() for i in range(5)]
+        for i in range(15):
+            Article(f"Article {i}", authors[i % 2].id, magazines[(i * 3) % 4].id).save()
+        ids = [magazine.id for magazine in magazines]
+        
+        articles = Magazine.articles_for(ids, chunk_size=2)
+        titles = Magazine.article_titles_for(ids, chunk_size=2)
+        for magazine in magazines:
+            self.assertEqual([tuple(row) for row in articles[magazine.id]], [tuple(row) for row in magazine.articles()])
+            self.assertEqual(titles[magazine.id], magazine.article_titles())
+        self.assertEqual(titles[magazines[4].id], [])
+    
     def test_magazine_contributing_authors(self):
         """Test getting authors with more than 2 articles"""
         author1 = Author("John Doe").save()
@@ -196,6 +198,23 @@ class TestMagazine(unittest.TestCase):
         top_publisher = Magazine.top_publisher()
         self.assertIsNotNone(top_publisher)
         self.assertEqual(top_publisher.name, "Tech Weekly")
+    
+    def test_magazine_iter_all(self):
+        """Test streaming magazines lazily"""
+        Magazine("Tech Weekly", "Technology").save()
+        Magazine("AI Today", "Technology").save()
+        Magazine("Health Tips", "Health").save()
+        
+        self.assertEqual(len(list(Magazine.iter_all(chunk_size=2))), 3)
+        tech = [magazine.name for magazine in Magazine.iter_by_category("Technology")]
+        self.assertEqual(tech, ["Tech Weekly", "AI Today"])
+    
+    def test_magazine_slots(self):
+        """Test magazines have no per-instance __dict__"""
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        found = Magazine.find_by_id(magazine.id)
+        self.assertFalse(hasattr(found, '__dict__'))
+        self.assertEqual(found.category, "Technology")
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,113 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import get_connection
+from lib.db.pagination import encode_cursor
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def collect(self, fetch):
+        pages = []
+        cursor = None
+        while True:
+            page = fetch(cursor)
+            pages.append([item.id for item in page])
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+    
+    def test_walks_every_article_once(self):
+        """Test following next_cursor visits every row in id order"""
+        author = Author("John Doe").save()
+        magazine = Magazine("Tech Weekly", "Technology").save()
+        articles = Article.bulk_create(Article(f"Article {i}", author.id, magazine.id) for i in range(7))
+        
+        pages = self.collect(lambda cursor: Article.paginate(limit=3, cursor=cursor))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), [article.id for article in articles])
+    
+    def test_filters(self):
+        """Test pagination combined with the author and magazine filters"""
+        author1 = Author("John Doe").save()
+        author2 = Author("Jane Smith").save()
+        magazine1 = Magazine("Tech Weekly", "Technology").save()
+        magazine2 = Magazine("Science Today", "Science").save()
+        for i in range(10):
+            Article(f"Article {i}", [author1, author2][i % 2].id, [magazine1, magazine2][i % 3 == 0].id).save()
+        
+        by_author = self.collect(lambda cursor: Article.paginate(limit=2, cursor=cursor, author_id=author1.id))
+        self.assertEqual(sum(by_author, []), [a.id for a in Article.find_by_author(author1.id)])
+        
+        both = self.collect(lambda cursor: Article.paginate(
+            limit=2, cursor=cursor, author_id=author2.id, magazine_id=magazine1.id))
+        expected = [a.id for a in Article.find_by_author(author2.id) if a.magazine_id == magazine1.id]
+        self.assertEqual(sum(both, []), expected)
+    
+    def test_order_by_name_with_ties(self):
+        """Test ordering by a non-unique column does not skip or repeat rows"""
+        Author.bulk_create([Author(name) for name in ["Bob", "Alice", "Bob", "Carol", "Alice"]])
+        
+        pages = self.collect(lambda cursor: Author.paginate(limit=2, cursor=cursor, order_by="name"))
+        names = [Author.find_by_id(id).name for id in sum(pages, [])]
+        self.assertEqual(names, ["Alice", "Alice", "Bob", "Bob", "Carol"])
+    
+    def test_magazine_category_filter(self):
+        """Test magazine pagination within a category"""
+        Magazine.bulk_create([Magazine(f"Magazine {i}", ["Technology", "Health"][i % 2]) for i in range(5)])
+        
+        page = Magazine.paginate(limit=10, category="Technology")
+        self.assertEqual(len(page), 3)
+        self.assertIsNone(page.next_cursor)
+    
+    def test_invalid_cursors(self):
+        """Test tampered cursors and cursors reused with other filters are rejected"""
+        Author.bulk_create([Author(f"Author {i}") for i in range(3)])
+        page = Author.paginate(limit=1)
+        
+        with self.assertRaises(ValueError):
+            Author.paginate(limit=1, cursor="not-a-cursor")
+        with self.assertRaises(ValueError):
+            Author.paginate(limit=1, cursor=page.next_cursor, order_by="name")
+        with self.assertRaises(ValueError):
+            Author.paginate(order_by="rowid")
+        
+        for after in ([], [1, 2], [[1]]):
+            tampered = encode_cursor({'order_by': 'id', 'filters': {}, 'after': after})
+            with self.assertRaises(ValueError):
+                Author.paginate(limit=1, cursor=tampered)
+
+if __name__ == '__main__':
+    unittest.main()
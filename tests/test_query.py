@@ -0,0 +1,175 @@
+import unittest
+import sqlite3
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import configure_pool, get_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestQuerySet(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.john = Author("John Doe").save()
+        self.jane = Author("Jane Smith").save()
+        self.tech = Magazine("Tech Weekly", "Technology").save()
+        self.health = Magazine("Health Today", "Health").save()
+        self.articles = Article.bulk_create([
+            Article("Python Tips", self.john.id, self.tech.id),
+            Article("Rust Basics", self.john.id, self.tech.id),
+            Article("Healthy Eating", self.jane.id, self.health.id),
+            Article("Python Testing", self.jane.id, self.tech.id),
+        ])
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def capture_statements(self, fn):
+        statements = []
+        conn = get_connection()
+        conn.set_trace_callback(statements.append)
+        conn.close()
+        try:
+            result = fn()
+        finally:
+            conn = get_connection()
+            conn.set_trace_callback(None)
+            conn.close()
+        return result, statements
+    
+    def test_is_lazy_until_evaluated(self):
+        """Test building a chain runs no SQL and evaluating it runs one statement"""
+        configure_pool(max_size=1)
+        try:
+            query, statements = self.capture_statements(
+                lambda: Article.query().filter(magazine_id=self.tech.id).order_by("-title").limit(2)
+            )
+            self.assertEqual(statements, [])
+            
+            articles, statements = self.capture_statements(lambda: list(query))
+            self.assertEqual([article.title for article in articles], ["Rust Basics", "Python Tips"])
+            self.assertEqual(len(statements), 1)
+        finally:
+            configure_pool()
+    
+    def test_filter_lookups(self):
+        """Test exact, comparison, in, isnull and startswith lookups"""
+        ids = [article.id for article in self.articles]
+        query = Article.query()
+        self.assertEqual(query.filter(author_id=self.jane.id).values_list("id", flat=True), ids[2:])
+        self.assertEqual(query.filter(id__gt=ids[1]).values_list("id", flat=True), ids[2:])
+        self.assertEqual(query.filter(id__lte=ids[1]).values_list("id", flat=True), ids[:2])
+        self.assertEqual(query.filter(id__ne=ids[0]).count(), 3)
+        self.assertEqual(query.filter(id__in=[ids[0], ids[3]]).values_list("id", flat=True), [ids[0], ids[3]])
+        self.assertEqual(query.filter(id__in=[]).count(), 0)
+        self.assertEqual(query.filter(magazine_id__isnull=True).count(), 0)
+        self.assertEqual(query.filter(title__startswith="Python").order_by("id").values_list("title", flat=True),
+                         ["Python Tips", "Python Testing"])
+    
+    def test_large_in_list(self):
+        """Test __in with more values than SQLite accepts as parameters"""
+        ids = [article.id for article in self.articles]
+        conn = get_connection()
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        conn.close()
+        values = ids + list(range(10 ** 6, 10 ** 6 + limit))
+        query = Article.query().filter(id__in=values)
+        self.assertEqual(query.order_by("id").values_list("id", flat=True), ids)
+        self.assertEqual(query.count(), 4)
+        self.assertEqual(Article.query().filter(title__in=["Rust Basics"] * 600).count(), 1)
+    
+    def test_startswith_matches_every_prefixed_title(self):
+        """Test startswith finds titles with any characters after the prefix, and no others"""
+        titles = ["Python\U0010ffffz", "Pythoo", "Pytho", "\U0010ffff\U0010ffffx", "100% Python", "100 Python"]
+        Article.bulk_create(Article(title, self.john.id, self.tech.id) for title in titles)
+        query = Article.query().order_by("id")
+        self.assertEqual(query.filter(title__startswith="Python").values_list("title", flat=True),
+                         ["Python Tips", "Python Testing", "Python\U0010ffffz"])
+        self.assertEqual(query.filter(title__startswith="\U0010ffff").values_list("title", flat=True),
+                         ["\U0010ffff\U0010ffffx"])
+        self.assertEqual(query.filter(title__startswith="100%").values_list("title", flat=True), ["100% Python"])
+        self.assertEqual(query.filter(title__startswith="").count(), 10)
+    
+    def test_chaining_does_not_mutate(self):
+        """Test each method returns a new QuerySet"""
+        base = Article.query().filter(magazine_id=self.tech.id)
+        narrowed = base.filter(author_id=self.john.id)
+        self.assertEqual(base.count(), 3)
+        self.assertEqual(narrowed.count(), 2)
+    
+    def test_count_exists_first(self):
+        """Test the scalar terminal methods"""
+        self.assertEqual(Magazine.query().count(), 2)
+        self.assertTrue(Author.query().filter(name="Jane Smith").exists())
+        self.assertFalse(Author.query().filter(name="Nobody").exists())
+        self.assertEqual(Magazine.query().filter(category="Health").first().name, "Health Today")
+        self.assertIsNone(Magazine.query().filter(category="Sports").first())
+        self.assertEqual(Article.query().order_by("id").limit(3).offset(2).count(), 2)
+    
+    def test_model_count_and_exists(self):
+        """Test the model-level count, exact and from ANALYZE statistics"""
+        self.assertEqual((Author.count(), Magazine.count(), Article.count()), (2, 2, 4))
+        self.assertTrue(Article.exists())
+        # Never analyzed: approximate falls back to COUNT(*)
+        self.assertEqual(Article.count(approximate=True), 4)
+        
+        conn = get_connection()
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        Article("Late Article", self.john.id, self.tech.id).save()
+        self.assertEqual(Article.count(approximate=True), 4)
+        self.assertEqual(Article.count(), 5)
+        
+        conn = get_connection()
+        conn.execute("DELETE FROM articles")
+        conn.commit()
+        conn.close()
+        self.assertFalse(Article.exists())
+    
+    def test_slicing_and_values_list(self):
+        """Test slices compile to LIMIT/OFFSET and values_list returns tuples"""
+        ids = [article.id for article in self.articles]
+        self.assertEqual([article.id for article in Article.query().order_by("id")[1:3]], ids[1:3])
+        self.assertEqual(Author.query().order_by("name").values_list("id", "name"),
+                         [(self.jane.id, "Jane Smith"), (self.john.id, "John Doe")])
+    
+    def test_rejects_unknown_fields(self):
+        """Test field names and lookups are validated"""
+        with self.assertRaises(ValueError):
+            Article.query().filter(body="x")
+        with self.assertRaises(ValueError):
+            Article.query().order_by("-title; DROP TABLE articles")
+        with self.assertRaises(ValueError):
+            Article.query().filter(title__regex="x")
+        with self.assertRaises(ValueError):
+            Article.query().values_list("id", "title", flat=True)
+
+if __name__ == '__main__':
+    unittest.main()
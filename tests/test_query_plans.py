@@ -0,0 +1,167 @@
+import unittest
+import os
+import random
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import DEFAULT_POOL_SIZE, configure_pool, get_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+# Listing every row is a scan by definition
+FULL_SCANS_ALLOWED = {
+    'Author.all', 'Magazine.all', 'Article.all', 'Article.all(prefetch)', 'Magazine.top_publisher'
+}
+
+class TestQueryPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build a synthetic database with the real schema and statistics"""
+        os.environ['TESTING'] = '1'
+        # A single pooled connection lets us trace every statement the models run
+        configure_pool(max_size=1)
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        rng = random.Random(42)
+        categories = ["Technology", "Science", "Health", "Politics", "Sports"]
+        authors = Author.bulk_create(Author(f"Author {i}") for i in range(2000))
+        magazines = Magazine.bulk_create(
+            Magazine(f"Magazine {i}", categories[i % len(categories)]) for i in range(200)
+        )
+        Article.bulk_create(
+            Article(f"Title {i}", rng.choice(authors).id, rng.choice(magazines).id)
+            for i in range(20000)
+        )
+        # Guarantee one (author, magazine) pair spans several pages
+        Article.bulk_create(Article(f"Pinned {i}", authors[0].id, magazines[0].id) for i in range(3))
+        
+        conn = get_connection()
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        
+        cls.author = authors[0]
+        cls.magazine = magazines[0]
+        cls.article = Article.find_by_id(1)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test database"""
+        configure_pool(max_size=DEFAULT_POOL_SIZE)
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def model_queries(self):
+        author, magazine, article = self.author, self.magazine, self.article
+        return {
+            'Author.find_by_id': lambda: Author.find_by_id(author.id),
+            'Author.find_by_name': lambda: Author.find_by_name(author.name),
+            'Author.all': Author.all,
+            'Author.articles': author.articles,
+            'Author.magazines': author.magazines,
+            'Author.topic_areas': author.topic_areas,
+            'Author.articles_for': lambda: Author.articles_for([author.id, author.id + 1]),
+            'Author.magazines_for': lambda: Author.magazines_for([author.id, author.id + 1]),
+            'Author.topic_areas_for': lambda: Author.topic_areas_for([author.id, author.id + 1]),
+            'Magazine.find_by_id': lambda: Magazine.find_by_id(magazine.id),
+            'Magazine.find_by_name': lambda: Magazine.find_by_name(magazine.name),
+            'Magazine.find_by_category': lambda: Magazine.find_by_category(magazine.category),
+            'Magazine.all': Magazine.all,
+            'Magazine.articles': magazine.articles,
+            'Magazine.contributors': magazine.contributors,
+            'Magazine.article_titles': magazine.article_titles,
+            'Magazine.articles_for': lambda: Magazine.articles_for([magazine.id, magazine.id + 1]),
+            'Magazine.article_titles_for': lambda: Magazine.article_titles_for([magazine.id, magazine.id + 1]),
+            'Magazine.contributing_authors': magazine.contributing_authors,
+            'Magazine.top_publisher': Magazine.top_publisher,
+            'Article.find_by_id': lambda: Article.find_by_id(article.id),
+            'Article.find_by_title': lambda: Article.find_by_title(article.title),
+            'Article.find_by_author': lambda: Article.find_by_author(author.id),
+            'Article.find_by_magazine': lambda: Article.find_by_magazine(magazine.id),
+            'Article.all': Article.all,
+            'Article.all(prefetch)': lambda: Article.all(prefetch=("author", "magazine")),
+            'Article.find_by_author(prefetch)':
+                lambda: Article.find_by_author(author.id, prefetch=("author", "magazine")),
+            'Article.find_by_magazine(prefetch)':
+                lambda: Article.find_by_magazine(magazine.id, prefetch=("author", "magazine")),
+            'Article.author': article.author,
+            'Article.magazine': article.magazine,
+        }
+    
+    def capture_statements(self, query):
+        statements = []
+        conn = get_connection()
+        conn.set_trace_callback(statements.append)
+        conn.close()
+        try:
+            query()
+        finally:
+            conn = get_connection()
+            conn.set_trace_callback(None)
+            conn.close()
+        return [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+    
+    def query_plan(self, sql):
+        conn = get_connection()
+        rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+        conn.close()
+        return [row['detail'] for row in rows]
+    
+    def test_no_model_lookup_scans_a_table(self):
+        """Test every model query is answered from an index"""
+        for label, query in self.model_queries().items():
+            with self.subTest(method=label):
+                statements = self.capture_statements(query)
+                self.assertTrue(statements, f"{label} ran no SELECT")
+                if label in FULL_SCANS_ALLOWED:
+                    continue
+                for sql in statements:
+                    plan = self.query_plan(sql)
+                    scans = [step for step in plan if step.startswith('SCAN')]
+                    self.assertEqual(scans, [], f"{label} scans: {plan}")
+    
+    def test_deep_pages_seek_without_sorting(self):
+        """Test keyset pagination seeks through an index at any depth"""
+        author, magazine = self.author, self.magazine
+        paginators = {
+            'Article.paginate': lambda cursor: Article.paginate(limit=5, cursor=cursor),
+            'Article.paginate(title)': lambda cursor: Article.paginate(limit=5, cursor=cursor, order_by="title"),
+            'Article.paginate(author)': lambda cursor: Article.paginate(limit=2, cursor=cursor, author_id=author.id),
+            'Article.paginate(magazine)':
+                lambda cursor: Article.paginate(limit=5, cursor=cursor, magazine_id=magazine.id),
+            'Article.paginate(author, magazine)': lambda cursor: Article.paginate(
+                limit=1, cursor=cursor, author_id=author.id, magazine_id=magazine.id),
+            'Author.paginate(name)': lambda cursor: Author.paginate(limit=5, cursor=cursor, order_by="name"),
+            'Article.paginate(author, title)': lambda cursor: Article.paginate(
+                limit=1, cursor=cursor, order_by="title", author_id=author.id),
+            'Article.paginate(magazine, title)': lambda cursor: Article.paginate(
+                limit=1, cursor=cursor, order_by="title", magazine_id=magazine.id),
+            'Magazine.paginate(category)':
+                lambda cursor: Magazine.paginate(limit=5, cursor=cursor, category=magazine.category),
+            'Magazine.paginate(category, name)': lambda cursor: Magazine.paginate(
+                limit=1, cursor=cursor, order_by="name", category=magazine.category),
+        }
+        for label, paginate in paginators.items():
+            with self.subTest(method=label):
+                cursor = paginate(None).next_cursor
+                self.assertIsNotNone(cursor)
+                for sql in self.capture_statements(lambda: paginate(cursor)):
+                    plan = self.query_plan(sql)
+                    bad = [step for step in plan if step.startswith('SCAN') and 'INDEX' not in step
+                           or 'TEMP B-TREE' in step]
+                    self.assertEqual(bad, [], f"{label}: {plan}")
+
+if __name__ == '__main__':
+    unittest.main()
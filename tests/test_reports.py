@@ -0,0 +1,112 @@
+import unittest
+import json
+import os
+import sqlite3
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import reports
+from lib.db.connection import close_all_pools, get_connection
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+
+        self.jane = Author("Jane Smith").save()
+        self.john = Author("John Doe").save()
+        self.tech = Magazine("Tech Weekly", "Technology").save()
+        self.science = Magazine("Science Today", "Science").save()
+        Article.bulk_create(
+            [Article(f"Tech {i}", self.jane.id, self.tech.id) for i in range(3)] +
+            [Article("Physics", self.john.id, self.tech.id), Article("Biology", self.jane.id, self.science.id)]
+        )
+
+    def tearDown(self):
+        """Clean up test database"""
+        reports.REPORTS.pop('broken', None)
+        close_all_pools()
+
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists('test_articles.db' + suffix):
+                os.remove('test_articles.db' + suffix)
+
+    def test_reports_run_concurrently_with_same_results(self):
+        """Test every report gives the same rows on a thread pool as one at a time"""
+        serial = reports.run_reports(workers=1)
+        parallel = reports.run_reports(workers=4)
+        self.assertEqual([r.name for r in parallel], list(reports.REPORTS))
+        self.assertTrue(all(r.ok for r in parallel), [r.error for r in parallel])
+        self.assertEqual([r.rows for r in parallel], [r.rows for r in serial])
+
+        by_name = {r.name: r.rows for r in parallel}
+        self.assertEqual(len(by_name['all_articles']), 5)
+        self.assertEqual({row['title'] for row in by_name['author_articles']},
+                         {"Tech 0", "Tech 1", "Tech 2", "Biology"})
+        self.assertEqual(by_name['top_publisher'], [{'id': self.tech.id, 'name': "Tech Weekly", 'category': "Technology"}])
+        self.assertEqual(by_name['magazine_contributing_authors'], [{'magazine': "Tech Weekly", 'name': "Jane Smith"}])
+        self.assertEqual(by_name['magazines_with_multiple_authors'],
+                         [{'name': "Tech Weekly", 'category': "Technology", 'author_count': 2}])
+        self.assertEqual(by_name['most_prolific_author'], [{'name': "Jane Smith", 'article_count': 4}])
+
+        conn = get_connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        conn.close()
+
+    def test_process_pool(self):
+        """Test reports can run in worker processes"""
+        results = reports.run_reports(['top_publisher', 'most_prolific_author'], workers=2, processes=True)
+        self.assertEqual([r.rows for r in results],
+                         [[{'id': self.tech.id, 'name': "Tech Weekly", 'category': "Technology"}],
+                          [{'name': "Jane Smith", 'article_count': 4}]])
+
+    def test_failing_report_and_read_only_workers(self):
+        """Test a report that raises is recorded, and workers cannot write"""
+        @reports.report('broken', "Tries to write")
+        def broken():
+            conn = get_connection()
+            try:
+                conn.execute("DELETE FROM articles")
+            finally:
+                conn.close()
+
+        results = reports.run_reports(['broken', 'top_publisher'], workers=2)
+        self.assertFalse(results[0].ok)
+        self.assertIn("readonly", results[0].error)
+        self.assertTrue(results[1].ok)
+        self.assertEqual(len(Article.all()), 5)
+
+        with self.assertRaises(ValueError):
+            reports.run_reports(['no_such_report'])
+
+    def test_output_formats(self):
+        """Test JSON and table rendering include rows and timings"""
+        results = reports.run_reports(['top_publisher', 'author_topic_areas'])
+        document = json.loads(reports.to_json(results, 0.5))
+        self.assertEqual(document['wall_seconds'], 0.5)
+        self.assertEqual(document['reports'][0]['rows'][0]['name'], "Tech Weekly")
+        self.assertIn('seconds', document['reports'][1])
+
+        table = reports.format_table(results, 0.5)
+        self.assertIn("Tech Weekly", table)
+        self.assertIn("Timings:", table)
+        self.assertIn("wall time", table)
+
+if __name__ == '__main__':
+    unittest.main()
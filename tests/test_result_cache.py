@@ -0,0 +1,107 @@
+import unittest
+import os
+import sqlite3
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import reports, result_cache
+from lib.db.connection import get_connection
+from lib.db.session import Session
+from lib.db.transactions import transfer_articles_between_magazines
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+
+        self.author = Author("John Doe").save()
+        self.tech = Magazine("Tech Weekly", "Technology").save()
+        self.science = Magazine("Science Today", "Science").save()
+        self.articles = Article.bulk_create(Article(f"Tech {i}", self.author.id, self.tech.id) for i in range(3))
+        self.cache = result_cache.enable_result_cache()
+
+    def tearDown(self):
+        """Clean up test database"""
+        result_cache.disable_result_cache()
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+
+    def test_repeat_calls_hit_until_a_write(self):
+        """Test results are reused until any commit changes the data version"""
+        self.assertEqual(Magazine.top_publisher().id, self.tech.id)
+        self.assertIs(Magazine.top_publisher(), Magazine.top_publisher())
+        self.assertEqual(self.cache.stats['hits'], 2)
+
+        Article.bulk_create(Article(f"Science {i}", self.author.id, self.science.id) for i in range(5))
+        self.assertEqual(Magazine.top_publisher().id, self.science.id)
+        self.assertEqual(self.cache.stats['stale'], 1)
+
+        self.assertTrue(transfer_articles_between_magazines(self.science.id, self.tech.id,
+                                                            [article.id for article in Article.find_by_magazine(self.science.id)]))
+        self.assertEqual(Magazine.top_publisher().id, self.tech.id)
+        self.assertEqual(result_cache.cache_stats()['hit_rate'], 2 / 5)
+
+    def test_write_from_another_connection_invalidates(self):
+        """Test a commit made outside the models is noticed"""
+        self.assertEqual([row['name'] for row in self.tech.contributing_authors()], ["John Doe"])
+        conn = sqlite3.connect('test_articles.db')
+        conn.execute("DELETE FROM articles WHERE id = ?", (self.articles[0].id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.tech.contributing_authors(), [])
+
+    def test_ttl_and_lru_eviction(self):
+        """Test expired entries are recomputed and the oldest entry goes first"""
+        cache = result_cache.enable_result_cache(max_entries=2, ttl=0)
+        Magazine.top_publisher()
+        Magazine.top_publisher()
+        self.assertEqual((cache.stats['hits'], cache.stats['expired']), (0, 1))
+
+        cache = result_cache.enable_result_cache(max_entries=2)
+        magazines = [self.tech, self.science, Magazine("Code Monthly", "Technology").save()]
+        for magazine in magazines:
+            magazine.contributing_authors()
+        self.assertEqual((cache.size, cache.stats['evictions']), (2, 1))
+        magazines[2].contributing_authors()
+        magazines[0].contributing_authors()
+        self.assertEqual((cache.stats['hits'], cache.stats['misses']), (1, 4))
+
+    def test_cached_lists_are_copies(self):
+        """Test a caller changing a returned list does not change the cache"""
+        first = reports.article_counts_by_magazine()
+        first.clear()
+        self.assertEqual(len(reports.article_counts_by_magazine()), 2)
+        self.assertEqual(self.cache.stats['hits'], 1)
+
+    def test_bypassed_inside_session(self):
+        """Test reads in a Session neither use nor fill the cache"""
+        with Session():
+            Magazine.top_publisher()
+        self.assertEqual(self.cache.stats['misses'], 0)
+        self.assertEqual(self.cache.size, 0)
+
+if __name__ == '__main__':
+    unittest.main()
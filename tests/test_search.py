@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import get_connection
+from lib.db.search import build_match_query, check_search_index, rebuild_search_index
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.author1 = Author("John Doe").save()
+        self.author2 = Author("Jane Smith").save()
+        self.tech = Magazine("Tech Weekly", "Technology").save()
+        self.science = Magazine("Science Today", "Science").save()
+        Article.bulk_create([
+            Article("Machine Learning Basics", self.author1.id, self.tech.id),
+            Article("Deep Learning for Machine Vision", self.author2.id, self.tech.id),
+            Article("Learning to Cook", self.author2.id, self.science.id),
+            Article("Quantum Computing Explained", self.author1.id, self.science.id),
+        ])
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def titles(self, articles):
+        return [article.title for article in articles]
+    
+    def test_build_match_query(self):
+        """Test user text is turned into quoted, optionally prefixed terms"""
+        self.assertEqual(build_match_query("machine learn"), '"machine"* AND "learn"*')
+        self.assertEqual(build_match_query('AND "OR" -', prefix=False), '"AND" AND "OR"')
+        self.assertIsNone(build_match_query("  !? "))
+    
+    def test_search_ranks_and_prefixes(self):
+        """Test prefix matching and that every term must match"""
+        results = Article.search("mach learn")
+        self.assertEqual(sorted(self.titles(results)),
+                         ["Deep Learning for Machine Vision", "Machine Learning Basics"])
+        self.assertEqual(self.titles(Article.search("quantum")), ["Quantum Computing Explained"])
+        self.assertEqual(Article.search("mach", prefix=False), [])
+        self.assertEqual(len(Article.search("learning", limit=2)), 2)
+        self.assertEqual(Article.search(""), [])
+    
+    def test_search_filters(self):
+        """Test restricting search to an author and/or magazine"""
+        self.assertEqual(self.titles(Article.search("learning", author_id=self.author1.id)),
+                         ["Machine Learning Basics"])
+        self.assertEqual(self.titles(Article.search("learning", magazine_id=self.science.id)),
+                         ["Learning to Cook"])
+        self.assertEqual(Article.search("learning", author_id=self.author1.id, magazine_id=self.science.id), [])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Test the triggers keep the index in sync with article writes"""
+        article = Article.search("cook")[0]
+        article.title = "Baking Bread"
+        article.save()
+        self.assertEqual(Article.search("cook"), [])
+        self.assertEqual(self.titles(Article.search("bread")), ["Baking Bread"])
+        
+        conn = get_connection()
+        conn.execute("DELETE FROM articles WHERE id = ?", (article.id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(Article.search("bread"), [])
+        self.assertTrue(check_search_index())
+    
+    def test_rebuild(self):
+        """Test rebuilding an index that has fallen out of sync"""
+        conn = get_connection()
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+        conn.commit()
+        conn.close()
+        self.assertFalse(check_search_index())
+        self.assertEqual(Article.search("quantum"), [])
+        
+        rebuild_search_index()
+        self.assertTrue(check_search_index())
+        self.assertEqual(self.titles(Article.search("quantum")), ["Quantum Computing Explained"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.db.connection import get_connection
+from lib.db.counters import check_counters
+from lib.db.search import check_search_index
+from lib.db.seed import generate
+from lib.models.author import Author
+from lib.models.article import Article
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestGenerate(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def schema_objects(self):
+        conn = get_connection()
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('trigger', 'index')")}
+        conn.close()
+        return names
+    
+    def article_rows(self):
+        conn = get_connection()
+        rows = [tuple(row) for row in conn.execute("SELECT * FROM articles ORDER BY id")]
+        conn.close()
+        return rows
+    
+    def test_generates_requested_counts(self):
+        """Test the generated dataset has the requested shape"""
+        before = self.schema_objects()
+        generate(authors=50, magazines=10, articles=2000, categories=3)
+        
+        conn = get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0], 50)
+        self.assertEqual(conn.execute("SELECT COUNT(DISTINCT category) FROM magazines").fetchone()[0], 3)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0], 2000)
+        conn.close()
+        self.assertEqual(self.schema_objects(), before)
+    
+    def test_derived_data_is_rebuilt(self):
+        """Test counters and the search index match after a deferred load"""
+        Author("Existing Author").save()
+        generate(authors=20, magazines=5, articles=500)
+        self.assertEqual(check_counters(), {})
+        self.assertTrue(check_search_index())
+        self.assertTrue(Article.search("quantum"))
+    
+    def test_is_deterministic_and_skewed(self):
+        """Test the same seed reproduces the same rows with a Zipf head"""
+        generate(authors=100, magazines=10, articles=3000, seed=7)
+        first = self.article_rows()
+        self.tearDown()
+        self.setUp()
+        generate(authors=100, magazines=10, articles=3000, seed=7)
+        self.assertEqual(self.article_rows(), first)
+        
+        conn = get_connection()
+        top = conn.execute("SELECT MAX(article_count) FROM author_article_counts").fetchone()[0]
+        conn.close()
+        self.assertGreater(top, 10 * 3000 / 100)
+
+if __name__ == '__main__':
+    unittest.main()
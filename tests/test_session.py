@@ -0,0 +1,165 @@
+import unittest
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import get_connection
+from lib.db.session import Session, current_session
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_saves_share_one_transaction(self):
+        """Test save() inside a session is read back by the session but only committed at the end"""
+        seen_elsewhere = []
+        with Session():
+            author = Author("John Doe").save()
+            magazine = Magazine("Tech Weekly", "Technology").save()
+            article = Article("Article 1", author.id, magazine.id).save()
+            self.assertIsNotNone(article.id)
+            self.assertEqual(Author.find_by_id(author.id).name, "John Doe")
+            self.assertEqual([a.title for a in Article.find_by_author(author.id)], ["Article 1"])
+            
+            reader = threading.Thread(target=lambda: seen_elsewhere.append(Author.find_by_id(author.id)))
+            reader.start()
+            reader.join(5)
+        
+        self.assertEqual(seen_elsewhere, [None])
+        self.assertEqual(Author.find_by_id(author.id).name, "John Doe")
+        self.assertEqual(Article.find_by_id(article.id).magazine_id, magazine.id)
+    
+    def test_add_assigns_ids_on_flush(self):
+        """Test objects registered with add() get ids when flushed"""
+        session = Session()
+        authors = [session.add(Author(f"Author {i}")) for i in range(3)]
+        self.assertEqual(len(session.new), 3)
+        self.assertTrue(all(author.id is None for author in authors))
+        session.commit()
+        
+        ids = [author.id for author in authors]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(len(Author.all()), 3)
+    
+    def test_dirty_objects_are_flushed(self):
+        """Test changes to already-written objects are written on commit"""
+        with Session() as session:
+            magazine = Magazine("Tech Weekly", "Technology").save()
+            magazine.category = "Science"
+            self.assertEqual(session.dirty, [magazine])
+        
+        self.assertEqual(Magazine.find_by_id(magazine.id).category, "Science")
+    
+    def test_saves_do_not_rescan_written_objects(self):
+        """Test save() writes only what is pending; earlier objects are diffed at commit"""
+        with Session() as session:
+            authors = [Author(f"Author {i}").save() for i in range(3)]
+            authors[0].name = "Renamed"
+            session.add(authors[1])
+            session.add(authors[1])
+            self.assertEqual(session.dirty, [authors[1], authors[0]])
+            Author("Last").save()
+            self.assertEqual(session.dirty, [authors[0]])
+        
+        self.assertEqual(Author.find_by_id(authors[0].id).name, "Renamed")
+        self.assertEqual(len(Author.all()), 4)
+    
+    def test_exception_rolls_back(self):
+        """Test an error inside the block discards every write"""
+        with self.assertRaises(RuntimeError):
+            with Session():
+                author = Author("John Doe").save()
+                raise RuntimeError("boom")
+        
+        self.assertIsNone(author.id)
+        self.assertEqual(Author.all(), [])
+        self.assertIsNone(current_session())
+    
+    def test_nested_sessions_share_the_transaction(self):
+        """Test an inner Session joins the outer one and is undone with it"""
+        with self.assertRaises(RuntimeError):
+            with Session():
+                outer = Author("Outer").save()
+                with Session():
+                    inner = Author("Inner").save()
+                    self.assertEqual(Author.find_by_id(outer.id).name, "Outer")
+                self.assertEqual(Author.find_by_id(inner.id).name, "Inner")
+                raise RuntimeError("boom")
+        
+        self.assertEqual((outer.id, inner.id), (None, None))
+        self.assertEqual(Author.all(), [])
+        
+        with Session():
+            Author("Outer").save()
+            with self.assertRaises(RuntimeError):
+                with Session():
+                    Author("Inner").save()
+                    raise RuntimeError("boom")
+        self.assertEqual([author.name for author in Author.all()], ["Outer"])
+    
+    def test_sessions_that_read_first_wait_for_writers(self):
+        """Test a Session that reads before it writes waits for the lock instead of failing"""
+        errors = []
+        
+        def session_writer(n):
+            try:
+                for i in range(10):
+                    with Session():
+                        Author.bulk_create([Author(f"Bulk {n}.{i}")])
+            except Exception as e:
+                errors.append(e)
+        
+        def plain_writer(n):
+            try:
+                for i in range(20):
+                    Author(f"Plain {n}.{i}").save()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=session_writer, args=(n,)) for n in range(4)]
+        threads += [threading.Thread(target=plain_writer, args=(n,)) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(Author.all()), 80)
+    
+    def test_save_outside_session_commits(self):
+        """Test save() still commits immediately without a session"""
+        self.assertIsNone(current_session())
+        author = Author("John Doe").save()
+        self.assertIsNotNone(Author.find_by_id(author.id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import sqlite3
+import contextlib
+import io
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db.connection import close_all_pools, get_connection
+from lib.db.counters import check_counters
+from lib.db.transactions import delete_authors, transfer_articles_between_magazines
+from scripts.setup_db import setup_database
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestTransferArticles(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.author = Author("John Doe").save()
+        self.source = Magazine("Tech Weekly", "Technology").save()
+        self.target = Magazine("Science Today", "Science").save()
+        self.articles = Article.bulk_create(
+            Article(f"Article {i}", self.author.id, self.source.id) for i in range(2000)
+        )
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_transfers_every_id(self):
+        """Test a large id list moves in one transaction and keeps counters right"""
+        ids = [article.id for article in self.articles[:1500]]
+        result = transfer_articles_between_magazines(self.source.id, self.target.id, ids + ids[:10])
+        
+        self.assertTrue(result)
+        self.assertEqual(result.transferred, 1500)
+        self.assertEqual(result.missing, [])
+        self.assertEqual(len(Article.find_by_magazine(self.target.id)), 1500)
+        self.assertEqual(check_counters(), {})
+    
+    def test_missing_ids_abort_everything(self):
+        """Test unknown ids and ids in another magazine are reported and nothing moves"""
+        other = Article("Elsewhere", self.author.id, self.target.id).save()
+        ids = [self.articles[0].id, 999999, other.id, self.articles[1].id]
+        result = transfer_articles_between_magazines(self.source.id, self.target.id, ids)
+        
+        self.assertFalse(result)
+        self.assertEqual(result.missing, [999999, other.id])
+        self.assertEqual(result.transferred, 0)
+        self.assertEqual(len(Article.find_by_magazine(self.source.id)), 2000)
+    
+    def test_can_run_again_on_same_connection(self):
+        """Test the staging table does not leak between calls"""
+        first = transfer_articles_between_magazines(self.source.id, self.target.id, [self.articles[0].id])
+        failed = transfer_articles_between_magazines(self.source.id, self.target.id, [self.articles[0].id])
+        second = transfer_articles_between_magazines(self.source.id, self.target.id, [self.articles[1].id])
+        self.assertTrue(first)
+        self.assertEqual(failed.missing, [self.articles[0].id])
+        self.assertTrue(second)
+
+class TestDeleteAuthors(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.magazine = Magazine("Tech Weekly", "Technology").save()
+        self.authors = Author.bulk_create(Author(f"Spammer {i}") for i in range(1200))
+        Article.bulk_create(
+            Article(f"Spam {i}", author.id, self.magazine.id)
+            for n, author in enumerate(self.authors) for i in range(n % 4)
+        )
+        self.keeper = Author("John Doe").save()
+        Article("Real Article", self.keeper.id, self.magazine.id).save()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        # setup_database switches the file to WAL
+        close_all_pools()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists('test_articles.db' + suffix):
+                os.remove('test_articles.db' + suffix)
+    
+    def assert_only_keeper_left(self):
+        self.assertEqual([author.id for author in Author.all()], [self.keeper.id])
+        self.assertEqual([article.title for article in Article.all()], ["Real Article"])
+        self.assertEqual(check_counters(), {})
+    
+    def test_cascade_delete_returns_counts(self):
+        """Test many authors go in one call and each reports its article count"""
+        ids = [author.id for author in self.authors]
+        result = delete_authors(ids + [999999], chunk_size=100)
+        
+        self.assertTrue(result)
+        self.assertEqual(result.deleted, {author_id: n % 4 for n, author_id in enumerate(ids)})
+        self.assertEqual(result.missing, [999999])
+        self.assertEqual(result.articles_deleted, sum(n % 4 for n in range(1200)))
+        self.assert_only_keeper_left()
+    
+    def test_explicit_delete_matches_cascade(self):
+        """Test cascade=False deletes the articles itself with the same result"""
+        ids = [author.id for author in self.authors]
+        result = delete_authors(ids, cascade=False)
+        self.assertEqual(result.deleted, {author_id: n % 4 for n, author_id in enumerate(ids)})
+        self.assert_only_keeper_left()
+    
+    def make_old_articles_table(self):
+        """Recreate articles the way databases from before the cascade have it"""
+        conn = get_connection()
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.executescript("""
+            CREATE TABLE articles_old AS SELECT * FROM articles;
+            DROP TABLE articles;
+            CREATE TABLE articles (
+                id INTEGER PRIMARY KEY,
+                title VARCHAR(255) NOT NULL,
+                author_id INTEGER,
+                magazine_id INTEGER,
+                FOREIGN KEY (author_id) REFERENCES authors(id),
+                FOREIGN KEY (magazine_id) REFERENCES magazines(id)
+            );
+            INSERT INTO articles SELECT * FROM articles_old;
+            DROP TABLE articles_old;
+        """)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.close()
+    
+    def test_old_schema_falls_back_to_explicit_delete(self):
+        """Test the default cascade path deletes the articles itself when the schema has no cascade"""
+        self.make_old_articles_table()
+        result = delete_authors([author.id for author in self.authors])
+        self.assertEqual(result.articles_deleted, sum(n % 4 for n in range(1200)))
+        self.assertEqual([author.id for author in Author.all()], [self.keeper.id])
+        self.assertEqual([article.title for article in Article.all()], ["Real Article"])
+    
+    def test_setup_adds_cascade_to_old_databases(self):
+        """Test setup_db rebuilds an articles table created without ON DELETE CASCADE"""
+        self.make_old_articles_table()
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup_database()
+        conn = get_connection()
+        actions = {row['from']: row['on_delete'] for row in conn.execute("PRAGMA foreign_key_list(articles)")}
+        conn.close()
+        self.assertEqual(actions, {'author_id': 'CASCADE', 'magazine_id': 'NO ACTION'})
+        
+        self.assertTrue(delete_authors([author.id for author in self.authors]))
+        self.assert_only_keeper_left()
+        self.assertEqual([article.title for article in Article.search("Real")], ["Real Article"])
+        
+        conn = get_connection()
+        with self.assertRaises(sqlite3.IntegrityError):
+            conn.execute("DELETE FROM magazines")
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from lib.models.article import Article
+from lib.db import writer
+from lib.db.connection import get_connection
+from lib.db.counters import check_counters
+from lib.db.session import Session
+from lib.db.transactions import add_author_with_articles, delete_authors, transfer_articles_between_magazines
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'db', 'schema.sql')
+
+class TestBackgroundWriter(unittest.TestCase):
+    def setUp(self):
+        """Set up test database"""
+        os.environ['TESTING'] = '1'
+        
+        conn = get_connection()
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.commit()
+        conn.close()
+        
+        self.author = Author("John Doe").save()
+        self.magazine = Magazine("Tech Weekly", "Technology").save()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        writer.disable_write_behind()
+        conn = get_connection()
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM authors')
+        conn.execute('DELETE FROM magazines')
+        conn.commit()
+        conn.close()
+        
+        if 'TESTING' in os.environ:
+            del os.environ['TESTING']
+        
+        if os.path.exists('test_articles.db'):
+            os.remove('test_articles.db')
+    
+    def test_concurrent_saves_are_group_committed(self):
+        """Test many producer threads end up in far fewer transactions"""
+        background = writer.enable_write_behind(max_delay=0.02)
+        saved = []
+        
+        def produce(n):
+            for i in range(50):
+                saved.append(Article(f"Thread {n} Article {i}", self.author.id, self.magazine.id).save())
+        
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len({article.id for article in saved}), 400)
+        self.assertEqual(len(Article.find_by_magazine(self.magazine.id)), 400)
+        self.assertEqual(background.stats['operations'], 400)
+        self.assertLess(background.stats['batches'], 400)
+        self.assertGreater(background.stats['largest_batch'], 1)
+    
+    def test_submit_resolves_with_id_after_commit(self):
+        """Test submit() returns a future of the assigned id"""
+        writer.enable_write_behind()
+        futures = [Article(f"Queued {i}", self.author.id, self.magazine.id).submit() for i in range(20)]
+        ids = [future.result(timeout=5) for future in futures]
+        self.assertEqual(sorted(ids), [article.id for article in Article.find_by_magazine(self.magazine.id)])
+    
+    def test_failed_write_does_not_spoil_its_batch(self):
+        """Test a failing operation is rolled back alone and its object keeps no id"""
+        writer.enable_write_behind(max_delay=0.05)
+        good = Article("Good", self.author.id, self.magazine.id)
+        bad = Article("Bad", 999999, self.magazine.id)
+        futures = [good.submit(), bad.submit()]
+        
+        self.assertEqual(futures[0].result(timeout=5), good.id)
+        with self.assertRaises(Exception):
+            futures[1].result(timeout=5)
+        self.assertIsNone(bad.id)
+        self.assertEqual([article.title for article in Article.find_by_magazine(self.magazine.id)], ["Good"])
+    
+    def test_transactions_run_on_writer(self):
+        """Test the transactions functions go through the writer and keep their results"""
+        background = writer.enable_write_behind()
+        other = Magazine("Science Today", "Science").save()
+        articles = Article.bulk_create(Article(f"Article {i}", self.author.id, self.magazine.id) for i in range(5))
+        
+        self.assertTrue(transfer_articles_between_magazines(self.magazine.id, other.id, [a.id for a in articles]))
+        self.assertEqual(transfer_articles_between_magazines(self.magazine.id, other.id, [articles[0].id]).missing,
+                         [articles[0].id])
+        self.assertTrue(add_author_with_articles("Jane Smith", [{'title': 'Hers', 'magazine_id': other.id}]))
+        self.assertEqual(delete_authors([self.author.id]).deleted, {self.author.id: 5})
+        self.assertGreaterEqual(background.stats['operations'], 6)
+        self.assertEqual(check_counters(), {})
+    
+    def test_writes_from_submitted_work_join_the_batch(self):
+        """Test save() and bulk_create() called inside submitted work run on the writer's transaction"""
+        background = writer.enable_write_behind()
+        nested = background.submit(lambda cursor: Author("Nested").save().id).result(timeout=5)
+        articles = background.submit(
+            lambda cursor: Article.bulk_create(Article(f"Bulk {i}", self.author.id, self.magazine.id) for i in range(3))
+        ).result(timeout=5)
+        others = [Author(f"Producer {i}").submit() for i in range(5)]
+
+        self.assertEqual(Author.find_by_id(nested).name, "Nested")
+        self.assertEqual(len(Article.find_by_magazine(self.magazine.id)), 3)
+        self.assertTrue(all(article.id for article in articles))
+        self.assertTrue(all(future.result(timeout=5) for future in others))
+        self.assertEqual(check_counters(), {})
+
+    def test_failed_nested_write_keeps_the_batch(self):
+        """Test a nested write that fails is undone alone"""
+        background = writer.enable_write_behind()
+
+        def work(cursor):
+            with self.assertRaises(Exception):
+                Article("Orphan", 9999, self.magazine.id).save()
+            return Author("Kept").save().id
+
+        kept = background.submit(work).result(timeout=5)
+        self.assertEqual(Author.find_by_id(kept).name, "Kept")
+        self.assertEqual(Article.find_by_magazine(self.magazine.id), [])
+
+    def test_queue_backpressure(self):
+        """Test submit blocks, then raises, while the queue is full"""
+        background = writer.enable_write_behind(max_queue=1, max_batch=1)
+        release = threading.Event()
+        started = threading.Event()
+        
+        def blocked(cursor):
+            started.set()
+            release.wait(5)
+        
+        first = background.submit(blocked)
+        started.wait(5)
+        background.submit(lambda cursor: None)
+        with self.assertRaises(writer.WriteQueueFull):
+            background.submit(lambda cursor: None, timeout=0.05)
+        release.set()
+        first.result(timeout=5)
+    
+    def test_shutdown_flushes_pending_writes(self):
+        """Test disabling write-behind commits everything already queued"""
+        background = writer.enable_write_behind(max_delay=0.05)
+        futures = [Author(f"Author {i}").submit() for i in range(100)]
+        writer.disable_write_behind()
+        
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(len(Author.all()), 101)
+        with self.assertRaises(RuntimeError):
+            background.submit(lambda cursor: None)
+    
+    def test_submit_racing_close_always_resolves(self):
+        """Test every submit made while closing either raises or gets a resolved future"""
+        background = writer.enable_write_behind(max_delay=0.01)
+        futures = [background.submit(lambda cursor: None)]
+        stop = threading.Event()
+
+        def produce():
+            while not stop.is_set():
+                try:
+                    futures.append(background.submit(lambda cursor: None))
+                except RuntimeError:
+                    return
+
+        producers = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in producers:
+            thread.start()
+        background.close(timeout=5)
+        stop.set()
+        for thread in producers:
+            thread.join(5)
+        self.assertTrue(all(future.done() for future in futures))
+
+    def test_session_takes_precedence(self):
+        """Test saves inside a Session still join the session transaction"""
+        writer.enable_write_behind()
+        with Session():
+            article = Article("In Session", self.author.id, self.magazine.id).save()
+            self.assertIsNotNone(article.id)
+        self.assertEqual(Article.find_by_id(article.id).title, "In Session")
+
+if __name__ == '__main__':
+    unittest.main()